@@ -0,0 +1,58 @@
+"""convert_to_dataframe 포맷 경로 마이크로 벤치마크
+
+행 단위 포맷(vectorized=False)과 배열 연산 포맷(vectorized=True)의 결과가 같은지 확인하고
+N=10, 100, 1000에서 실행 시간을 비교한다.
+
+사용법:
+    python benchmarks/bench_convert_to_dataframe.py [반복 횟수]
+"""
+import os
+import sys
+import random
+import logging
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import InstitutionTotalReport  # noqa: E402
+
+
+def make_rows(n, seed=0):
+    """랭킹 API 응답 형식의 합성 데이터 생성"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rows.append({
+            'mksc_shrn_iscd': f"{rng.randint(0, 999999):06d}",
+            'hts_kor_isnm': f"종목{i}",
+            'stck_prpr': str(rng.randint(100, 2_000_000)),
+            'orgn_ntby_qty': str(rng.randint(-5_000_000, 50_000_000)),
+            'orgn_ntby_tr_pbmn': str(rng.randint(-100_000, 1_000_000)),
+            'market': rng.choice(["KOSPI", "KOSDAQ", "Not Found"]),
+            'index_change_rate': rng.choice([0, round(rng.uniform(-10, 10), 2)]),
+            'price_change_rate': rng.choice([0, round(rng.uniform(-50, 50), 2)]),
+        })
+    return rows
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    report = InstitutionTotalReport()
+    report.logger.setLevel(logging.WARNING)
+
+    print(f"{'N':>6} {'row-wise(ms)':>14} {'vectorized(ms)':>16} {'speedup':>9}")
+    for n in (10, 100, 1000):
+        rows = make_rows(n)
+
+        legacy = report.convert_to_dataframe(rows, top_n=n, vectorized=False)
+        fast = report.convert_to_dataframe(rows, top_n=n, vectorized=True)
+        if not legacy.equals(fast):
+            raise AssertionError(f"N={n}: 두 포맷 경로의 결과가 다릅니다.")
+
+        legacy_time = min(timeit.repeat(lambda: report.convert_to_dataframe(rows, top_n=n, vectorized=False), number=1, repeat=repeat))
+        fast_time = min(timeit.repeat(lambda: report.convert_to_dataframe(rows, top_n=n, vectorized=True), number=1, repeat=repeat))
+        print(f"{n:>6} {legacy_time * 1000:>14.3f} {fast_time * 1000:>16.3f} {legacy_time / fast_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
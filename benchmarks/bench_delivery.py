@@ -0,0 +1,115 @@
+"""리포트 전송(deliver_reports) 오프라인 시나리오 검증
+
+로컬 스텁 서버로 Telegram/게시판 API를 대신하여 시나리오별 전송 결과, 시도 횟수, 소요 시간을 검증한다.
+기대와 다르면 AssertionError로 종료한다.
+    - normal: 두 대상 모두 정상 (동시 전송, 1회씩)
+    - telegram_deadline: Telegram 응답 지연(HTTP 타임아웃 > 제한 시간) → 제한 시간 후 실패, 게시판은 정상 완료
+    - telegram_read_timeout: Telegram 응답 대기 시간 초과 → 재시도하지 않음 (중복 게시 방지)
+    - telegram_rate_limited: Telegram 1회 429 응답 → 재시도 후 성공
+    - board_retry: 게시판 앞선 2회 500 응답 → 재시도 후 성공
+    - board_read_timeout: 게시판 응답 대기 시간 초과 → 재시도하지 않음
+    - board_client_error: 게시판 400 응답 → 재시도하지 않음, Telegram은 정상 완료
+    - board_unreachable: 게시판 연결 거부(요청 전송 전 실패) → 최대 재시도 횟수까지 재시도
+
+사용법:
+    python benchmarks/bench_delivery.py
+"""
+import os
+import sys
+import time
+import socket
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubServer  # noqa: E402
+
+DEADLINE = 3
+MAX_RETRIES = 2
+
+
+def _closed_port_url():
+    """연결이 거부되는 로컬 주소"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def main():
+    with StubServer() as stub:
+        os.environ.update({
+            "TELEGRAM_API_URL": stub.url,
+            "BASE_URL": stub.url,
+            "TELEGRAM_TIMEOUT": str(DEADLINE + 2),
+            "BASE_API_TIMEOUT": str(DEADLINE + 2),
+        })
+
+        from main import deliver_reports, DEFAULT_RANKING  # noqa: E402
+        from utils.api_util import ApiUtil  # noqa: E402
+        from utils.telegram_util import TelegramUtil  # noqa: E402
+        from utils.delivery_util import DeliveryDispatcher  # noqa: E402
+        from utils.image_store_util import RenderedImage  # noqa: E402
+        from utils.logger_util import LoggerUtil  # noqa: E402
+
+        LoggerUtil().get_logger().setLevel(logging.CRITICAL)
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with open(os.path.join(root_dir, 'thumbnail', 'thumbnail.png'), 'rb') as f:
+            image = RenderedImage("stub_report.png", f.read())
+
+        dispatcher = DeliveryDispatcher(deadline=DEADLINE, max_retries=MAX_RETRIES, backoff=0.1)
+        reports = [(DEFAULT_RANKING, image, "스텁 전송 테스트")]
+        unreachable_url = f"{_closed_port_url()}/api"
+
+        # 시나리오: (Telegram 동작, 게시판 동작, 클라이언트 설정, 기대 결과 {대상: (성공 여부, 시도 횟수, 스텁 요청 수)})
+        scenarios = {
+            "normal": ({}, {}, {}, {"telegram": (True, 1, 1), "board": (True, 1, 1)}),
+            "telegram_deadline": ({"delay": DEADLINE + 5}, {}, {},
+                                  {"telegram": (False, None, 1), "board": (True, 1, 1)}),
+            "telegram_read_timeout": ({"delay": 1.5}, {}, {"telegram_timeout": 0.5},
+                                      {"telegram": (False, 1, 1), "board": (True, 1, 1)}),
+            "telegram_rate_limited": ({"fail_times": 1, "status": 429}, {}, {},
+                                      {"telegram": (True, 2, 2), "board": (True, 1, 1)}),
+            "board_retry": ({}, {"fail_times": 2}, {}, {"telegram": (True, 1, 1), "board": (True, 3, 3)}),
+            "board_read_timeout": ({}, {"delay": 1.5}, {"board_timeout": 0.5},
+                                   {"telegram": (True, 1, 1), "board": (False, 1, 1)}),
+            "board_client_error": ({}, {"fail_times": 1, "status": 400}, {},
+                                   {"telegram": (True, 1, 1), "board": (False, 1, 1)}),
+            "board_unreachable": ({}, {}, {"board_url": unreachable_url},
+                                  {"telegram": (True, 1, 1), "board": (False, MAX_RETRIES + 1, 0)}),
+        }
+
+        print(f"{'scenario':<22} {'elapsed(s)':>10}  results")
+        for scenario, (telegram_behavior, board_behavior, client, expected) in scenarios.items():
+            stub.configure("telegram", **telegram_behavior)
+            stub.configure("board", **board_behavior)
+            telegram = TelegramUtil()
+            telegram.timeout = client.get("telegram_timeout", telegram.timeout)
+            api_util = ApiUtil()
+            api_util.timeout = client.get("board_timeout", api_util.timeout)
+            api_util.api_base_url = client.get("board_url", api_util.api_base_url)
+
+            started = time.perf_counter()
+            results = deliver_reports(reports, telegram, api_util, dispatcher)
+            elapsed = time.perf_counter() - started
+            summary = ", ".join(f"{r.name}={'ok' if r.success else 'fail'}/{r.attempts}" for r in results)
+            print(f"{scenario:<22} {elapsed:>10.2f}  {summary}")
+
+            # 한 대상이 멈춰도 전체 전송은 제한 시간 안에 끝남
+            assert elapsed < DEADLINE + 1, f"{scenario}: 제한 시간 초과 ({elapsed:.2f}초)"
+            by_sink = {result.name.split(':')[0]: result for result in results}
+            for sink, (success, attempts, requests) in expected.items():
+                result = by_sink[sink]
+                assert result.success == success, f"{scenario}: {sink} 성공 여부 {result.success} (오류: {result.error})"
+                if attempts is not None:
+                    assert result.attempts == attempts, f"{scenario}: {sink} 시도 {result.attempts}회, 기대 {attempts}회"
+                assert stub.counts[sink] == requests, f"{scenario}: {sink} 요청 {stub.counts[sink]}회, 기대 {requests}회"
+            if scenario == "telegram_deadline":
+                assert by_sink["telegram"].error == "제한 시간 초과", f"{scenario}: {by_sink['telegram'].error}"
+
+        print("모든 시나리오 통과")
+
+
+if __name__ == "__main__":
+    main()
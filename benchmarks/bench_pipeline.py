@@ -0,0 +1,145 @@
+"""리포트 파이프라인 오프라인 종단간 벤치마크
+
+로컬 스텁 서버(KIS 모의 응답 + Telegram + 게시판)로 실제 자격 증명 없이 build_pipeline 전체를 실행하고,
+상위 N(기본 10, 50, 100, 250, 500)별 전체/단계별 소요 시간을 측정한다.
+N마다 빈 캐시 디렉토리(CACHE_DIR)에서 시작하므로 조회/가공/렌더링 경로가 모두 실행된다.
+
+사용법:
+    python benchmarks/bench_pipeline.py [--sizes 10,50,100,250,500] [--kis-latency 0.02]
+        [--rate-limit-ratio 0.02] [--calls-per-sec 15] [--renderer pillow] [--json 결과.json]
+
+    렌더러는 REPORT_RENDERER 환경변수(기본 wkhtmltoimage)를 따르며, 실행 환경에 없으면
+    render 단계는 실패 알림만 남기고 계속 진행한다.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import shutil
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubServer  # noqa: E402
+from mock_kis import MockKis, market_tickers  # noqa: E402
+
+STAGES = ("ticker_index", "trading_days", "rankings", "kospi_index", "kosdaq_index", "closes", "align_dates", "render", "rolling", "deliver")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="리포트 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--sizes", default="10,50,100,250,500", help="상위 N 목록 (쉼표 구분)")
+    parser.add_argument("--kis-latency", type=float, default=0.02, help="KIS 응답 지연(초)")
+    parser.add_argument("--telegram-latency", type=float, default=0.05, help="Telegram 응답 지연(초)")
+    parser.add_argument("--board-latency", type=float, default=0.05, help="게시판 응답 지연(초)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="EGW00201 오류 비율 (0~1)")
+    parser.add_argument("--calls-per-sec", type=float, default=None, help="KIS 초당 호출 제한 (기본값: KIS_MAX_CALLS_PER_SEC)")
+    parser.add_argument("--workers", type=int, default=None, help="과거 가격 동시 조회 수 (기본값: KIS_MAX_WORKERS)")
+    parser.add_argument("--renderer", default=None, help="wkhtmltoimage 또는 pillow")
+    parser.add_argument("--payload-dir", default=None, help="기록된 KIS 응답('{엔드포인트}.json') 디렉토리")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과 저장 경로")
+    return parser.parse_args()
+
+
+def run_once(top_n, stub, args):
+    """빈 캐시에서 파이프라인 1회 실행 → {단계: 초, total: 초, ...}"""
+    from main import InstitutionTotalReport, DEFAULT_RANKING, build_pipeline
+    from utils.api_util import ApiUtil
+    from utils.telegram_util import TelegramUtil
+    from utils.token_util import TokenManager
+    from utils.rate_limit_util import RateLimiter
+    from utils.image_store_util import ImageArchiver
+    from utils.market_util import TickerMarketIndex
+    from utils.metrics_util import MetricsUtil
+
+    today = datetime.now().strftime('%Y%m%d')
+    cache_dir = tempfile.mkdtemp(prefix=f"bench_{top_n}_")
+    os.environ["CACHE_DIR"] = cache_dir
+
+    # 종목 목록 스냅샷 (pykrx 대신)
+    with open(os.path.join(cache_dir, f"tickers_{today}.json"), "w", encoding="utf-8") as f:
+        json.dump({"date": today, "markets": market_tickers(max(top_n, 10))}, f)
+    TickerMarketIndex._instances.pop(today, None)
+
+    report = InstitutionTotalReport()
+    report.token_manager = TokenManager(os.path.join(cache_dir, "token.json"), report.issue_token)
+    report.image_archiver = ImageArchiver(os.path.join(cache_dir, "img"))
+    if args.calls_per_sec:
+        report.kis_client.rate_limiter = report.rate_limiter = RateLimiter(args.calls_per_sec)
+    if args.workers:
+        report.max_workers = args.workers
+
+    counters_before = _counter_totals(MetricsUtil())
+    pipeline = build_pipeline(report, TelegramUtil(), ApiUtil(), [DEFAULT_RANKING], top_n=top_n)
+    started = time.perf_counter()
+    try:
+        pipeline.run({"today": today})
+        total = time.perf_counter() - started
+    finally:
+        report.image_archiver.close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    counters_after = _counter_totals(MetricsUtil())
+    result = {"top_n": top_n, "total": total, **{stage: pipeline.timings.get(stage) for stage in STAGES}}
+    result["kis_requests"] = stub.counts.get("kis", 0)
+    for name in ("http_retries", "rate_limit_hits"):
+        result[name] = counters_after.get(name, 0) - counters_before.get(name, 0)
+    return result
+
+
+def _counter_totals(metrics):
+    """태그와 관계없이 이름별 누적 횟수"""
+    totals = {}
+    for counter in metrics.snapshot()["counters"]:
+        totals[counter["name"]] = totals.get(counter["name"], 0) + counter["value"]
+    return totals
+
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    stub = StubServer()
+    MockKis(ranking_rows=max(sizes), rate_limit_ratio=args.rate_limit_ratio, payload_dir=args.payload_dir).install(stub)
+    with stub:
+        os.environ.update({
+            "KIS_URL_BASE": stub.url,
+            "KIS_APP_KEY": "mock-app-key",
+            "KIS_APP_SECRET": "mock-app-secret",
+            "TELEGRAM_API_URL": stub.url,
+            "BASE_URL": stub.url,
+            "PRICE_CACHE_ENABLED": "true",
+            "IMAGE_CACHE_ENABLED": "false",
+            "REPORT_IMAGE_MODE": "memory",
+        })
+        if args.renderer:
+            os.environ["REPORT_RENDERER"] = args.renderer
+
+        from utils.logger_util import LoggerUtil
+        LoggerUtil().get_logger().setLevel(logging.WARNING)
+
+        results = []
+        for top_n in sizes:
+            stub.configure("kis", delay=args.kis_latency)
+            stub.configure("telegram", delay=args.telegram_latency)
+            stub.configure("board", delay=args.board_latency)
+            results.append(run_once(top_n, stub, args))
+
+    header = f"{'N':>5} {'total':>8} " + " ".join(f"{stage:>12}" for stage in STAGES) + f" {'kis_req':>8} {'retries':>8} {'rate_lim':>8}"
+    print(header)
+    for result in results:
+        stages = " ".join(f"{result[stage]:>12.3f}" if result[stage] is not None else f"{'-':>12}" for stage in STAGES)
+        print(f"{result['top_n']:>5} {result['total']:>8.3f} {stages} {result['kis_requests']:>8} {result['http_retries']:>8} {result['rate_limit_hits']:>8}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
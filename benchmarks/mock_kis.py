@@ -0,0 +1,215 @@
+"""스텁 서버용 KIS Open API 모의 응답
+
+StubServer에 다음 KIS 경로를 추가한다.
+    - oauth2/tokenP
+    - uapi/domestic-stock/v1/quotations/foreign-institution-total
+    - uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice
+    - uapi/domestic-stock/v1/quotations/inquire-index-daily-price
+
+응답은 실제 응답과 같은 필드 구성의 결정적(seed 고정) 데이터로 만들며,
+payload_dir에 '{엔드포인트명}.json' 파일(기록해 둔 실제 응답 본문)이 있으면 그 내용을 그대로 돌려준다.
+rate_limit_ratio 비율만큼 초당 거래건수 초과(EGW00201) 오류를 섞어 보낸다.
+"""
+import os
+import json
+import random
+import zlib
+import threading
+import urllib.parse
+from datetime import datetime, timedelta
+from utils.calendar_util import TradingCalendar
+
+KIS_PREFIX = "/oauth2/"
+KIS_DATA_PREFIX = "/uapi/"
+
+RATE_LIMIT_ERROR = {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+
+
+def ranking_codes(count: int):
+    """모의 랭킹 종목코드 목록 (count개, 중복 없음)"""
+    return [f"{(i * 37 + 5930) % 1000000:06d}" for i in range(count)]
+
+
+def market_tickers(count: int):
+    """모의 종목 목록 스냅샷 ({시장: [종목코드]}, 10개 중 1개는 어느 시장에도 없음)"""
+    codes = ranking_codes(count)
+    return {
+        "KOSPI": [code for i, code in enumerate(codes) if i % 10 != 9 and i % 2 == 0],
+        "KOSDAQ": [code for i, code in enumerate(codes) if i % 10 != 9 and i % 2 == 1],
+    }
+
+
+def _sessions(end: datetime, start: datetime = None, limit: int = 100):
+    """end부터 과거로 거래일 목록 (내림차순, 최대 limit개)"""
+    calendar = TradingCalendar.default()
+    days = []
+    day = end
+    while len(days) < limit and (start is None or day >= start):
+        if calendar.is_session(day):
+            days.append(day)
+        day -= timedelta(days=1)
+    return days
+
+
+def _seed(*parts):
+    return zlib.crc32("|".join(parts).encode())
+
+
+class MockKis:
+    """KIS 엔드포인트 모의 응답 생성기"""
+
+    ENDPOINTS = {
+        "/oauth2/tokenP": "tokenP",
+        "/uapi/domestic-stock/v1/quotations/foreign-institution-total": "foreign-institution-total",
+        "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice": "inquire-daily-itemchartprice",
+        "/uapi/domestic-stock/v1/quotations/inquire-index-daily-price": "inquire-index-daily-price",
+    }
+
+    def __init__(self, ranking_rows: int = 500, rate_limit_ratio: float = 0.0, payload_dir: str = None, seed: int = 0):
+        self.ranking_rows = ranking_rows
+        self.rate_limit_ratio = rate_limit_ratio
+        self.payload_dir = payload_dir
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def install(self, stub):
+        """StubServer에 KIS 경로 등록 (이름: kis)"""
+        stub.add_route("kis", lambda path: path.startswith(KIS_PREFIX) or path.startswith(KIS_DATA_PREFIX), self.respond)
+        return stub
+
+    def _recorded(self, endpoint: str):
+        if not self.payload_dir:
+            return None
+        path = os.path.join(self.payload_dir, f"{endpoint}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _rate_limited(self):
+        if self.rate_limit_ratio <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.rate_limit_ratio
+
+    def respond(self, path: str, body: bytes):
+        parsed = urllib.parse.urlsplit(path)
+        endpoint = self.ENDPOINTS.get(parsed.path)
+        if endpoint is None:
+            return 404, {"rt_cd": "1", "msg_cd": "NOTFOUND", "msg1": parsed.path}
+
+        recorded = self._recorded(endpoint)
+        if recorded is not None:
+            return recorded
+
+        if endpoint == "tokenP":
+            return self.token()
+        if self._rate_limited():
+            return 500, RATE_LIMIT_ERROR
+
+        params = {key: values[0] for key, values in urllib.parse.parse_qs(parsed.query).items()}
+        if endpoint == "foreign-institution-total":
+            return self.ranking(params)
+        if endpoint == "inquire-daily-itemchartprice":
+            return self.daily_prices(params)
+        return self.index_prices(params)
+
+    def token(self):
+        expires = datetime.now() + timedelta(hours=24)
+        return {
+            "access_token": "mock-access-token",
+            "access_token_token_expired": expires.strftime("%Y-%m-%d %H:%M:%S"),
+            "token_type": "Bearer",
+            "expires_in": 86400,
+        }
+
+    @staticmethod
+    def _base_price(code: str):
+        return 1000 + _seed(code) % 200000
+
+    def ranking(self, params):
+        rows = []
+        for rank, code in enumerate(ranking_codes(self.ranking_rows)):
+            rng = random.Random(_seed(code, params.get("FID_RANK_SORT_CLS_CODE", ""), params.get("FID_ETC_CLS_CODE", "")))
+            price = self._base_price(code)
+            qty = (self.ranking_rows - rank) * 1000 + rng.randint(0, 999)
+            amount = qty * price // 1_000_000  # 백만원 단위
+            change = rng.randint(-price // 10, price // 10)
+            rows.append({
+                "hts_kor_isnm": f"모의종목{rank + 1}",
+                "mksc_shrn_iscd": code,
+                "ntby_qty": str(qty),
+                "stck_prpr": str(price),
+                "prdy_vrss_sign": "2" if change > 0 else ("5" if change < 0 else "3"),
+                "prdy_vrss": str(change),
+                "prdy_ctrt": f"{change / price * 100:.2f}",
+                "acml_vol": str(rng.randint(10_000, 10_000_000)),
+                "frgn_ntby_qty": str(qty // 2),
+                "orgn_ntby_qty": str(qty),
+                "ivtr_ntby_qty": str(qty // 3),
+                "bank_ntby_qty": str(qty // 10),
+                "insu_ntby_qty": str(qty // 10),
+                "mrbn_ntby_qty": str(qty // 10),
+                "fund_ntby_qty": str(qty // 10),
+                "etc_orgt_ntby_vol": str(qty // 10),
+                "etc_corp_ntby_vol": str(qty // 10),
+                "frgn_ntby_tr_pbmn": str(amount // 2),
+                "orgn_ntby_tr_pbmn": str(amount),
+                "ivtr_ntby_tr_pbmn": str(amount // 3),
+                "bank_ntby_tr_pbmn": str(amount // 10),
+                "insu_ntby_tr_pbmn": str(amount // 10),
+                "mrbn_ntby_tr_pbmn": str(amount // 10),
+                "fund_ntby_tr_pbmn": str(amount // 10),
+                "etc_orgt_ntby_tr_pbmn": str(amount // 10),
+                "etc_corp_ntby_tr_pbmn": str(amount // 10),
+            })
+        return {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.", "output": rows}
+
+    def daily_prices(self, params):
+        code = params.get("FID_INPUT_ISCD", "000000")
+        start = datetime.strptime(params["FID_INPUT_DATE_1"], "%Y%m%d")
+        end = min(datetime.strptime(params["FID_INPUT_DATE_2"], "%Y%m%d"), datetime.now())
+        base = self._base_price(code)
+
+        bars = []
+        for day in _sessions(end, start):
+            date = day.strftime("%Y%m%d")
+            close = max(100, base + (_seed(code, date) % (base // 5 + 1)) - base // 10)
+            bars.append({
+                "stck_bsop_date": date,
+                "stck_clpr": str(close),
+                "stck_oprc": str(close),
+                "stck_hgpr": str(close + close // 50),
+                "stck_lwpr": str(close - close // 50),
+                "acml_vol": str(_seed(date, code) % 1_000_000),
+                "acml_tr_pbmn": str(close * (_seed(date, code) % 1_000_000)),
+                "flng_cls_code": "00",
+                "prtt_rate": "0.00",
+                "mod_yn": "N",
+                "prdy_vrss_sign": "3",
+                "prdy_vrss": "0",
+                "revl_issu_reas": "",
+            })
+        return {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.", "output1": {"stck_prpr": str(base)}, "output2": bars}
+
+    def index_prices(self, params):
+        code = params.get("FID_INPUT_ISCD", "0001")
+        end = min(datetime.strptime(params["FID_INPUT_DATE_1"], "%Y%m%d"), datetime.now())
+        base = {"0001": 2500.0, "1001": 800.0, "2001": 330.0}.get(code, 1000.0)
+
+        bars = []
+        for day in _sessions(end):
+            date = day.strftime("%Y%m%d")
+            close = round(base * (1 + ((_seed(code, date) % 2001) - 1000) / 20000), 2)
+            bars.append({
+                "stck_bsop_date": date,
+                "bstp_nmix_prpr": f"{close:.2f}",
+                "bstp_nmix_oprc": f"{close:.2f}",
+                "bstp_nmix_hgpr": f"{close * 1.01:.2f}",
+                "bstp_nmix_lwpr": f"{close * 0.99:.2f}",
+                "acml_vol": str(_seed(date, code) % 1_000_000_000),
+                "bstp_nmix_prdy_vrss": "0.00",
+                "prdy_vrss_sign": "3",
+                "bstp_nmix_prdy_ctrt": "0.00",
+            })
+        return {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.", "output1": {}, "output2": bars}
@@ -0,0 +1,160 @@
+"""오프라인 테스트용 로컬 스텁 HTTP 서버
+
+Telegram Bot API(sendMessage, sendPhoto, sendMediaGroup)와 게시판 API(/api/board-research)를 흉내 낸다.
+경로 이름: telegram_message(sendMessage), telegram(그 외 Bot API), board(게시판)
+경로별로 응답 지연과 앞선 N회 실패(HTTP 상태 코드)를 설정할 수 있다.
+
+사용법:
+    python benchmarks/stub_server.py [--port 8080] [--telegram-delay 초] [--board-delay 초] [--board-fail 횟수]
+
+    .env 예시: TELEGRAM_API_URL=http://127.0.0.1:8080, BASE_URL=http://127.0.0.1:8080
+"""
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RouteBehavior:
+    """경로별 응답 동작 (지연 시간, 앞선 fail_times회는 status로 실패)"""
+
+    def __init__(self, delay: float = 0.0, fail_times: int = 0, status: int = 500):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.status = status
+
+
+def _telegram_response(path, body):
+    if path.endswith("/sendMediaGroup"):
+        return {"ok": True, "result": [{"message_id": 1}]}
+    return {"ok": True, "result": {"message_id": 1}}
+
+
+def _board_response(path, body):
+    return {"success": True, "data": {"id": 1, "image_urls": ["http://stub/image.png"]}}
+
+
+class StubServer:
+    """스레드에서 실행되는 스텁 서버
+
+    Example:
+        with StubServer() as stub:
+            stub.configure("telegram", delay=5)
+            os.environ["TELEGRAM_API_URL"] = stub.url
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.routes = {}      # 이름 → (경로 판별 함수, 응답 생성 함수)
+        self.behaviors = {}   # 이름 → RouteBehavior
+        self.counts = {}      # 이름 → 요청 수
+        self._lock = threading.Lock()
+        # 오류 알림(sendMessage)은 리포트 전송(sendPhoto/sendMediaGroup)과 따로 집계
+        self.add_route("telegram_message", lambda path: path.startswith("/bot") and "/sendMessage" in path, _telegram_response)
+        self.add_route("telegram", lambda path: path.startswith("/bot"), _telegram_response)
+        self.add_route("board", lambda path: path.startswith("/api/board-research"), _board_response)
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, payload = stub.handle(self.command, self.path, self.headers, body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 타임아웃으로 먼저 연결을 끊은 경우
+                    self.close_connection = True
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_route(self, name: str, matcher, responder):
+        """경로 추가 (matcher(path) → bool, responder(path, body) → dict 또는 (status, dict))"""
+        self.routes[name] = (matcher, responder)
+        self.behaviors.setdefault(name, RouteBehavior())
+        self.counts.setdefault(name, 0)
+
+    def configure(self, name: str, delay: float = 0.0, fail_times: int = 0, status: int = 500):
+        """경로 동작 설정 (요청 수도 초기화)"""
+        with self._lock:
+            self.behaviors[name] = RouteBehavior(delay, fail_times, status)
+            self.counts[name] = 0
+
+    def handle(self, method: str, path: str, headers, body: bytes):
+        for name, (matcher, responder) in self.routes.items():
+            if not matcher(path):
+                continue
+
+            with self._lock:
+                self.counts[name] += 1
+                count = self.counts[name]
+                behavior = self.behaviors[name]
+
+            if behavior.delay:
+                time.sleep(behavior.delay)
+            if count <= behavior.fail_times:
+                return behavior.status, {"ok": False, "success": False, "error_code": behavior.status, "description": "stub failure"}
+
+            result = responder(path, body)
+            return result if isinstance(result, tuple) else (200, result)
+
+        return 404, {"ok": False, "success": False, "description": f"unknown path: {path}"}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telegram/게시판 API 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--telegram-delay", type=float, default=0.0, help="Telegram 응답 지연(초)")
+    parser.add_argument("--board-delay", type=float, default=0.0, help="게시판 응답 지연(초)")
+    parser.add_argument("--board-fail", type=int, default=0, help="게시판 앞선 N회 500 응답")
+    args = parser.parse_args()
+
+    stub = StubServer(args.host, args.port)
+    stub.configure("telegram", delay=args.telegram_delay)
+    stub.configure("board", delay=args.board_delay, fail_times=args.board_fail)
+    print(f"스텁 서버 실행 중: {stub.url} (Ctrl+C로 종료)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,82 +1,269 @@
-import requests
 from dotenv import load_dotenv
 import os
+import re
 import sys
-import json
-from datetime import datetime
+import shutil
+import sqlite3
+import tempfile
+from collections import deque
+from itertools import islice
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 import imgkit
-from utils.api_util import ApiUtil, ApiError
+import holidays
+from utils.api_util import ApiUtil
 from utils.telegram_util import TelegramUtil
+from utils.alert_util import AlertUtil
 from utils.logger_util import LoggerUtil
-import holidays
-import pykrx.stock as stock
+from utils.rate_limit_util import RateLimiter
+from utils.kis_client_util import KisClient
+from utils.token_util import TokenManager
+from utils.price_cache_util import PriceCacheUtil
+from utils.index_cache_util import IndexHistoryCache
+from utils.ranking_store_util import RankingSnapshotStore
+from utils.rolling_netbuy_util import RollingNetBuyAggregator
+from utils.market_util import TickerMarketIndex
+from utils.image_render_util import PillowTableRenderer
+from utils.image_store_util import RenderedImage, ImageArchiver, dated_file_name
+from utils.report_template_util import ReportColumn, ReportTemplate
+from utils.format_util import format_thousands, format_float_thousands, format_rate_spans
+from utils.pipeline_util import Pipeline
+from utils.metrics_util import MetricsUtil
+from utils.delivery_util import DeliveryDispatcher, DeliverySink, DeliveryError, is_retryable_error
+from utils.http_record_util import HttpRecorder
+from utils.calendar_util import TradingCalendar
+from utils.cache_util import cache_dir, market_db_path, MARKET_DB_NAME
 
 load_dotenv()
+
+# 랭킹 응답 중 숫자로 변환하지 않는 필드
+RANKING_TEXT_COLUMNS = {'mksc_shrn_iscd', 'hts_kor_isnm', 'prdy_vrss_sign'}
+
+# 외국인/기관 매매종목가집계 조회 조건 (FID_ETC_CLS_CODE, FID_RANK_SORT_CLS_CODE, FID_DIV_CLS_CODE)
+INVESTOR_TYPES = {
+    'institution': {'code': '2', 'label': '기관', 'field': 'orgn'},
+    'foreign': {'code': '1', 'label': '외국인', 'field': 'frgn'},
+}
+RANK_SIDES = {
+    'buy': {'code': '0', 'label': '순매수'},
+    'sell': {'code': '1', 'label': '순매도'},
+}
+RANK_SORTS = {
+    'qty': {'code': '0', 'label': '수량'},
+    'amount': {'code': '1', 'label': '금액'},
+}
+
+
+@dataclass(frozen=True)
+class RankingSpec:
+    """랭킹 조회 조건 (투자자 × 순매수/순매도 × 수량/금액 정렬)"""
+    investor: str = 'institution'
+    side: str = 'buy'
+    sort: str = 'qty'
+
+    @classmethod
+    def parse(cls, key):
+        """'institution_buy_qty' 형식의 키를 RankingSpec으로 변환"""
+        try:
+            investor, side, sort = key.strip().split('_')
+        except ValueError:
+            raise ValueError(f"잘못된 랭킹 키: {key} (형식: 투자자_매매구분_정렬, 예: institution_buy_qty)")
+        if investor not in INVESTOR_TYPES or side not in RANK_SIDES or sort not in RANK_SORTS:
+            raise ValueError(f"지원하지 않는 랭킹 키: {key}")
+        return cls(investor, side, sort)
+
+    @property
+    def key(self):
+        return f"{self.investor}_{self.side}_{self.sort}"
+
+    @property
+    def title(self):
+        """예: '기관 순매수'"""
+        return f"{INVESTOR_TYPES[self.investor]['label']} {RANK_SIDES[self.side]['label']}"
+
+    @property
+    def qty_field(self):
+        return f"{INVESTOR_TYPES[self.investor]['field']}_ntby_qty"
+
+    @property
+    def amount_field(self):
+        return f"{INVESTOR_TYPES[self.investor]['field']}_ntby_tr_pbmn"
+
+    @property
+    def qty_column(self):
+        """예: '기관순매수량'"""
+        return self.title.replace(' ', '') + '량'
+
+    @property
+    def amount_column(self):
+        """예: '기관순매수금액'"""
+        return self.title.replace(' ', '') + '금액'
+
+    @property
+    def category(self):
+        return self.title.replace(' ', '')
+
+    @property
+    def file_name(self):
+        # 기본 랭킹은 기존 파일명 유지
+        return "institution_top_report" if self == DEFAULT_RANKING else f"{self.key}_top_report"
+
+    def caption(self, date_display, top_n=10):
+        suffix = f" ({RANK_SORTS[self.sort]['label']} 기준)" if self.sort != 'qty' else ""
+        return f"{date_display} {self.title} 상위 TOP {top_n}{suffix}"
+
+    def params(self):
+        return {
+            "FID_DIV_CLS_CODE": RANK_SORTS[self.sort]['code'], #0:수량정렬, 1:금액정렬
+            "FID_RANK_SORT_CLS_CODE": RANK_SIDES[self.side]['code'], #0:순매수상위, 1:순매도상위
+            "FID_ETC_CLS_CODE": INVESTOR_TYPES[self.investor]['code'] #0:전체, 1:외국인, 2:기관계, 3:기타
+        }
+
+
+DEFAULT_RANKING = RankingSpec()
+
+
+@dataclass(frozen=True)
+class RollingNetBuySpec:
+    """기관 N거래일 누적 순매수 리포트 (전송 시 RankingSpec과 같은 속성 사용)"""
+    window: int
+
+    @property
+    def key(self):
+        return f"institution_buy_{self.window}d"
+
+    @property
+    def title(self):
+        return f"기관 {self.window}일 누적 순매수"
+
+    @property
+    def category(self):
+        return DEFAULT_RANKING.category
+
+    @property
+    def file_name(self):
+        return f"institution_{self.window}d_top_report"
+
+    def caption(self, date_display, top_n=10):
+        # 매일 조회한 랭킹에 든 종목의 순매수만 더한 값 (랭킹 밖으로 밀려난 날은 0으로 집계)
+        return f"{date_display} {self.title} 상위 TOP {top_n} (일별 랭킹 종목 기준)"
+
+# 업종 지수 코드
+INDEX_CODES = {
+    'KOSPI': '0001',
+    'KOSDAQ': '1001',
+    'KOSPI200': '2001',
+}
+
+# 리포트 이미지 공통 문구 및 컬럼 메타데이터 (wkhtmltoimage/Pillow 렌더러 공용)
+REPORT_SOURCE = "※ 출처 : MQ(Money Quotient)"
+REPORT_COLUMNS = {
+    col.name: col for col in [
+        ReportColumn('종목명', css_class='stock-name'),
+        ReportColumn('시장대비등락률', sub_label='(30일기준)'),
+    ] + [
+        ReportColumn(RankingSpec(investor, side).amount_column, sub_label='(억원)')
+        for investor in INVESTOR_TYPES for side in RANK_SIDES
+    ]
+}
+_LOOKBACK_COLUMN = re.compile(r"^시장대비등락률_(\d+)d$")
+
+
+def window_suffix(window):
+    """기간별 컬럼 접미사 (window가 None이면 단일 기간 컬럼명 그대로)"""
+    return "" if window is None else f"_{window}d"
+
+
+def as_windowed(value):
+    """기간별 값 dict로 통일 (단일 값은 {None: 값})"""
+    return value if isinstance(value, dict) else {None: value}
+
+
+def lookback_column_name(window):
+    """예: '시장대비등락률_20d' (window가 None이면 '시장대비등락률')"""
+    return f"시장대비등락률{window_suffix(window)}"
+
+
+def report_column(name):
+    """컬럼명 → ReportColumn (기간별 시장대비등락률 컬럼은 헤더에 기간 표시)"""
+    if name in REPORT_COLUMNS:
+        return REPORT_COLUMNS[name]
+    match = _LOOKBACK_COLUMN.match(name)
+    if match:
+        return ReportColumn(name, label='시장대비등락률', sub_label=f'({match.group(1)}일기준)')
+    return ReportColumn(name)
   
 # 특정 종목코드가 어느 시장에 속하는지 확인
-def checkMarket(ticker):
-    if ticker in kospi_tickers:
-        return "KOSPI"
-    elif ticker in kosdaq_tickers:
-        return "KOSDAQ"
-    else:
-        return "Not Found"
+def checkMarket(ticker, date=None):
+    return TickerMarketIndex.load(date).get_market(ticker)
 
 def isTodayHoliday():
-    kr_holidays = holidays.KR()
-    today = datetime.today().date()
-    return today in kr_holidays
+    """오늘이 KRX 휴장일(주말, 공휴일, 연말 휴장일 등)인지 확인"""
+    today = datetime.today()
+    calendar = TradingCalendar.default()
+    if calendar.covers(today):
+        return not calendar.is_session(today)
+    # 달력 범위를 벗어나면 주말/법정 공휴일로 판단
+    return today.weekday() >= 5 or today.date() in holidays.KR(years=today.year)
 
 class InstitutionTotalReport:
-    def __init__(self):
+    def __init__(self, img_dir=None):
+        """
+        Args:
+            img_dir (str, optional): 리포트 이미지 보관 디렉토리. 기본값은 img/
+        """
         self.url_base = os.getenv("KIS_URL_BASE")
         self.app_key = os.getenv("KIS_APP_KEY")
         self.app_secret = os.getenv("KIS_APP_SECRET")
-        self.token_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'token.json')
-        self.img_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img')
+        self.img_dir = img_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'img')
         self.wkhtmltoimage_path = os.getenv('WKHTMLTOIMAGE_PATH')
+        self.renderer = os.getenv('REPORT_RENDERER', 'wkhtmltoimage').lower()  # wkhtmltoimage 또는 pillow
+        self.pillow_renderer = None
+        self.report_templates = {}
         self.logger = LoggerUtil().get_logger()
+
+        # 과거 가격 동시 조회 설정 (KIS 초당 호출 제한 준수)
+        self.max_workers = int(os.getenv("KIS_MAX_WORKERS", "4"))
+        self.rate_limiter = RateLimiter(float(os.getenv("KIS_MAX_CALLS_PER_SEC", "15")))
+
+        # 토큰 관리자 (메모리 캐시 + 파일 잠금으로 보호되는 token.json)
+        token_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'token.json')
+        self.token_manager = TokenManager(token_file, self.issue_token)
+
+        # KIS API 공용 클라이언트 (커넥션 풀 + 재시도, 모든 시세 조회가 공유)
+        self.kis_client = KisClient(self.url_base, self.app_key, self.app_secret,
+                                    token_provider=self.get_token, rate_limiter=self.rate_limiter)
+
+        # 일봉 가격 캐시 설정 (기간별시세 API는 1회 최대 100건 반환)
+        self.kis_max_bars = 100
+        self.calendar = TradingCalendar.default()
+        self.price_cache = PriceCacheUtil() if os.getenv("PRICE_CACHE_ENABLED", "true").lower() == "true" else None
+
+        # 업종 지수 이력 저장소
+        self.index_cache = IndexHistoryCache()
+
+        # 등락률 비교 기간 (거래일, 예: 5,20,60,120)
+        self.lookback_windows = list(dict.fromkeys(int(window) for window in os.getenv("REPORT_LOOKBACK_WINDOWS", "30").split(',') if window.strip()))
+
+        # 일별 랭킹 저장소
+        self.ranking_store = RankingSnapshotStore() if os.getenv("RANKING_STORE_ENABLED", "true").lower() == "true" else None
+
+        # 기관 순매수 N거래일 누적 집계 (일별 랭킹 저장소의 데이터로 갱신)
+        rolling_windows = [int(window) for window in os.getenv("ROLLING_NETBUY_WINDOWS", "").split(',') if window.strip()]
+        self.rolling_netbuy = RollingNetBuyAggregator(rolling_windows) if rolling_windows and self.ranking_store else None
         
         # img 디렉토리가 없으면 생성
         if not os.path.exists(self.img_dir):
             os.makedirs(self.img_dir)
             self.logger.info(f"이미지 디렉토리 생성: {self.img_dir}")
 
-    def load_token(self):
-        """토큰 파일에서 저장된 토큰 정보를 로드"""
-        if not os.path.exists(self.token_file):
-            self.logger.debug("토큰 파일이 존재하지 않습니다.")
-            return None
-            
-        with open(self.token_file, 'r') as f:
-            data = json.load(f)
-            
-        # 만료 시간 확인 (둘 중 하나라도 만료되면 새로운 토큰 발급)
-        now = datetime.now()
-        expires_at = datetime.strptime(data['access_token_token_expired'], "%Y-%m-%d %H:%M:%S")
-        
-        if expires_at <= now:
-            self.logger.debug("토큰이 만료되었습니다.")
-            return None
-            
-        self.logger.debug("유효한 토큰을 로드했습니다.")
-        return data['access_token']
-
-    def save_token(self, token_info):
-        """토큰 정보를 파일에 저장
-        token_info: API 응답의 토큰 정보 (access_token, expires_in, access_token_token_expired 포함)
-        """
-        data = {
-            'access_token': token_info['access_token'],
-            'expires_in': token_info['expires_in'],  # 유효기간(초)
-            'access_token_token_expired': token_info['access_token_token_expired']  # 만료일시
-        }
-        
-        with open(self.token_file, 'w') as f:
-            json.dump(data, f)
-            
-        self.logger.debug(f"토큰 정보를 저장했습니다. 만료일시: {token_info['access_token_token_expired']}")
+        # 이미지 전달 방식 (file: img/에 저장 후 경로 전달, memory: 바이트를 바로 전달하고 보관은 백그라운드)
+        self.image_mode = os.getenv('REPORT_IMAGE_MODE', 'file').lower()
+        self.archive_images = os.getenv('IMAGE_ARCHIVE_ENABLED', 'true').lower() == 'true'
+        self.image_archiver = ImageArchiver(self.img_dir)
 
     def check_env_variables(self):
         """필수 환경변수 체크"""
@@ -88,121 +275,71 @@ class InstitutionTotalReport:
             self.logger.error(error_msg)
             raise Exception(error_msg)
 
-    def get_token(self):
-        """토큰 조회 또는 새로 발급"""
+    def issue_token(self):
+        """새로운 토큰 발급 (토큰 관리자가 파일 잠금 하에서 호출)"""
         # 환경변수 체크
         self.check_env_variables()
-        
-        # 저장된 토큰이 있는지 확인
-        token = self.load_token()
-        if token:
-            return token
 
-        # 새로운 토큰 발급
         self.logger.info("새로운 토큰 발급 시작")
-        headers = {"content-type":"application/json"}
         body = {
             "grant_type":"client_credentials",
             "appkey": self.app_key,
             "appsecret": self.app_secret
         }
         PATH = "oauth2/tokenP"
-        URL = f"{self.url_base}/{PATH}"
         
-        res = requests.post(URL, headers=headers, data=json.dumps(body))
+        res = self.kis_client.post(PATH, json_body=body, auth=False)
         
         if res.status_code != 200:
             error_msg = "토큰 발급 실패"
             self.logger.error(error_msg)
             raise Exception(error_msg)
             
-        token_info = res.json()
-        self.save_token(token_info)
         self.logger.info("토큰 발급 성공")
-        
-        return token_info['access_token'] 
+        return res.json()
+
+    def get_token(self):
+        """토큰 조회 또는 새로 발급 (메모리 캐시 우선)"""
+        return self.token_manager.get_token()
     
-    def get_institution_total_report(self):
-        token = self.get_token()
-        if not token:
-            error_msg = "토큰 발급 실패"
-            self.logger.error(error_msg)
-            raise Exception(error_msg)
-            
+    def get_institution_total_report(self, spec=DEFAULT_RANKING):
+        """외국인/기관 매매종목가집계 랭킹 조회
+
+        Args:
+            spec (RankingSpec, optional): 조회 조건. 기본값은 기관 순매수 수량 상위
+        """
         # API 엔드포인트 설정
         PATH = "uapi/domestic-stock/v1/quotations/foreign-institution-total"
         # PATH = "uapi/domestic-stock/v1/quotations/inquire-price"
-        URL = f"{self.url_base}/{PATH}"
 
-        self.logger.info("기관 순매수 데이터 조회 시작")
-        
-        # 요청 헤더 설정
-        headers = {
-            "Content-Type": "application/json; charset=utf-8", 
-            "authorization": f"Bearer {token}",
-            "appKey": self.app_key,
-            "appSecret": self.app_secret,
-            "tr_id": "FHPTJ04400000",
-        }
+        self.logger.info(f"{spec.title} 데이터 조회 시작 ({RANK_SORTS[spec.sort]['label']} 정렬)")
 
         # 요청 파라미터 설정
         params = {
             "FID_COND_MRKT_DIV_CODE": "V",
             "FID_COND_SCR_DIV_CODE": "16449",
             "FID_INPUT_ISCD": "0000",
-            "FID_DIV_CLS_CODE": "0", #0:수량정렬, 1:금액정렬
-            "FID_RANK_SORT_CLS_CODE": "0", #0:순매수상위, 1:순매도상위
-            "FID_ETC_CLS_CODE": "2" #0:전체, 1:외국인, 2:기관계, 3:기타
+            **spec.params()
         }
 
         # API 호출
-        res = requests.get(URL, headers=headers, params=params)
+        res = self.kis_client.get(PATH, "FHPTJ04400000", params)
         if res.status_code == 200 and res.json()["rt_cd"] == "0":
             result = res.json()["output"]
-            self.logger.info(f"기관 순매수 데이터 조회 성공: {len(result)}개 종목")
+            self.logger.info(f"{spec.title} 데이터 조회 성공: {len(result)}개 종목")
             return result
         else:
             error_msg = f"API 호출 실패: {res.json()['msg_cd']}"
             self.logger.error(error_msg)
             raise Exception(error_msg)
     
-    def get_stock_price(self, stock_code, start_date=None, end_date=None):
-        """특정 종목의 주가 정보를 조회하는 함수
-        
-        Args:
-            stock_code (str): 종목코드 (6자리)
-            start_date (str, optional): 조회 시작일 (YYYYMMDD 형식). 기본값은 100일 전
-            end_date (str, optional): 조회 종료일 (YYYYMMDD 형식). 기본값은 현재일
-            
-        Returns:
-            pandas.DataFrame: 주가 데이터
-        """
-        token = self.get_token()
-        if not token:
-            error_msg = "토큰 발급 실패"
-            self.logger.error(error_msg)
-            raise Exception(error_msg)
-            
-        # 날짜 파라미터 설정
-        if start_date is None:
-            start_date = (datetime.now() - pd.Timedelta(days=100)).strftime("%Y%m%d")
-        if end_date is None:
-            end_date = datetime.today().strftime("%Y%m%d")
-            
-        self.logger.debug(f"주가 조회 시작 - 종목코드: {stock_code}, 조회기간: {start_date} ~ {end_date}")
+    def _request_stock_price(self, stock_code, start_date, end_date):
+        """KIS 기간별시세 API를 호출하여 일봉 원본 데이터(output2)를 반환"""
+        self.logger.debug("주가 조회 시작 - 종목코드: %s, 조회기간: %s ~ %s", stock_code, start_date, end_date)
             
         # API 엔드포인트 설정
         PATH = "uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
-        URL = f"{self.url_base}/{PATH}"
-        
-        # 요청 헤더 설정
-        headers = {
-            "Content-Type": "application/json; charset=utf-8", 
-            "authorization": f"Bearer {token}",
-            "appKey": self.app_key,
-            "appSecret": self.app_secret,
-            "tr_id": "FHKST03010100",  # 국내주식기간별시세
-        }
+        TR_ID = "FHKST03010100"  # 국내주식기간별시세
         
         # 요청 파라미터 설정
         params = {
@@ -215,86 +352,209 @@ class InstitutionTotalReport:
         }
         
         # API 호출
-        res = requests.get(URL, headers=headers, params=params)
+        res = self.kis_client.get(PATH, TR_ID, params)
         
         if res.status_code == 200 and res.json()["rt_cd"] == "0":
-            # 주가 데이터를 DataFrame으로 변환
-            data = res.json()["output2"]  # output2에 시계열 데이터가 포함됨
-            df = pd.DataFrame(data)
-            
-            # 컬럼 이름 변경 및 데이터 타입 변환
-            rename_cols = {
-                'stck_bsop_date': '날짜',
-                'stck_oprc': '시가',
-                'stck_hgpr': '고가',
-                'stck_lwpr': '저가',
-                'stck_clpr': '종가',
-                'acml_vol': '거래량',
-                'acml_tr_pbmn': '거래대금',
-                'flng_cls_code': '등락구분',
-                'prtt_rate': '등락률',
-                'mod_yn': '분할여부',
-                'prdy_vrss': '전일대비'
-            }
-            
-            # 컬럼 선택 및 이름 변경
-            cols_to_use = list(rename_cols.keys())
-            df = df[cols_to_use].rename(columns=rename_cols)
-            
-            # 데이터 타입 변환
-            numeric_cols = ['시가', '고가', '저가', '종가', '거래량', '거래대금', '등락률', '전일대비']
-            for col in numeric_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # 날짜 형식 변환
-            df['날짜'] = pd.to_datetime(df['날짜'], format='%Y%m%d')
-            
-            # 날짜 기준 내림차순 정렬
-            df = df.sort_values(by='날짜', ascending=False).reset_index(drop=True)
-            
-            self.logger.debug(f"주가 조회 완료 - 종목코드: {stock_code}, 데이터 수: {len(df)}")
-            return df
+            # output2에 시계열 데이터가 포함됨 (데이터가 없으면 빈 dict가 올 수 있음)
+            return [row for row in res.json()["output2"] if row.get('stck_bsop_date')]
         else:
             error_msg = res.json().get("msg_cd", "알 수 없는 오류")
             self.logger.error(f"주가 조회 실패 - 종목코드: {stock_code}, 오류: {error_msg}")
             raise Exception(f"API 호출 실패: {error_msg}")
 
+    def _price_chunks(self, start_date, end_date):
+        """조회 기간을 API 1회 최대 건수(kis_max_bars)보다 적은 거래일이 되는 구간으로 분할 (오래된 구간부터)
+
+        거래일 달력으로 kis_max_bars - 1거래일씩 나누고, 달력 범위를 벗어나면 주 단위로 나눈다
+        (구간의 평일 수는 주 수 × 5를 넘지 않음, 기본 19주, 최대 95거래일).
+        """
+        try:
+            sessions = self.calendar.sessions_in_range(start_date, end_date)
+        except ValueError:
+            sessions = None
+        if sessions is not None:
+            size = self.kis_max_bars - 1
+            # 각 구간은 이전 구간 다음 날부터 시작하고, 마지막 구간은 요청 종료일까지
+            ends = [session.strftime("%Y%m%d") for session in sessions[size - 1:-1:size]] + [end_date]
+            starts = [start_date] + [(datetime.strptime(chunk_end, "%Y%m%d") + timedelta(days=1)).strftime("%Y%m%d") for chunk_end in ends[:-1]]
+            return list(zip(starts, ends))
+
+        span = timedelta(weeks=(self.kis_max_bars - 1) // 5)
+        start, end = datetime.strptime(start_date, "%Y%m%d"), datetime.strptime(end_date, "%Y%m%d")
+        chunks = []
+        while start <= end:
+            chunk_end = min(start + span - timedelta(days=1), end)
+            chunks.append((start.strftime("%Y%m%d"), chunk_end.strftime("%Y%m%d")))
+            start = chunk_end + timedelta(days=1)
+        return chunks
+
+    def _request_price_chunk(self, stock_code, start_date, end_date):
+        """한 구간 조회 → 일봉 원본 데이터 (날짜 오름차순)"""
+        bars = self._request_stock_price(stock_code, start_date, end_date)
+        if len(bars) >= self.kis_max_bars:
+            self.logger.warning(f"주가 조회 결과가 최대 건수({self.kis_max_bars})에 도달 - 종목코드: {stock_code}, 구간: {start_date} ~ {end_date}")
+        bars.reverse()
+        return bars
+
+    def iter_stock_price_chunks(self, stock_code, start_date, end_date, max_workers=None):
+        """긴 기간을 API 크기 구간으로 나눠 조회하고 구간별 일봉 목록을 오래된 구간부터 차례로 반환 (generator)
+
+        구간은 KIS 초당 호출 제한(rate_limiter) 안에서 동시에 조회하되, 다음 max_workers개 구간만 미리 요청하므로
+        여러 해 기간이라도 전체 응답을 한꺼번에 메모리에 두지 않는다.
+
+        Args:
+            stock_code (str): 종목코드 (6자리)
+            start_date (str): 조회 시작일 (YYYYMMDD 형식)
+            end_date (str): 조회 종료일 (YYYYMMDD 형식)
+            max_workers (int, optional): 동시 조회 구간 수. 기본값은 KIS_MAX_WORKERS 환경변수
+
+        Yields:
+            list: 구간의 일봉 원본 데이터 (날짜 오름차순)
+        """
+        chunks = self._price_chunks(start_date, end_date)
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        if len(chunks) <= 1 or max_workers <= 1:
+            for chunk_start, chunk_end in chunks:
+                yield self._request_price_chunk(stock_code, chunk_start, chunk_end)
+            return
+
+        remaining = iter(chunks)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            pending = deque(executor.submit(self._request_price_chunk, stock_code, *chunk)
+                            for chunk in islice(remaining, max_workers))
+            try:
+                while pending:
+                    bars = pending.popleft().result()
+                    next_chunk = next(remaining, None)
+                    if next_chunk is not None:
+                        pending.append(executor.submit(self._request_price_chunk, stock_code, *next_chunk))
+                    yield bars
+            finally:
+                # 호출자가 중간에 멈추면 아직 시작하지 않은 구간은 취소
+                for future in pending:
+                    future.cancel()
+
+    def iter_stock_price_bars(self, stock_code, start_date, end_date, max_workers=None):
+        """기간 내 일봉 원본 데이터를 오래된 날짜부터 하나씩 반환 (generator, iter_stock_price_chunks 참고)"""
+        for bars in self.iter_stock_price_chunks(stock_code, start_date, end_date, max_workers):
+            yield from bars
+
+    def _fill_price_cache(self, stock_code, start_date, end_date):
+        """캐시에 없는 기간만 API로 조회하여 채움 (긴 기간은 API 크기 구간으로 나눠 조회)"""
+        # 당일 봉은 장중에 값이 바뀌므로 조회 완료 구간으로 기록하지 않음
+        last_final_date = (datetime.now() - pd.Timedelta(days=1)).strftime("%Y%m%d")
+
+        # 수정주가 변경으로 기준일 이전 캐시가 무효화되면 비게 된 구간만 한 번 더 조회
+        for _ in range(2):
+            missing = self.price_cache.missing_ranges(stock_code, start_date, end_date)
+            adjusted = False
+            for range_start, range_end in missing:
+                # 수정주가 검사는 구간 전체를 한 번에 해야 하므로 빈 구간 단위로 모아서 저장
+                bars = list(self.iter_stock_price_bars(stock_code, range_start, range_end))
+                adjusted = self.price_cache.store_bars(stock_code, bars) or adjusted
+                self.price_cache.mark_covered(stock_code, range_start, min(range_end, last_final_date))
+
+            if missing:
+                self.logger.debug("주가 캐시 갱신 - 종목코드: %s, 조회 구간: %s", stock_code, missing)
+            if not adjusted:
+                break
+
+    def _to_price_dataframe(self, data):
+        """일봉 원본 데이터를 주가 DataFrame으로 변환"""
+        # 컬럼 이름 변경 및 데이터 타입 변환
+        rename_cols = {
+            'stck_bsop_date': '날짜',
+            'stck_oprc': '시가',
+            'stck_hgpr': '고가',
+            'stck_lwpr': '저가',
+            'stck_clpr': '종가',
+            'acml_vol': '거래량',
+            'acml_tr_pbmn': '거래대금',
+            'flng_cls_code': '등락구분',
+            'prtt_rate': '등락률',
+            'mod_yn': '분할여부',
+            'prdy_vrss': '전일대비'
+        }
+        
+        # 컬럼 선택 및 이름 변경
+        cols_to_use = list(rename_cols.keys())
+        df = pd.DataFrame(data, columns=cols_to_use).rename(columns=rename_cols)
+        
+        # 데이터 타입 변환
+        numeric_cols = ['시가', '고가', '저가', '종가', '거래량', '거래대금', '등락률', '전일대비']
+        for col in numeric_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        # 날짜 형식 변환
+        df['날짜'] = pd.to_datetime(df['날짜'], format='%Y%m%d')
+        
+        # 날짜 기준 내림차순 정렬
+        return df.sort_values(by='날짜', ascending=False).reset_index(drop=True)
+
+    def get_stock_price(self, stock_code, start_date=None, end_date=None):
+        """특정 종목의 주가 정보를 조회하는 함수
+
+        가격 캐시가 활성화되어 있으면 캐시에 없는 기간만 API로 조회한다.
+        
+        Args:
+            stock_code (str): 종목코드 (6자리)
+            start_date (str, optional): 조회 시작일 (YYYYMMDD 형식). 기본값은 종료일까지 API 1회 조회 범위(kis_max_bars - 1거래일)
+            end_date (str, optional): 조회 종료일 (YYYYMMDD 형식). 기본값은 현재일
+            
+        Returns:
+            pandas.DataFrame: 주가 데이터
+        """
+        # 날짜 파라미터 설정
+        if end_date is None:
+            end_date = datetime.today().strftime("%Y%m%d")
+        if start_date is None:
+            try:
+                start_date = self.calendar.sessions_ago(end_date, self.kis_max_bars - 2).strftime("%Y%m%d")
+            except ValueError:
+                # 달력 범위를 벗어나면 달력일 기준 (100일 전)
+                start_date = (datetime.strptime(end_date, "%Y%m%d") - pd.Timedelta(days=100)).strftime("%Y%m%d")
+
+        if self.price_cache:
+            self._fill_price_cache(stock_code, start_date, end_date)
+            data = self.price_cache.load_bars(stock_code, start_date, end_date)
+        else:
+            data = list(self.iter_stock_price_bars(stock_code, start_date, end_date))
+
+        df = self._to_price_dataframe(data)
+        self.logger.debug("주가 조회 완료 - 종목코드: %s, 데이터 수: %d", stock_code, len(df))
+        return df
+
+    def get_close_price(self, stock_code, date):
+        """특정 일자의 종가만 조회 (캐시 사용 시 DataFrame 생성 없이 반환, 데이터가 없으면 None)"""
+        if self.price_cache:
+            self._fill_price_cache(stock_code, date, date)
+            return self.price_cache.get_close(stock_code, date)
+
+        df = self.get_stock_price(stock_code, start_date=date, end_date=date)
+        return None if df.empty else df.iloc[0]['종가']
+
     def get_domestic_index(self, market_code="KOSPI", date=None, period="D"):
         """국내 주요 지수 데이터를 조회하는 함수
         
         Args:
-            market_code (str, optional): 시장 코드. KOSPI 또는 KOSDAQ. 기본값은 KOSPI
+            market_code (str, optional): 시장 코드. KOSPI, KOSDAQ, KOSPI200 또는 업종 코드(0001 등). 기본값은 KOSPI
             date (str, optional): 조회일자 (YYYYMMDD 형식). 기본값은 현재일
             period (str, optional): 기간분류코드 D:일, W:주, M:월, Y:년. 기본값은 일봉(D)
             
         Returns:
             pandas.DataFrame: 지수 데이터
         """
-        token = self.get_token()
-        if not token:
-            raise Exception("토큰 발급 실패")
-                        
         # 날짜 파라미터 설정
         if date is None:
             date = datetime.today().strftime("%Y%m%d")
 
-        if market_code == "KOSPI":
-            market_code = "0001"
-        elif market_code == "KOSDAQ":
-            market_code = "1001"
+        market_code = INDEX_CODES.get(market_code, market_code)
             
         # API 엔드포인트 설정
         PATH = "uapi/domestic-stock/v1/quotations/inquire-index-daily-price"
-        URL = f"{self.url_base}/{PATH}"
-        
-        # 요청 헤더 설정
-        headers = {
-            "Content-Type": "application/json; charset=utf-8", 
-            "authorization": f"Bearer {token}",
-            "appKey": self.app_key,
-            "appSecret": self.app_secret,
-            "tr_id": "FHPUP02120000",  # 국내업종 일자별지수[v1_국내주식-065]
-        }
+        TR_ID = "FHPUP02120000"  # 국내업종 일자별지수[v1_국내주식-065]
         
         # 요청 파라미터 설정
         params = {
@@ -305,7 +565,7 @@ class InstitutionTotalReport:
         }
         
         # API 호출
-        res = requests.get(URL, headers=headers, params=params)
+        res = self.kis_client.get(PATH, TR_ID, params)
         
         if res.status_code == 200 and res.json()["rt_cd"] == "0":
             # 지수 데이터를 DataFrame으로 변환
@@ -349,139 +609,272 @@ class InstitutionTotalReport:
             error_message = res.json().get("msg_cd", "알 수 없는 오류")
             raise Exception(f"API 호출 실패: {error_message}")
 
-    def add_historical_price_change(self, filtered_data, reference_date):
-        """기관 순매수 데이터에 과거 가격 대비 현재 가격 등락률을 추가하는 함수
-        
+    def refresh_index_history(self, markets=("KOSPI", "KOSDAQ"), date=None, min_sessions=30):
+        """지수 이력 저장소를 기준일까지 갱신 (갱신이 필요한 지수만 동시에 조회하고 새 거래일만 추가)
+
         Args:
-            filtered_data (list): 기관 순매수 데이터 리스트
-            reference_date (str): 과거 가격 조회 기준일(YYYYMMDD 형식)
-            
+            markets (tuple, optional): 시장명 또는 업종 코드 목록. 기본값은 코스피, 코스닥
+            date (str, optional): 기준일 (YYYYMMDD 형식). 기본값은 오늘
+            min_sessions (int, optional): 최소 확보할 거래일 수 (부족하면 과거 구간 추가 조회)
+        """
+        if date is None:
+            date = datetime.today().strftime("%Y%m%d")
+        codes = [INDEX_CODES.get(market, market) for market in markets]
+        stale = [code for code in codes if self.index_cache.needs_refresh(code, date)]
+        short = [code for code in codes if code not in stale and len(self.index_cache.contiguous_history(code, date)) < min_sessions]
+
+        if not stale and not short:
+            self.logger.info(f"지수 이력 최신 상태 - {', '.join(codes)} (기준일: {date})")
+            return
+
+        self.logger.info(f"지수 이력 갱신 시작 - {', '.join(stale + short)} (기준일: {date})")
+        frames = []
+        if stale:
+            with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+                frames = list(executor.map(lambda code: self.get_domestic_index(market_code=code, date=date), stale))
+
+        for code, df in zip(stale + short, frames + [None] * len(short)):
+            added = self.index_cache.store(code, df, through=date) if df is not None else 0
+
+            # 기준일부터 이어진 이력이 부족하면(처음 조회 또는 오래 멈췄다가 재개해 중간이 빈 경우) 빈 구간 이전부터 추가 조회
+            history = self.index_cache.contiguous_history(code, date)
+            while 0 < len(history) < min_sessions:
+                since = self.index_cache.covered_since(code, date)
+                before = (since - pd.Timedelta(days=1)).strftime("%Y%m%d")
+                older = self.get_domestic_index(market_code=code, date=before)
+                added += self.index_cache.store(code, older, through=before)
+                if self.index_cache.covered_since(code, date) == since:
+                    break
+                history = self.index_cache.contiguous_history(code, date)
+
+            self.logger.info(f"지수 이력 갱신 완료 - {code}: 신규 {added}거래일, 연속 {len(history)}거래일")
+
+    def get_index_change_rate(self, market, sessions=30, date=None):
+        """지수 이력 저장소에서 N거래일 등락률 계산 (refresh_index_history 이후 호출)
+
         Returns:
-            list: 등락률이 추가된 기관 순매수 데이터 리스트
+            tuple: (등락률(%), 비교 기준일 Timestamp)
         """
-        result = []
-        
-        self.logger.info(f"총 {len(filtered_data)}개 종목의 과거 가격 조회 시작 - 기준일: {reference_date}")
-        
-        for idx, item in enumerate(filtered_data):
-            # 종목코드 추출
-            stock_code = item['mksc_shrn_iscd']
-            stock_name = item['hts_kor_isnm']
-            # 현재가 추출 (문자열을 정수로 변환)
-            current_price = int(item['stck_prpr'])
-            
-            self.logger.debug(f"{idx+1}/{len(filtered_data)} - {stock_name}({stock_code}) 과거 가격 조회")
-            
-            try:
-                # 과거 가격 조회
-                historical_data = self.get_stock_price(stock_code, start_date=reference_date, end_date=reference_date)
-                
-                # 과거 데이터가 존재하는 경우
-                if not historical_data.empty:
-                    # 과거 종가 추출
-                    historical_price = historical_data.iloc[0]['종가']
-                    
-                    # 등락률 계산 (백분율)
-                    if historical_price > 0:
-                        price_change_rate = ((current_price - historical_price) / historical_price) * 100
-                    else:
-                        price_change_rate = 0
-                    
-                    # 원본 데이터를 복사하고 등락률 추가
-                    item_copy = item.copy()
-                    item_copy['historical_price'] = int(historical_price)
-                    item_copy['price_change_rate'] = round(price_change_rate, 2)
-                    result.append(item_copy)
-                    
-                    self.logger.debug(f"{stock_name} - 현재가: {current_price}, 과거가: {int(historical_price)}, 등락률: {round(price_change_rate, 2)}%")
-                else:
-                    # 과거 데이터가 없는 경우 원본 데이터를 유지
-                    item_copy = item.copy()
-                    item_copy['historical_price'] = 0
-                    item_copy['price_change_rate'] = 0
-                    result.append(item_copy)
-                    
-                    self.logger.warning(f"{stock_name} - 과거 데이터 없음")
-            except Exception as e:
-                # 오류 발생 시 원본 데이터를 유지
-                self.logger.error(f"오류: 종목 {stock_code} 과거 가격 조회 실패: {str(e)}")
-                item_copy = item.copy()
-                item_copy['historical_price'] = 0
-                item_copy['price_change_rate'] = 0
-                result.append(item_copy)
-                
-        self.logger.info(f"과거 가격 조회 및 등락률 계산 완료 - {len(result)}개 종목")
-        return result
+        return self.index_cache.change_rate(INDEX_CODES.get(market, market), sessions, date)
+
+    def get_index_change_rates(self, market, windows, date=None):
+        """지수 이력 저장소에서 여러 기간의 등락률을 한 번에 계산 (refresh_index_history 이후 호출)
+
+        Returns:
+            dict: {거래일 수: (등락률(%), 비교 기준일 Timestamp)}
+        """
+        return self.index_cache.change_rates(INDEX_CODES.get(market, market), windows, date)
+
+    def load_ranking_frame(self, data, top_n=None):
+        """랭킹 API 응답(list of dict)을 타입이 지정된 컬럼형 DataFrame으로 한 번만 변환
+
+        Args:
+            data (list): get_institution_total_report 결과
+            top_n (int, optional): 상위 몇 개 종목만 사용할지. 기본값은 전체
+
+        Returns:
+            pandas.DataFrame: 숫자 필드는 숫자형으로 변환된 랭킹 데이터 (순위 순서 유지)
+        """
+        frame = pd.DataFrame(data[:top_n] if top_n else data)
+        for col in frame.columns:
+            if col not in RANKING_TEXT_COLUMNS:
+                frame[col] = pd.to_numeric(frame[col], errors='coerce')
+        return frame.reset_index(drop=True)
 
-    def add_market_info_and_index_rate(self, enhanced_data, kospi_index_change_rate, kosdaq_index_change_rate):
-        """기관 순매수 데이터에 시장 정보와 해당 시장 지수 등락률을 추가하는 함수
+    def _as_ranking_frame(self, data):
+        return data if isinstance(data, pd.DataFrame) else self.load_ranking_frame(data)
+
+    def _fetch_close_safe(self, stock_code, reference_date):
+        """기준일 종가 조회 (실패하거나 데이터가 없으면 None)"""
+        try:
+            return self.get_close_price(stock_code, reference_date)
+        except Exception as e:
+            self.logger.error("오류: 종목 %s 과거 가격 조회 실패: %s", stock_code, e)
+            return None
+
+    def _fetch_closes_safe(self, stock_code, dates):
+        """여러 기준일 종가를 한 번의 기간 조회로 가져옴 (실패하거나 데이터가 없는 날짜는 None)"""
+        if len(dates) == 1:
+            return [self._fetch_close_safe(stock_code, dates[0])]
+        try:
+            df = self.get_stock_price(stock_code, start_date=dates[0], end_date=dates[-1])
+        except Exception as e:
+            self.logger.error("오류: 종목 %s 과거 가격 조회 실패: %s", stock_code, e)
+            return [None] * len(dates)
+        closes = dict(zip(df['날짜'].dt.strftime('%Y%m%d'), df['종가']))
+        return [closes.get(date) for date in dates]
+
+    def _map_codes(self, fetch, codes, max_workers):
+        """종목코드별 조회를 순차 또는 동시에 실행 (입력 순서대로 결과 반환)"""
+        if max_workers <= 1 or len(codes) <= 1:
+            return [fetch(code) for code in codes]
+
+        # 스레드마다 토큰을 새로 발급받지 않도록 미리 토큰 확보
+        self.get_token()
+
+        # executor.map은 입력 순서대로 결과를 반환
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(codes))) as executor:
+            return list(executor.map(fetch, codes))
+
+    def fetch_close_matrix(self, stock_codes, reference_dates, max_workers=None):
+        """여러 종목의 여러 기준일 종가를 조회 (종목마다 가장 오래된~가장 최근 기준일 기간을 한 번만 조회)
+
+        Args:
+            stock_codes (iterable): 종목코드 목록 (중복 허용, 조회는 한 번만)
+            reference_dates (iterable): 기준일 목록 (YYYYMMDD 형식)
+            max_workers (int, optional): 동시 조회 스레드 수. 기본값은 KIS_MAX_WORKERS 환경변수(1 이하이면 순차 조회)
+
+        Returns:
+            pandas.DataFrame: 종목코드 인덱스, 기준일 컬럼(오름차순)의 종가 (조회 실패/데이터 없음은 NaN)
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        codes = list(dict.fromkeys(stock_codes))
+        dates = sorted(set(reference_dates))
+
+        rows = self._map_codes(lambda code: self._fetch_closes_safe(code, dates), codes, max_workers)
+        return pd.DataFrame(rows, index=codes, columns=dates, dtype=float)
+
+    def fetch_close_prices(self, stock_codes, reference_date, max_workers=None):
+        """여러 종목의 기준일 종가를 중복 없이 조회
+
+        Args:
+            stock_codes (iterable): 종목코드 목록 (중복 허용, 조회는 한 번만)
+            reference_date (str): 조회 기준일(YYYYMMDD 형식)
+            max_workers (int, optional): 동시 조회 스레드 수. 기본값은 KIS_MAX_WORKERS 환경변수(1 이하이면 순차 조회)
+
+        Returns:
+            pandas.Series: 종목코드 인덱스의 종가 (조회 실패/데이터 없음은 NaN)
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        codes = list(dict.fromkeys(stock_codes))
+
+        closes = self._map_codes(lambda code: self._fetch_close_safe(code, reference_date), codes, max_workers)
+        return pd.Series(closes, index=codes, dtype=float)
+
+    def add_historical_price_change(self, ranking, reference_date, max_workers=None, closes=None):
+        """랭킹 데이터에 과거 가격 대비 현재 가격 등락률 컬럼을 추가하는 함수
         
         Args:
-            enhanced_data (list): 과거 가격 비교 등락률이 추가된 데이터 리스트
-            kospi_index_change_rate (float): 코스피 지수 등락률
-            kosdaq_index_change_rate (float): 코스닥 지수 등락률
+            ranking (pandas.DataFrame | list): load_ranking_frame 결과 (list면 변환 후 사용)
+            reference_date (str | dict): 과거 가격 조회 기준일(YYYYMMDD 형식) 또는 {기간(거래일): 기준일}
+            max_workers (int, optional): 동시 조회 스레드 수. 기본값은 KIS_MAX_WORKERS 환경변수(1 이하이면 순차 조회)
+            closes (pandas.Series | pandas.DataFrame, optional): 이미 조회한 종목코드별 기준일 종가
+                (fetch_close_prices/fetch_close_matrix 결과, 있으면 API 조회 생략)
             
         Returns:
-            list: 시장 정보와 지수 등락률이 추가된 데이터 리스트
+            pandas.DataFrame: historical_price, price_change_rate 컬럼이 추가된 데이터 (순위 순서 유지, 조회 실패 시 0)
+                기간별 기준일이면 historical_price_{N}d, price_change_rate_{N}d 컬럼
         """
-        result = []
-        
-        self.logger.info(f"총 {len(enhanced_data)}개 종목의 시장 정보 조회 시작")
-        self.logger.info(f"코스피 지수 등락률: {kospi_index_change_rate}%, 코스닥 지수 등락률: {kosdaq_index_change_rate}%")
-        
-        kospi_count = 0
-        kosdaq_count = 0
-        other_count = 0
+        frame = self._as_ranking_frame(ranking).copy()
+        if max_workers is None:
+            max_workers = self.max_workers
+        reference_dates = as_windowed(reference_date)
+
+        if closes is None:
+            self.logger.info(f"총 {len(frame)}개 종목의 과거 가격 조회 시작 - 기준일: {', '.join(reference_dates.values())}, 동시 조회 수: {max_workers}")
+            closes = self.fetch_close_matrix(frame['mksc_shrn_iscd'], reference_dates.values(), max_workers)
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(next(iter(reference_dates.values())))
+
+        # 종목 × 기간 행렬로 한 번에 계산
+        historical = closes.reindex(index=frame['mksc_shrn_iscd'], columns=list(reference_dates.values())).fillna(0).to_numpy(dtype=float)
+        current = frame['stck_prpr'].to_numpy(dtype=float)[:, None]
+        valid = historical > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = np.where(valid, np.round((current - historical) / historical * 100, 2), 0.0)
+
+        for i, window in enumerate(reference_dates):
+            suffix = window_suffix(window)
+            frame[f'historical_price{suffix}'] = historical[:, i].astype(int)
+            frame[f'price_change_rate{suffix}'] = rates[:, i]
+
+        missing = frame.loc[~valid.all(axis=1), 'hts_kor_isnm'].tolist()
+        if missing:
+            self.logger.warning(f"과거 데이터 없음 - {len(missing)}개 종목: {', '.join(missing)}")
+
+        self.logger.info(f"과거 가격 조회 및 등락률 계산 완료 - {len(frame)}개 종목")
+        return frame
+
+    def add_market_info_and_index_rate(self, enhanced_data, kospi_index_change_rate, kosdaq_index_change_rate, ticker_index=None):
+        """랭킹 데이터에 시장 정보, 해당 시장 지수 등락률, 시장 대비 초과 등락률 컬럼을 추가하는 함수
         
-        for idx, item in enumerate(enhanced_data):
-            # 종목코드 추출
-            stock_code = item['mksc_shrn_iscd']
-            stock_name = item['hts_kor_isnm']
-            
-            # 시장 구분 확인
-            market = checkMarket(stock_code)
-            
-            # 원본 데이터를 복사하고 시장 정보 및 지수 등락률 추가
-            item_copy = item.copy()
-            item_copy['market'] = market
-            
-            # 해당 시장의 지수 등락률 추가
-            if market == "KOSPI":
-                item_copy['index_change_rate'] = kospi_index_change_rate
-                kospi_count += 1
-            elif market == "KOSDAQ":
-                item_copy['index_change_rate'] = kosdaq_index_change_rate
-                kosdaq_count += 1
-            else:
-                item_copy['index_change_rate'] = 0
-                other_count += 1
-                self.logger.warning(f"{stock_name}({stock_code}) - 알 수 없는 시장")
-                
-            # 종목의 등락률과 시장 지수 등락률의 차이 계산
-            # item_copy['outperform_rate'] = round(item_copy['price_change_rate'] - item_copy['index_change_rate'], 2)
-            
-            self.logger.debug(f"{idx+1}/{len(enhanced_data)} - {stock_name}({stock_code}): {market} 시장")
-            
-            result.append(item_copy)
+        Args:
+            enhanced_data (pandas.DataFrame | list): 과거 가격 비교 등락률이 추가된 데이터
+            kospi_index_change_rate (float | dict): 코스피 지수 등락률 또는 {기간(거래일): 등락률}
+            kosdaq_index_change_rate (float | dict): 코스닥 지수 등락률 또는 {기간(거래일): 등락률}
+            ticker_index (TickerMarketIndex, optional): 종목 시장 인덱스. 기본값은 오늘자 인덱스
             
-        self.logger.info(f"시장 정보 추가 완료 - KOSPI: {kospi_count}개, KOSDAQ: {kosdaq_count}개, 기타: {other_count}개")
-        return result
+        Returns:
+            pandas.DataFrame: market, index_change_rate, outperform_rate 컬럼이 추가된 데이터
+                기간별 등락률이면 index_change_rate_{N}d, outperform_rate_{N}d 컬럼
+        """
+        frame = self._as_ranking_frame(enhanced_data).copy()
+        if ticker_index is None:
+            ticker_index = TickerMarketIndex.load()
+
+        self.logger.info(f"총 {len(frame)}개 종목의 시장 정보 조회 시작")
+        kospi_rates, kosdaq_rates = as_windowed(kospi_index_change_rate), as_windowed(kosdaq_index_change_rate)
+        windows = list(kospi_rates)
+        describe = lambda rates: ", ".join(f"{rate}%" if window is None else f"{window}일 {rate}%" for window, rate in rates.items())
+        self.logger.info(f"코스피 지수 등락률: {describe(kospi_rates)}, 코스닥 지수 등락률: {describe(kosdaq_rates)}")
+
+        frame['market'] = frame['mksc_shrn_iscd'].map(ticker_index.ticker_market).fillna("Not Found")
+
+        # 종목 × 기간 지수 등락률 행렬 (시장을 알 수 없으면 0)
+        markets = frame['market'].to_numpy(dtype=object)[:, None]
+        index_matrix = np.where(markets == "KOSPI", np.array([kospi_rates[window] for window in windows], dtype=float),
+                                np.where(markets == "KOSDAQ", np.array([kosdaq_rates[window] for window in windows], dtype=float), 0.0))
+
+        # 종목의 등락률과 시장 지수 등락률의 차이 계산
+        stock_columns = [f'price_change_rate{window_suffix(window)}' for window in windows]
+        has_stock_rates = all(col in frame.columns for col in stock_columns)
+        if has_stock_rates:
+            outperform = (frame[stock_columns].to_numpy(dtype=float) - index_matrix).round(2)
+
+        for i, window in enumerate(windows):
+            suffix = window_suffix(window)
+            frame[f'index_change_rate{suffix}'] = index_matrix[:, i]
+            if has_stock_rates:
+                frame[f'outperform_rate{suffix}'] = outperform[:, i]
 
-    def convert_to_dataframe(self, data, top_n=10):
-        """API 응답 데이터를 DataFrame으로 변환"""
-        if not data:
+        counts = frame['market'].value_counts()
+        unknown = frame.loc[frame['market'] == "Not Found"]
+        if not unknown.empty:
+            self.logger.warning("알 수 없는 시장 - " + ", ".join(f"{name}({code})" for name, code in zip(unknown['hts_kor_isnm'], unknown['mksc_shrn_iscd'])))
+
+        self.logger.info(f"시장 정보 추가 완료 - KOSPI: {counts.get('KOSPI', 0)}개, KOSDAQ: {counts.get('KOSDAQ', 0)}개, 기타: {len(unknown)}개")
+        return frame
+
+    def convert_to_dataframe(self, data, top_n=10, vectorized=True, spec=DEFAULT_RANKING, windows=None):
+        """API 응답 데이터를 DataFrame으로 변환
+
+        Args:
+            data (pandas.DataFrame | list): 시장 정보/등락률이 추가된 데이터
+            top_n (int, optional): 상위 몇 개 종목만 변환할지. 기본값은 10
+            vectorized (bool, optional): NumPy 배열 연산으로 포맷할지 여부. False면 행 단위 포맷(기존 방식)
+            spec (RankingSpec, optional): 랭킹 조회 조건 (수량/금액 컬럼 결정). 기본값은 기관 순매수
+            windows (list, optional): 기간별 등락률 컬럼을 만들 거래일 수 목록. 기본값은 단일 기간 컬럼
+        """
+        if data is None or len(data) == 0:
             self.logger.warning("데이터가 없어 DataFrame 변환 불가")
             return pd.DataFrame()
         
         self.logger.info(f"DataFrame 변환 시작 - 총 {len(data)}개 항목, top_n={top_n}")
         
         # 상위 N개만 필터링
-        filtered_data = data[:top_n] if len(data) > top_n else data
-        
-        # 필요한 컬럼 추출
-        df = pd.DataFrame(filtered_data)
+        if isinstance(data, pd.DataFrame):
+            df = data.head(top_n)
+        else:
+            df = pd.DataFrame(data[:top_n])
         
-        self.logger.debug(f"DataFrame 변환 - 컬럼: {list(df.columns)}")
+        self.logger.debug("DataFrame 변환 - 컬럼: %s", df.columns.tolist())
+
+        if vectorized:
+            result_df = self._format_report_columns(df, spec, windows)
+            self.logger.info(f"DataFrame 변환 완료 - 결과 컬럼: {list(result_df.columns)}")
+            return result_df
         
         # 종목명과 종목코드 합치기 전에 별도 DataFrame 생성
         result_df = pd.DataFrame()
@@ -502,10 +895,10 @@ class InstitutionTotalReport:
                 return f"{value_float:.2f}%"
         
         # 시장등락률(30일)과 종목등락률(30일)을 하나로 합치기
-        def format_compare_rates(row):
+        def format_compare_rates(row, suffix=""):
             market = row['market']
-            market_rate = float(row['index_change_rate'])
-            stock_rate = float(row['price_change_rate'])
+            market_rate = float(row[f'index_change_rate{suffix}'])
+            stock_rate = float(row[f'price_change_rate{suffix}'])
             
             market_text = f"{market}: "
             if market_rate < 0:
@@ -525,18 +918,260 @@ class InstitutionTotalReport:
                 
             return f"{market_text}<br>{stock_text}"
         
-        # 시장대비등락률 컬럼 추가
-        result_df['시장대비등락률'] = df.apply(format_compare_rates, axis=1)
+        # 시장대비등락률 컬럼 추가 (기간별)
+        for window in (windows or [None]):
+            result_df[lookback_column_name(window)] = df.apply(format_compare_rates, axis=1, suffix=window_suffix(window))
         
         # result_df['전일대비율(%)'] = df['prdy_ctrt'].apply(format_rate)
-        result_df['기관순매수량'] = df['orgn_ntby_qty'].astype(int).map('{:,}'.format)
-        result_df['기관순매수금액'] = (df['orgn_ntby_tr_pbmn'].astype(float) / 100).round(2).map('{:,}'.format)  # 억원 단위로 변환
+        result_df[spec.qty_column] = df[spec.qty_field].astype(int).map('{:,}'.format)
+        result_df[spec.amount_column] = (df[spec.amount_field].astype(float) / 100).round(2).map('{:,}'.format)  # 억원 단위로 변환
         
         self.logger.info(f"DataFrame 변환 완료 - 결과 컬럼: {list(result_df.columns)}")
         return result_df
     
-    def save_df_as_image(self, df, file_name="institution_top_report"):
-        """DataFrame을 이미지로 저장하고 파일 경로 반환"""
+    def fetch_rankings(self, specs, top_n=10, date=None):
+        """여러 랭킹을 같은 토큰으로 동시에 조회 (랭킹 저장소가 있으면 전체 순위를 날짜별로 저장)
+
+        Args:
+            date (str, optional): 랭킹 기준일 (YYYYMMDD 형식, 저장용). 기본값은 오늘
+
+        Returns:
+            list: specs 순서의 랭킹 DataFrame 목록 (load_ranking_frame 결과)
+        """
+        if date is None:
+            date = datetime.today().strftime("%Y%m%d")
+
+        def fetch(spec):
+            frame = self.load_ranking_frame(self.get_institution_total_report(spec))
+            self.save_ranking_snapshot(spec, frame, date)
+            return frame.head(top_n) if top_n else frame
+
+        # 모든 랭킹이 같은 토큰을 쓰도록 미리 확보한 뒤 랭킹 동시 조회
+        self.get_token()
+        with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+            return list(executor.map(fetch, specs))
+
+    def save_ranking_snapshot(self, spec, ranking, date):
+        """랭킹 전체 순위를 저장소에 저장 (같은 날짜는 교체, 실패해도 리포트 생성은 계속)"""
+        if self.ranking_store is None:
+            return
+        try:
+            count = self.ranking_store.append(date, spec.key, self._as_ranking_frame(ranking))
+            self.logger.info(f"{spec.title} 랭킹 저장 완료 - {date}: {count}개 종목")
+        except Exception as e:
+            self.logger.error(f"{spec.title} 랭킹 저장 실패 - {date}: {str(e)}")
+
+    def load_ranking_history(self, start_date=None, end_date=None, tickers=None, spec=None, top_n=None):
+        """저장된 일별 랭킹 조회
+
+        Args:
+            start_date (str, optional): 조회 시작일 (YYYYMMDD 형식). 기본값은 처음부터
+            end_date (str, optional): 조회 종료일 (YYYYMMDD 형식). 기본값은 마지막 저장일까지
+            tickers (iterable, optional): 종목코드 목록. 기본값은 전체
+            spec (RankingSpec, optional): 랭킹 조회 조건. 기본값은 전체 랭킹
+            top_n (int, optional): 순위 상위 N개만
+
+        Returns:
+            pandas.DataFrame: date, ranking, rank + 랭킹 응답 필드 (숫자 필드는 숫자형)
+        """
+        if self.ranking_store is None:
+            raise Exception("랭킹 저장소가 비활성화되어 있습니다 (RANKING_STORE_ENABLED)")
+        return self.ranking_store.load(start_date, end_date, tickers, spec.key if spec else None, top_n)
+
+    def get_ranking_streak(self, stock_code, spec=DEFAULT_RANKING, top_n=10, date=None):
+        """거래일 기준으로 종목이 연속해서 상위 N위 안에 든 일수 (랭킹이 저장되지 않은 거래일에서 끊김)"""
+        if self.ranking_store is None:
+            raise Exception("랭킹 저장소가 비활성화되어 있습니다 (RANKING_STORE_ENABLED)")
+        return self.ranking_store.streak(stock_code, spec.key, top_n, date)
+
+    def fetch_ranking_closes(self, rankings, reference_date):
+        """모든 랭킹 종목의 기준일 종가를 중복 없이 한 번에 조회
+
+        Args:
+            reference_date (str | dict): 기준일(YYYYMMDD 형식) 또는 {기간(거래일): 기준일} (종목당 기간 조회 1회)
+        """
+        all_codes = pd.concat([ranking['mksc_shrn_iscd'] for ranking in rankings], ignore_index=True)
+        reference_dates = as_windowed(reference_date)
+        self.logger.info(f"과거 가격 조회 시작 - 랭킹 {len(rankings)}개, 고유 종목 {all_codes.nunique()}개, 기준일: {', '.join(reference_dates.values())}")
+        if isinstance(reference_date, dict):
+            return self.fetch_close_matrix(all_codes, reference_dates.values())
+        return self.fetch_close_prices(all_codes, reference_date)
+
+    def update_rolling_netbuy(self, date):
+        """기준일에 저장된 랭킹으로 기관 순매수 누적 집계 갱신
+
+        Returns:
+            int: 반영한 종목 수 (누적 집계를 사용하지 않으면 0)
+        """
+        if self.rolling_netbuy is None:
+            return 0
+        count = self.rolling_netbuy.update(date, self.ranking_store.load(date, date))
+        self.logger.info(f"기관 순매수 누적 갱신 완료 - {date}: {count}개 종목")
+        return count
+
+    def build_rolling_reports(self, top_n=10, today=None):
+        """기관 N거래일 누적 순매수 상위 리포트 이미지 생성 (update_rolling_netbuy 이후 호출)
+
+        Returns:
+            list: [(RollingNetBuySpec, 이미지 경로/RenderedImage 또는 None, 캡션), ...]
+        """
+        if self.rolling_netbuy is None:
+            return []
+
+        today_display = (datetime.strptime(today, '%Y%m%d') if today else datetime.now()).strftime('%Y-%m-%d')
+        results = []
+        for window in self.rolling_netbuy.windows:
+            days = len(self.rolling_netbuy.dates(window))
+            if days < window:
+                # 배포 직후나 실행을 건너뛴 날이 있으면 N거래일이 다 모이지 않으므로 생성/전송하지 않음
+                self.logger.info(f"누적 순매수 리포트 생략 - {window}거래일 중 {days}거래일만 집계됨")
+                continue
+            spec = RollingNetBuySpec(window)
+            df = self._format_rolling_columns(self.rolling_netbuy.top(window, top_n), window)
+            caption = spec.caption(today_display, top_n)
+            results.append((spec, self.create_report_image(df, spec.file_name, caption, date=today), caption))
+
+        self.logger.info(f"누적 순매수 리포트 생성 완료 - 성공 {sum(1 for _, image, _ in results if image)}/{len(results)}개")
+        return results
+
+    def _format_rolling_columns(self, top, window):
+        """누적 순매수 상위 종목 → 리포트 표시용 컬럼"""
+        result_df = pd.DataFrame(index=top.index)
+        if top.empty:
+            return result_df
+
+        result_df['종목명'] = top['name'].to_numpy(dtype=object) + " <span class='stock-code'>(" + top['ticker'].to_numpy(dtype=object) + ")</span>"
+        result_df['현재가'] = format_thousands(top['price'].to_numpy())
+        result_df[DEFAULT_RANKING.qty_column] = format_thousands(top['qty'].to_numpy())
+        result_df[DEFAULT_RANKING.amount_column] = format_float_thousands((top['amount'] / 100).round(2).to_numpy())  # 억원 단위로 변환
+        result_df['랭킹포함일'] = top['days'].astype(str).to_numpy(dtype=object) + f"/{window}"
+        return result_df
+
+    def build_ranking_reports(self, specs, rankings, closes, reference_date, kospi_index_change_rate, kosdaq_index_change_rate, ticker_index=None, top_n=10, today=None):
+        """조회가 끝난 랭킹/종가/지수 등락률로 랭킹별 리포트 이미지를 생성
+
+        Args:
+            today (str, optional): 리포트 기준일 (YYYYMMDD 형식, 캡션 표시용). 기본값은 오늘
+
+        Returns:
+            list: [(RankingSpec, 이미지 경로/RenderedImage 또는 None, 캡션), ...] (specs 순서)
+        """
+        today_display = (datetime.strptime(today, '%Y%m%d') if today else datetime.now()).strftime('%Y-%m-%d')
+        windows = [window for window in as_windowed(reference_date) if window is not None] or None
+        results = []
+        for spec, ranking in zip(specs, rankings):
+            enhanced = self.add_historical_price_change(ranking, reference_date, closes=closes)
+            final = self.add_market_info_and_index_rate(enhanced, kospi_index_change_rate, kosdaq_index_change_rate, ticker_index)
+            df = self.convert_to_dataframe(final, top_n=top_n, spec=spec, windows=windows)
+            caption = spec.caption(today_display, top_n)
+            results.append((spec, self.create_report_image(df, spec.file_name, caption, date=today), caption))
+
+        self.logger.info(f"랭킹 리포트 생성 완료 - 성공 {sum(1 for _, image, _ in results if image)}/{len(results)}개")
+        return results
+
+    def generate_ranking_reports(self, specs, reference_date, kospi_index_change_rate, kosdaq_index_change_rate, ticker_index=None, top_n=10):
+        """여러 랭킹 리포트를 한 번에 생성
+
+        랭킹은 동시에 조회하고, 토큰/지수 등락률/종목 인덱스는 공유하며,
+        과거 가격은 모든 랭킹의 종목을 합쳐 중복 없이 한 번만 조회한다.
+
+        Args:
+            specs (list): RankingSpec 목록
+            reference_date (str | dict): 과거 가격 조회 기준일(YYYYMMDD 형식) 또는 {기간(거래일): 기준일}
+            kospi_index_change_rate (float | dict): 코스피 지수 등락률 (기간별이면 reference_date와 같은 키)
+            kosdaq_index_change_rate (float | dict): 코스닥 지수 등락률 (기간별이면 reference_date와 같은 키)
+            ticker_index (TickerMarketIndex, optional): 종목 시장 인덱스
+            top_n (int, optional): 랭킹별 상위 종목 수. 기본값은 10
+
+        Returns:
+            list: [(RankingSpec, 이미지 경로/RenderedImage 또는 None, 캡션), ...] (specs 순서)
+        """
+        specs = list(dict.fromkeys(specs))
+        self.logger.info(f"랭킹 리포트 생성 시작 - {', '.join(spec.key for spec in specs)}")
+
+        rankings = self.fetch_rankings(specs, top_n)
+        closes = self.fetch_ranking_closes(rankings, reference_date)
+        return self.build_ranking_reports(specs, rankings, closes, reference_date, kospi_index_change_rate, kosdaq_index_change_rate, ticker_index, top_n)
+
+    def get_report_template(self, columns):
+        """컬럼 구성별 리포트 템플릿 반환 (한 번 만든 템플릿은 재사용)"""
+        key = tuple(columns)
+        if key not in self.report_templates:
+            self.report_templates[key] = ReportTemplate([report_column(name) for name in key], REPORT_SOURCE)
+        return self.report_templates[key]
+
+    def _format_report_columns(self, df, spec=DEFAULT_RANKING, windows=None):
+        """리포트 표시용 컬럼을 배열 연산으로 생성 (행 단위 포맷과 동일한 결과)"""
+        names = df['hts_kor_isnm'].to_numpy(dtype=object)
+        codes = df['mksc_shrn_iscd'].to_numpy(dtype=object)
+        markets = df['market'].to_numpy(dtype=object)
+
+        result_df = pd.DataFrame(index=df.index)
+        result_df['종목명'] = names + " <span class='stock-code'>(" + codes + ")</span>"
+        result_df['현재가'] = format_thousands(df['stck_prpr'].astype(int).to_numpy())
+        for window in (windows or [None]):
+            suffix = window_suffix(window)
+            market_rates = format_rate_spans(df[f'index_change_rate{suffix}'].to_numpy(dtype=float))
+            stock_rates = format_rate_spans(df[f'price_change_rate{suffix}'].to_numpy(dtype=float))
+            result_df[lookback_column_name(window)] = markets + ": " + market_rates + "<br>종목: " + stock_rates
+        result_df[spec.qty_column] = format_thousands(df[spec.qty_field].astype(int).to_numpy())
+        result_df[spec.amount_column] = format_float_thousands((df[spec.amount_field].astype(float) / 100).round(2).to_numpy())  # 억원 단위로 변환
+        return result_df
+
+    def create_report_image(self, df, file_name="institution_top_report", caption=None, date=None):
+        """전달 방식(REPORT_IMAGE_MODE)에 맞춰 리포트 이미지 생성
+
+        Args:
+            date (str, optional): 리포트 기준일 (YYYYMMDD 형식, 파일명/보관 기준). 기본값은 오늘
+
+        Returns:
+            str | RenderedImage | None: file 모드는 저장 경로, memory 모드는 메모리 이미지
+        """
+        date = date or datetime.now().strftime('%Y%m%d')
+        if self.image_mode != 'memory':
+            return self.save_df_as_image(df, file_name, caption, date=date)
+
+        image = self.render_df_image(df, file_name, caption, date=date)
+        if image is not None and self.archive_images:
+            # 보관용 파일 저장은 전송과 별개로 백그라운드에서 처리
+            self.image_archiver.submit(image, file_name, date)
+        return image
+
+    def save_df_as_image(self, df, file_name="institution_top_report", caption=None, date=None):
+        """DataFrame을 이미지로 저장하고 파일 경로 반환
+
+        Args:
+            df (pandas.DataFrame): convert_to_dataframe 결과
+            file_name (str, optional): 저장 파일명 (날짜가 뒤에 붙음)
+            caption (str, optional): 이미지 상단 제목. 기본값은 '오늘 기관 순매수 상위 TOP 10'
+            date (str, optional): 리포트 기준일 (YYYYMMDD 형식, 파일명/보관 기준). 기본값은 오늘
+        """
+        date = date or datetime.now().strftime('%Y%m%d')
+        image = self.render_df_image(df, file_name, caption, date=date)
+        if image is None:
+            return None
+
+        try:
+            file_name = os.path.splitext(file_name)[0]
+            return self.image_archiver.archive(image, file_name, date)
+        except Exception as e:
+            error_message = f"❌ 오류 발생\n\n함수: save_df_as_image\n파일: {file_name}\n오류: {str(e)}"
+            AlertUtil().send(error_message)
+            self.logger.error(f"이미지 저장 중 오류 발생: {str(e)}")
+            return None
+
+    def render_df_image(self, df, file_name="institution_top_report", caption=None, date=None):
+        """DataFrame을 PNG 바이트로 렌더링 (디스크에 쓰지 않음)
+
+        Args:
+            df (pandas.DataFrame): convert_to_dataframe 결과
+            file_name (str, optional): 파일명 (날짜가 뒤에 붙음)
+            caption (str, optional): 이미지 상단 제목. 기본값은 '오늘 기관 순매수 상위 TOP 10'
+            date (str, optional): 리포트 기준일 (YYYYMMDD 형식). 기본값은 오늘
+
+        Returns:
+            RenderedImage | None: 렌더링 실패 시 None
+        """
         if df.empty:
             self.logger.warning("DataFrame이 비어 있어 이미지를 생성할 수 없습니다.")
             return None
@@ -546,132 +1181,30 @@ class InstitutionTotalReport:
         if not file_name.endswith('.png'):
             file_name = file_name + '.png'
             
+        report_day = datetime.strptime(date, '%Y%m%d') if date else datetime.now()
         file_name, file_extension = os.path.splitext(file_name)
-        current_date = datetime.now().strftime('%Y%m%d')
-        new_file_path = os.path.join(self.img_dir, f"{file_name}_{current_date}{file_extension}")
-        
-        # 이전 파일 삭제
-        removed_count = 0
-        for old_file in os.listdir(self.img_dir):
-            if old_file.startswith(file_name) and old_file.endswith(file_extension):
-                try:
-                    os.remove(os.path.join(self.img_dir, old_file))
-                    removed_count += 1
-                    self.logger.debug(f"기존 파일 삭제: {old_file}")
-                except Exception as e:
-                    self.logger.warning(f"파일 삭제 실패: {old_file} - {str(e)}")
-                    
-        self.logger.info(f"{removed_count}개의 기존 파일 삭제 완료")
+        image_name = dated_file_name(file_name, report_day.strftime('%Y%m%d'), file_extension)
 
         # 캡션 설정
-        today_display = datetime.now().strftime('%Y-%m-%d')
-        caption = f"{today_display} 기관 순매수 상위 TOP 10"
+        if caption is None:
+            today_display = report_day.strftime('%Y-%m-%d')
+            caption = DEFAULT_RANKING.caption(today_display)
+
+        if self.renderer == 'pillow' and self.pillow_renderer is None:
+            try:
+                self.pillow_renderer = PillowTableRenderer()
+            except FileNotFoundError as e:
+                # 글꼴이 없으면 실행을 멈추지 않고 wkhtmltoimage로 대체
+                self.logger.warning(f"Pillow 렌더러를 사용할 수 없어 wkhtmltoimage로 생성합니다: {str(e)}")
+                self.renderer = 'wkhtmltoimage'
+
+        if self.renderer == 'pillow':
+            return self._render_df_with_pillow(df, image_name, file_name, caption)
         
         self.logger.debug("HTML 생성 시작")
 
-        # HTML 생성
-        html_str = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap" rel="stylesheet">
-            <style>
-                body {{
-                    font-family: 'Noto Sans KR', sans-serif;
-                    margin: 10px;
-                    padding: 0;
-                    max-width: 600px;
-                }}
-                table {{
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin: 10px auto;
-                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                }}
-                th, td {{
-                    border: 1px solid #e0e0e0;
-                    padding: 8px 10px;
-                    text-align: center;
-                }}
-                th {{
-                    background-color: #333333;
-                    color: white;
-                    font-weight: 700;
-                    font-size: 13px;
-                    white-space: nowrap;
-                }}
-                td {{
-                    font-size: 12px;
-                    font-weight: 500;
-                }}
-                td.stock-name {{
-                    text-align: center;
-                }}
-                .stock-code {{
-                    font-size: 10px;
-                    color: #666;
-                    display: block;
-                    margin-top: 2px;
-                }}
-                tr:nth-child(even) td {{
-                    background-color: #f9f9f9;
-                }}
-                tr:hover td {{
-                    background-color: #f5f5f5;
-                }}
-                .caption {{
-                    text-align: center;
-                    font-size: 18px;
-                    font-weight: 700;
-                    margin: 15px 0;
-                    color: #333333;
-                }}
-                .source {{
-                    text-align: right;
-                    font-size: 11px;
-                    color: #666666;
-                    margin-top: 10px;
-                    font-weight: 400;
-                }}
-                .positive {{
-                    color: #d32f2f;
-                }}
-                .negative {{
-                    color: #1976d2;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="caption">{caption}</div>
-        '''
-
-        # DataFrame을 HTML로 변환하고 종목명 열에 class 추가
-        df_html = df.to_html(index=False, classes='styled-table', escape=False)
-
-        # 시장대비등락률 헤더를 시장대비등락률<br>(30일기준)으로 변경
-        df_html = df_html.replace('>시장대비등락률<', '>시장대비등락률<br>(30일기준)<')
-        
-        # 순매수금액 헤더를 순매수금액<br>(억원)으로 변경
-        df_html = df_html.replace('>기관순매수금액<', '>기관순매수금액<br>(억원)<')
-        
-        # 종목명 열에 class 추가 (더 정확한 패턴으로 수정)
-        import re
-        
-        # 헤더에서 첫 번째 <th>종목명</th> 패턴 찾기
-        df_html = df_html.replace('<th>종목명</th>', '<th class="stock-name">종목명</th>')
-        
-        # 데이터 행에서 첫 번째 <td> 태그를 <td class="stock-name"> 으로 변경
-        pattern = r'(<tr[^>]*>)\s*<td([^>]*)>'
-        repl = r'\1<td class="stock-name"\2>'
-        df_html = re.sub(pattern, repl, df_html)
-
-        html_str += df_html
-        html_str += '''
-            <div class="source">※ 출처 : MQ(Money Quotient)</div>
-        </body>
-        </html>
-        '''
+        # HTML 생성 (컴파일된 템플릿에 행만 채움)
+        html_str = self.get_report_template(df.columns).render(caption, df)
         
         self.logger.debug("HTML 생성 완료")
 
@@ -687,101 +1220,233 @@ class InstitutionTotalReport:
         try:
             if not self.wkhtmltoimage_path:
                 error_message = "❌ 오류 발생\n\nWKHTMLTOIMAGE_PATH 환경변수가 설정되지 않았습니다."
-                telegram = TelegramUtil()
-                telegram.send_test_message(error_message)
+                AlertUtil().send(error_message)
                 self.logger.error("WKHTMLTOIMAGE_PATH 환경변수가 설정되지 않았습니다.")
                 raise ValueError("WKHTMLTOIMAGE_PATH 환경변수가 필요합니다.")
                 
             config = imgkit.config(wkhtmltoimage=self.wkhtmltoimage_path)
             self.logger.info("이미지 생성 중...")
-            imgkit.from_string(html_str, new_file_path, options=options, config=config)
-            self.logger.info(f"새 파일 저장 완료: {new_file_path}")
+            # output_path=False → 파일 대신 이미지 바이트 반환
+            with MetricsUtil().span("render", renderer="wkhtmltoimage"):
+                image_bytes = imgkit.from_string(html_str, False, options=options, config=config)
+            if not image_bytes:
+                raise OSError("wkhtmltoimage 출력이 비어 있습니다.")
+            self.logger.info(f"이미지 생성 완료: {image_name} ({len(image_bytes)/1024:.1f}KB)")
             
-            return new_file_path
+            return RenderedImage(image_name, image_bytes)
             
         except Exception as e:
             error_message = f"❌ 오류 발생\n\n함수: save_df_as_image\n파일: {file_name}\n오류: {str(e)}"
-            telegram = TelegramUtil()
-            telegram.send_test_message(error_message)
+            AlertUtil().send(error_message)
             self.logger.error(f"이미지 생성 중 오류 발생: {str(e)}")
             return None
 
+    def _render_df_with_pillow(self, df, image_name, file_name, caption):
+        """외부 프로세스/웹 폰트 없이 Pillow로 이미지 생성"""
+        try:
+            self.logger.info("이미지 생성 중... (Pillow)")
+            with MetricsUtil().span("render", renderer="pillow"):
+                image_bytes = self.pillow_renderer.render_bytes(df, caption, REPORT_SOURCE, self.get_report_template(df.columns).header_labels())
+            self.logger.info(f"이미지 생성 완료: {image_name} ({len(image_bytes)/1024:.1f}KB)")
+
+            return RenderedImage(image_name, image_bytes)
+
+        except Exception as e:
+            error_message = f"❌ 오류 발생\n\n함수: save_df_as_image\n파일: {file_name}\n오류: {str(e)}"
+            AlertUtil().send(error_message)
+            self.logger.error(f"이미지 생성 중 오류 발생: {str(e)}")
+            return None
+
+def deliver_reports(reports, telegram, api_util, dispatcher=None):
+    """생성된 리포트 이미지(파일 경로 또는 RenderedImage)를 텔레그램과 게시판 API로 동시에 전송
+
+    Returns:
+        list: DeliveryResult 목록
+    """
+    logger = LoggerUtil().get_logger()
+    dispatcher = dispatcher or DeliveryDispatcher()
+    thumbnail_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thumbnail', 'thumbnail.png')
+
+    def send_telegram(image, caption):
+        def send():
+            response = telegram.send_multiple_photo([image], caption)
+            if not response.get('ok', False):
+                raise DeliveryError(response.get('error_code'), f"Telegram 전송 실패: {response.get('description', response)}")
+        return send
+
+    def send_post(spec, image, caption):
+        def send():
+            api_util.create_post(
+                title=caption,
+                content=f"{caption} 결과",
+                category=spec.category,
+                writer="admin",
+                image_paths=[image],
+                thumbnail_image_path=thumbnail_path
+            )
+        return send
+
+    sinks = []
+    for spec, image, caption in reports:
+        if not image:
+            logger.warning(f"이미지 생성에 실패했습니다. ({spec.key})")
+            continue
+
+        # 사진/게시글 전송은 멱등이 아니므로 연결 전 실패와 429/5xx만 재시도 (응답 대기 시간 초과는 중복 게시 위험)
+        sinks.append(DeliverySink(f"telegram:{spec.key}", send_telegram(image, caption), retryable=is_retryable_error))
+        sinks.append(DeliverySink(f"board:{spec.key}", send_post(spec, image, caption), retryable=is_retryable_error))
+
+    if not sinks:
+        return []
+
+    logger.info(f"리포트 전송 시작 - {len(sinks)}개 대상")
+    results = dispatcher.dispatch(sinks)
+
+    failures = [result for result in results if not result.success]
+    if failures:
+        error_message = "❌ 전송 오류 발생\n\n" + "\n".join(f"{result.name}: {result.error}" for result in failures)
+        AlertUtil().send(error_message)
+    return results
+
+
+def build_pipeline(report, telegram, api_util, ranking_specs, top_n=10, windows=None, deliver=True):
+    """리포트 생성 단계를 입력/출력 의존성으로 선언한 파이프라인 구성
+
+    종목 인덱스, 랭킹 조회, 코스피/코스닥 지수 갱신은 서로 독립이므로 동시에 실행된다.
+    비교 기준일은 거래일 달력으로 먼저 계산하므로 과거 가격 조회도 지수 갱신을 기다리지 않는다.
+    지수 이력의 기준일이 달력과 다르면 지수 기준일로 종가를 다시 조회해 같은 기간을 비교한다.
+    초기 입력: today (YYYYMMDD)
+
+    Args:
+        windows (list, optional): 등락률 비교 기간(거래일) 목록. 기본값은 report.lookback_windows
+        deliver (bool, optional): False면 이미지까지만 만들고 전송하지 않음 (HTTP 기록 재생 등)
+    """
+    logger = LoggerUtil().get_logger()
+    windows = list(windows or report.lookback_windows)
+
+    def trading_days(today):
+        # 거래일 달력으로 기준 거래일과 기간별 비교 기준일을 바로 계산 (지수 조회를 기다리지 않음)
+        session = report.calendar.session_on_or_before(today)
+        calendar_dates = {window: report.calendar.sessions_ago(session, window - 1).strftime('%Y%m%d') for window in windows}
+        logger.info(f"기준 거래일: {session:%Y%m%d}, 비교 기준일: " + ", ".join(f"{window}일 {date}" for window, date in calendar_dates.items()))
+        return session.strftime('%Y%m%d'), calendar_dates
+
+    def load_index(market):
+        def stage(session_date, calendar_dates):
+            report.refresh_index_history((market,), date=session_date, min_sessions=max(windows))
+            results = report.get_index_change_rates(market, windows, date=session_date)
+            rates = {window: rate for window, (rate, _) in results.items()}
+            index_dates = {window: reference_day.strftime('%Y%m%d') for window, (_, reference_day) in results.items()}
+            logger.info(f"{market} 지수 조회 완료: " + ", ".join(f"{window}일간 등락률 {rate}%" for window, rate in rates.items()))
+            return rates, index_dates
+        return stage
+
+    def align_dates(rankings, calendar_dates, calendar_closes, kospi_dates, kosdaq_dates):
+        # 지수 이력의 비교 기준일을 우선 사용 (종목과 지수 등락률이 같은 기간을 비교하도록)
+        if kosdaq_dates != kospi_dates:
+            logger.warning(f"코스피/코스닥 지수 비교 기준일이 다릅니다 - 코스피: {kospi_dates}, 코스닥: {kosdaq_dates}")
+        mismatched = {window: date for window, date in kospi_dates.items() if date != calendar_dates[window]}
+        if not mismatched:
+            return calendar_dates, calendar_closes
+
+        # 달력에 없는 임시 휴장일 등 (KRX_CLOSED_DATES로 추가) → 지수 기준일 종가를 다시 조회
+        logger.warning(f"지수 거래일과 거래일 달력이 다릅니다 - 지수 기준일: {mismatched}, 달력 기준일: {calendar_dates}, 지수 기준일로 종가 재조회")
+        extra = report.fetch_ranking_closes(rankings, mismatched)
+        closes = calendar_closes.join(extra[[date for date in extra.columns if date not in calendar_closes.columns]])
+        return {**calendar_dates, **mismatched}, closes
+
+    def rolling_reports(today, rankings):
+        # 누적 리포트 실패는 일별 리포트 전송을 막지 않음
+        try:
+            if report.update_rolling_netbuy(today) == 0:
+                return []
+            return report.build_rolling_reports(top_n, today)
+        except Exception as e:
+            logger.error(f"누적 순매수 리포트 생성 실패: {str(e)}")
+            AlertUtil().send(f"❌ 오류 발생\n\n함수: rolling_reports\n오류: {str(e)}")
+            return []
+
+    pipeline = Pipeline(max_workers=int(os.getenv("PIPELINE_MAX_WORKERS", "4")))
+    pipeline.add("ticker_index", lambda today: TickerMarketIndex.load(today), inputs=["today"], outputs=["ticker_index"])
+    pipeline.add("rankings", lambda today: report.fetch_rankings(ranking_specs, top_n, date=today), inputs=["today"], outputs=["rankings"])
+    pipeline.add("trading_days", trading_days, inputs=["today"], outputs=["session_date", "calendar_dates"])
+    pipeline.add("kospi_index", load_index("KOSPI"), inputs=["session_date", "calendar_dates"], outputs=["kospi_rates", "kospi_dates"])
+    pipeline.add("kosdaq_index", load_index("KOSDAQ"), inputs=["session_date", "calendar_dates"], outputs=["kosdaq_rates", "kosdaq_dates"])
+    pipeline.add("closes", lambda rankings, calendar_dates: report.fetch_ranking_closes(rankings, calendar_dates),
+                 inputs=["rankings", "calendar_dates"], outputs=["calendar_closes"])
+    pipeline.add("align_dates", align_dates,
+                 inputs=["rankings", "calendar_dates", "calendar_closes", "kospi_dates", "kosdaq_dates"],
+                 outputs=["reference_dates", "closes"])
+    pipeline.add(
+        "render",
+        lambda today, rankings, closes, reference_dates, kospi_rates, kosdaq_rates, ticker_index: report.build_ranking_reports(
+            ranking_specs, rankings, closes, reference_dates, kospi_rates, kosdaq_rates, ticker_index, top_n, today=today),
+        inputs=["today", "rankings", "closes", "reference_dates", "kospi_rates", "kosdaq_rates", "ticker_index"],
+        outputs=["reports"]
+    )
+    pipeline.add("rolling", rolling_reports, inputs=["today", "rankings"], outputs=["rolling_reports"])
+    def deliver_stage(reports, rolling_reports):
+        if not deliver:
+            logger.info(f"리포트 전송 생략 - {sum(1 for _, image, _ in reports + rolling_reports if image)}개 이미지")
+            return []
+        return deliver_reports(reports + rolling_reports, telegram, api_util)
+
+    pipeline.add("deliver", deliver_stage, inputs=["reports", "rolling_reports"])
+    return pipeline
+
+
 if __name__ == "__main__":
     today = datetime.now().strftime('%Y%m%d')
     
     # 로거 설정
     logger = LoggerUtil().get_logger()
     logger.info("==== 프로그램 시작 ====")
-    
-    if isTodayHoliday():
-        logger.info('오늘은 공휴일입니다. 프로그램을 종료합니다.')
-        sys.exit()
 
-    # 전체 종목 정보 가져오기 
-    logger.info("전체 종목 정보 가져오기 시작")
-    kospi_tickers = stock.get_market_ticker_list(date=today, market="KOSPI")
-    kosdaq_tickers = stock.get_market_ticker_list(date=today, market="KOSDAQ")
+    # HTTP 기록/재생 (HTTP_RECORD_MODE=record|replay)
+    recorder = HttpRecorder.from_env()
+    replaying = recorder is not None and recorder.mode == "replay"
+
+    replay_dir = None
+    if replaying:
+        # 재생 시 기록한 날짜 기준으로 리포트 재생성 (휴장일 검사 생략)
+        today = recorder.run_date
+        # 캐시/저장소(market_data.db 등)와 이미지는 임시 디렉토리에만 쓰고 전송하지 않음 (운영 데이터 보호)
+        replay_dir = tempfile.mkdtemp(prefix=f"replay_{today}_")
+        source_cache_dir = str(cache_dir())
+        replay_cache_dir = os.path.join(replay_dir, "cache")
+        os.makedirs(replay_cache_dir)
+        # 기록 당시 캐시로 생략된 요청은 기록에 없으므로 운영 캐시의 복사본에서 시작 (원본에는 쓰지 않음)
+        source_db = market_db_path()
+        if os.path.exists(source_db):
+            with sqlite3.connect(source_db) as source, sqlite3.connect(os.path.join(replay_cache_dir, MARKET_DB_NAME)) as target:
+                source.backup(target)
+        snapshot_path = os.path.join(source_cache_dir, f"tickers_{today}.json")
+        if os.path.exists(snapshot_path):
+            shutil.copy(snapshot_path, replay_cache_dir)
+        os.environ["CACHE_DIR"] = replay_cache_dir
+        logger.info(f"HTTP 기록 재생 - 기준일: {today}, 출력 디렉토리: {replay_dir}")
+    elif isTodayHoliday():
+        logger.info('오늘은 휴장일입니다. 프로그램을 종료합니다.')
+        sys.exit()
 
     telegram = TelegramUtil()
     api_util = ApiUtil()
-    report = InstitutionTotalReport()
-    
-    # 기관 순매수 데이터 조회
-    result = report.get_institution_total_report()
-    
-    # 상위 10개만 필터링
-    filtered_data = result[:10] if len(result) > 10 else result
-
-    logger.info("코스피 지수 조회 시작")
-    # 코스피 지수 조회
-    kospi_result = report.get_domestic_index(market_code="KOSPI", date=today)
-    kospi_index_change_rate = round(((kospi_result.iloc[0]['종가'] - kospi_result.iloc[29]['종가']) / kospi_result.iloc[29]['종가'] * 100), 2)
-    logger.info(f"코스피 지수 조회 완료: 30일간 등락률 {kospi_index_change_rate}%")
-
-    logger.info("코스닥 지수 조회 시작")
-    # 코스닥 지수 조회
-    kosdaq_result = report.get_domestic_index(market_code="KOSDAQ", date=today)
-    kosdaq_index_change_rate = round(((kosdaq_result.iloc[0]['종가'] - kosdaq_result.iloc[29]['종가']) / kosdaq_result.iloc[29]['종가'] * 100), 2)
-    logger.info(f"코스닥 지수 조회 완료: 30일간 등락률 {kosdaq_index_change_rate}%")
-
-    reference_date = kospi_result.iloc[29]['날짜'].strftime('%Y%m%d') # 한달 전 일자
-    logger.info(f"과거 가격 조회 기준일: {reference_date}")
+    report = InstitutionTotalReport(img_dir=os.path.join(replay_dir, "img") if replaying else None)
+    if replaying:
+        # 재생 응답의 토큰이 실제 토큰 파일을 덮어쓰지 않도록 별도 파일 사용
+        report.token_manager = TokenManager(os.path.join(replay_dir, "token.json"), report.issue_token)
     
-    # 기관 순매수 종목에 과거 가격 대비 등락률 정보 추가
-    enhanced_data = report.add_historical_price_change(filtered_data, reference_date)
-    
-    # 시장 정보와 지수 등락률 추가
-    final_data = report.add_market_info_and_index_rate(enhanced_data, kospi_index_change_rate, kosdaq_index_change_rate)
+    # 생성할 랭킹 목록 (예: institution_buy_qty,foreign_sell_amount)
+    ranking_specs = list(dict.fromkeys(RankingSpec.parse(key) for key in os.getenv("REPORT_RANKINGS", DEFAULT_RANKING.key).split(',') if key.strip()))
 
-    df = report.convert_to_dataframe(final_data, top_n=10) # 상위 10개만 필터링하여 DataFrame으로 변환
-    image_path = report.save_df_as_image(df) # DataFrame을 이미지로 저장
-    
-    if image_path:
-        today = datetime.now().strftime('%Y-%m-%d')
-        caption = f"{today} 기관 순매수 상위 TOP 10"
-        
-        logger.info("Telegram 메시지 전송 시작")
-        telegram.send_multiple_photo([image_path], caption)
-        logger.info("Telegram 메시지 전송 완료")
-        
-        try:
-            logger.info("API 포스트 생성 시작")
-            api_util.create_post(
-                title=caption,
-                content=f"{today} 기관 순매수 상위 TOP 10 결과",
-                category="기관순매수",
-                writer="admin",
-                image_paths=[image_path],
-                thumbnail_image_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thumbnail', 'thumbnail.png')
-            )
-            logger.info("API 포스트 생성 완료")
-        except ApiError as e:
-            error_message = f"❌ API 오류 발생\n\n{e.message}"
-            telegram.send_test_message(error_message)
-            logger.error(f"API 포스트 생성 오류: {e.message}")
-    else:
-        logger.warning("이미지 생성에 실패했습니다.")
+    # 종목 인덱스/랭킹/지수 조회 동시 실행 → 과거 가격 조회 → 이미지 생성 → 전송
+    try:
+        build_pipeline(report, telegram, api_util, ranking_specs, top_n=10, deliver=not replaying).run({"today": today})
+    finally:
+        # 백그라운드 이미지 보관 작업 마무리
+        report.image_archiver.close()
+        metrics_path = MetricsUtil().write()
+        if metrics_path:
+            logger.info(f"실행 지표 저장: {metrics_path}")
         
     logger.info("==== 프로그램 종료 ====")
-    
-
@@ -0,0 +1,152 @@
+import os
+import time
+import queue
+import atexit
+import threading
+from collections import Counter
+import requests
+from utils.logger_util import LoggerUtil
+from utils.telegram_util import TelegramUtil
+
+# 텔레그램 메시지 최대 길이
+MAX_MESSAGE_LENGTH = 4096
+
+_FLUSH = object()
+
+
+class AlertUtil:
+    """테스트 채팅방으로 보내는 오류 알림 큐 (싱글톤)
+
+    - send()는 큐에 넣기만 하고 바로 반환 (큐가 가득 차면 버리고 로그만 남김)
+    - 백그라운드 스레드가 batch_window초 동안 모인 알림을 하나의 메시지로 묶어 전송
+    - 같은 내용은 묶음 안에서 한 번만 보내고(횟수 표시), dedup_window초 안에 이미 보낸 내용은 생략
+    - 공용 세션(keep-alive)으로 POST 전송, 프로그램 종료 시 남은 알림을 flush
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AlertUtil, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if AlertUtil._initialized:
+            return
+
+        self.batch_window = float(os.getenv("ALERT_BATCH_WINDOW", "2"))
+        self.dedup_window = float(os.getenv("ALERT_DEDUP_WINDOW", "300"))
+        self.flush_timeout = float(os.getenv("ALERT_FLUSH_TIMEOUT", "10"))
+        self.logger = LoggerUtil().get_logger()
+        self.telegram = TelegramUtil()
+        self.session = requests.Session()
+        self._queue = queue.Queue(maxsize=int(os.getenv("ALERT_QUEUE_SIZE", "100")))
+        self._recent = {}  # 메시지 → 마지막 전송 시각
+        self._worker = threading.Thread(target=self._run, name="alert-sender", daemon=True)
+        self._worker.start()
+        atexit.register(self.flush)
+
+        AlertUtil._initialized = True
+
+    def send(self, message: str):
+        """알림 예약 (블로킹 없음)"""
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.logger.warning(f"알림 큐가 가득 차 알림을 버립니다: {message[:100]}")
+
+    def flush(self, timeout: float = None):
+        """대기 중인 알림을 바로 전송하고 완료될 때까지 최대 timeout초 대기
+
+        Returns:
+            bool: 제한 시간 안에 전송을 마쳤으면 True
+        """
+        done = threading.Event()
+        try:
+            self._queue.put((_FLUSH, done), timeout=1)
+        except queue.Full:
+            return False
+        return done.wait(self.flush_timeout if timeout is None else timeout)
+
+    def _run(self):
+        while True:
+            batch, flushes = [], []
+            item = self._queue.get()
+            if isinstance(item, tuple) and item[0] is _FLUSH:
+                flushes.append(item[1])
+            else:
+                batch.append(item)
+                # 첫 알림 이후 batch_window초 동안 들어온 알림을 함께 묶음
+                deadline = time.monotonic() + self.batch_window
+                while not flushes:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if isinstance(item, tuple) and item[0] is _FLUSH:
+                        flushes.append(item[1])
+                    else:
+                        batch.append(item)
+
+            # flush 요청 시점까지 큐에 남은 알림도 함께 전송
+            while flushes:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, tuple) and item[0] is _FLUSH:
+                    flushes.append(item[1])
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._send_batch(batch)
+            for done in flushes:
+                done.set()
+
+    def _dedupe(self, batch):
+        """묶음 내 중복 제거 + 최근 전송 내용 생략 → (메시지, 횟수) 목록"""
+        now = time.monotonic()
+        self._recent = {message: sent_at for message, sent_at in self._recent.items() if now - sent_at < self.dedup_window}
+
+        messages = []
+        suppressed = 0
+        for message, count in Counter(batch).items():
+            if message in self._recent:
+                suppressed += count
+                continue
+            self._recent[message] = now
+            messages.append((message, count))
+
+        if suppressed:
+            self.logger.info(f"최근 {self.dedup_window:.0f}초 안에 보낸 알림 {suppressed}건 생략")
+        return messages
+
+    def _split(self, messages):
+        """최대 길이를 넘지 않도록 알림을 여러 메시지로 나눔"""
+        chunks, current = [], ""
+        for message, count in messages:
+            text = f"{message}\n(동일 알림 {count}건)" if count > 1 else message
+            text = text[:MAX_MESSAGE_LENGTH]
+            if current and len(current) + 2 + len(text) > MAX_MESSAGE_LENGTH:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{text}" if current else text
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _send_batch(self, batch):
+        messages = self._dedupe(batch)
+        for chunk in self._split(messages):
+            try:
+                result = self.telegram.post_message(self.telegram.chat_test_id, chunk, session=self.session)
+                if not result.get('ok', False):
+                    self.logger.error(f"알림 전송 실패: {result.get('description', result)}")
+            except Exception as e:
+                self.logger.error(f"알림 전송 실패: {str(e)}")
+        if messages:
+            self.logger.info(f"알림 전송 완료 - {len(batch)}건 수신, {len(messages)}건 전송")
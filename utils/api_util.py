@@ -3,7 +3,12 @@ from typing import List, Optional
 import os
 from PIL import Image
 import io
+import time
+import logging
+import hashlib
 from utils.logger_util import LoggerUtil
+from utils.cache_util import cache_dir
+from utils.metrics_util import MetricsUtil
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,14 +31,149 @@ class ApiUtil:
         self.headers = {
             "Accept": "application/json"
         }
+        self.timeout = float(os.getenv("BASE_API_TIMEOUT", "30"))  # 요청 타임아웃(초)
         self.max_file_size = 1 * 1024 * 1024  # 1MB
         self.max_width = 800  # 최대 너비
+        self.max_quality = 85  # JPEG 품질 탐색 범위
+        self.min_quality = 35
+        self.compress_version = 1  # 압축 방식이 바뀌면 올려서 기존 캐시 무효화
+
+        # 압축 결과 캐시 디렉토리 (원본 해시 + 설정 기준)
+        cache_enabled = os.getenv("IMAGE_CACHE_ENABLED", "true").lower() == "true"
+        self.image_cache_dir = str(cache_dir() / 'images') if cache_enabled else None
+        self.image_cache_max_age = float(os.getenv("IMAGE_CACHE_MAX_AGE_DAYS", "7")) * 86400
+        self.image_cache_max_bytes = int(float(os.getenv("IMAGE_CACHE_MAX_MB", "50")) * 1024 * 1024)
+        self._cache_pruned = False
         self.logger = LoggerUtil().get_logger()
 
-    def _compress_image(self, image_path: str):
-        """이미지 압축"""
+    def _cache_key(self, image_bytes: bytes) -> str:
+        """원본 내용 해시 + 압축 설정으로 캐시 키 생성"""
+        digest = hashlib.sha256(image_bytes)
+        digest.update(f"v{self.compress_version}:{self.max_width}:{self.max_file_size}".encode())
+        return digest.hexdigest()
+
+    def _load_cached_image(self, key: str):
+        if not self.image_cache_dir:
+            return None
+        for format in ('png', 'jpeg'):
+            cache_path = os.path.join(self.image_cache_dir, f"{key}.{format}")
+            if os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    data = f.read()
+                try:
+                    # 마지막 사용 시각 갱신 (정리 시 최근에 쓴 캐시는 유지)
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+                return data, format
+        return None
+
+    def prune_image_cache(self) -> int:
+        """보관 기간이 지났거나 최대 크기를 넘는 압축 이미지 캐시 삭제 (오래 사용하지 않은 파일부터)
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        if not self.image_cache_dir or not os.path.isdir(self.image_cache_dir):
+            return 0
+
+        entries = []
+        with os.scandir(self.image_cache_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort(reverse=True)  # 최근 사용 순
+
+        expire_before = time.time() - self.image_cache_max_age
+        total = 0
+        removed_count = 0
+        for mtime, size, path in entries:
+            total += size
+            if mtime >= expire_before and total <= self.image_cache_max_bytes:
+                continue
+            try:
+                os.remove(path)
+                removed_count += 1
+            except OSError as e:
+                self.logger.warning(f"압축 이미지 캐시 삭제 실패: {path} - {str(e)}")
+
+        if removed_count:
+            self.logger.info(f"압축 이미지 캐시 정리 완료 - {removed_count}개 삭제")
+        return removed_count
+
+    def _save_cached_image(self, key: str, compressed_image: bytes, format: str):
+        if not self.image_cache_dir:
+            return
+        if not self._cache_pruned:
+            # 실행마다 한 번 정리 (매일 새 파일이 쌓이므로)
+            self._cache_pruned = True
+            self.prune_image_cache()
+        try:
+            os.makedirs(self.image_cache_dir, exist_ok=True)
+            cache_path = os.path.join(self.image_cache_dir, f"{key}.{format}")
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed_image)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f"압축 이미지 캐시 저장 실패: {str(e)}")
+
+    def _encode_jpeg(self, img, quality: int) -> bytes:
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=quality, optimize=True)
+        return buffer.getvalue()
+
+    def _search_jpeg_quality(self, img):
+        """최대 크기 이하가 되는 가장 높은 JPEG 품질을 이분 탐색 (최대 log2(품질 범위)+1회 인코딩)"""
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+
+        low, high = self.min_quality, self.max_quality
+        best = None
+        passes = 0
+        while low <= high:
+            quality = (low + high) // 2
+            encoded = self._encode_jpeg(img, quality)
+            passes += 1
+            if len(encoded) <= self.max_file_size:
+                best = encoded
+                low = quality + 1
+            else:
+                high = quality - 1
+
+        if best is None:
+            # 모두 초과하면 마지막 시도가 최저 품질 결과
+            best = encoded
+        self.logger.debug("JPEG 품질 탐색 완료 - 인코딩 %d회, 크기: %.1fKB", passes, len(best) / 1024)
+        return best
+
+    def _compress_image(self, image_path):
+        """이미지 압축 (같은 내용/설정의 결과는 디스크 캐시에서 재사용)
+
+        Args:
+            image_path (str | RenderedImage): 이미지 경로 또는 메모리 이미지
+        """
         try:
-            with Image.open(image_path) as img:
+            if isinstance(image_path, str):
+                with open(image_path, 'rb') as f:
+                    original = f.read()
+            else:
+                original = image_path.data
+                image_path = image_path.name
+
+            key = self._cache_key(original)
+            cached = self._load_cached_image(key)
+            if cached:
+                self.logger.info(f"압축 이미지 캐시 사용: {image_path} (크기: {len(cached[0])/1024:.1f}KB)")
+                return cached
+
+            with Image.open(io.BytesIO(original)) as img:
+                # 이미 제한 이내인 PNG/JPEG는 디코딩/재인코딩 없이 그대로 사용 (헤더만 읽음)
+                if img.format in ('PNG', 'JPEG') and img.width <= self.max_width and len(original) <= self.max_file_size:
+                    self.logger.info(f"이미지 압축 생략: {image_path} (크기: {len(original)/1024:.1f}KB)")
+                    return original, img.format.lower()
+
                 # 이미지 크기 조정
                 if img.width > self.max_width:
                     ratio = self.max_width / img.width
@@ -47,26 +187,28 @@ class ApiUtil:
                 if format == 'PNG':
                     img.save(buffer, format=format, optimize=True)
                 else:
-                    img.save(buffer, format=format, quality=85, optimize=True)
+                    img.save(buffer, format=format, quality=self.max_quality, optimize=True)
                 
                 compressed_image = buffer.getvalue()
                 
-                # 압축 후에도 크기가 큰 경우 추가 압축
-                quality = 85
-                while len(compressed_image) > self.max_file_size and quality > 30:
-                    buffer = io.BytesIO()
-                    img.save(buffer, format='JPEG', quality=quality, optimize=True)
-                    compressed_image = buffer.getvalue()
-                    quality -= 10
+                # 압축 후에도 크기가 큰 경우 JPEG 품질 이분 탐색
+                if len(compressed_image) > self.max_file_size:
+                    compressed_image = self._search_jpeg_quality(img)
+                    format = 'JPEG'
                 
                 self.logger.info(f"이미지 압축 완료: {image_path} (크기: {len(compressed_image)/1024:.1f}KB)")
-                return compressed_image, format.lower()
+
+            self._save_cached_image(key, compressed_image, format.lower())
+            return compressed_image, format.lower()
         except Exception as e:
             self.logger.error(f"이미지 압축 실패: {image_path} - {str(e)}")
             raise
 
     def create_post(self, title: str, content: str, category: str, writer: str, image_paths: Optional[List[str]] = None, thumbnail_image_path: str = None):
-        """게시글 생성 API 호출 (이미지/썸네일 유무와 관계없이 단일 흐름)"""
+        """게시글 생성 API 호출 (이미지/썸네일 유무와 관계없이 단일 흐름)
+
+        image_paths에는 파일 경로 대신 RenderedImage(메모리 이미지)를 넣을 수 있다.
+        """
         url = f"{self.api_base_url}/board-research"
 
         try:
@@ -84,14 +226,15 @@ class ApiUtil:
             if image_paths:
                 self.logger.info(f"게시글 생성 시작 (이미지 포함) - 제목: {title}")
                 for i, image_path in enumerate(image_paths):
-                    if os.path.exists(image_path):
+                    # 파일 경로 또는 RenderedImage(메모리 이미지)
+                    if not isinstance(image_path, str) or os.path.exists(image_path):
                         try:
                             compressed_image, format = self._compress_image(image_path)
-                            original_filename = os.path.basename(image_path)
+                            original_filename = os.path.basename(image_path) if isinstance(image_path, str) else image_path.name
                             files[f"image[{i}]"] = (original_filename, compressed_image, f"image/{format}")
-                            self.logger.debug(f"이미지 {i+1} 추가: {original_filename}")
+                            self.logger.debug("이미지 %d 추가: %s", i + 1, original_filename)
                         except Exception as e:
-                            self.logger.error(f"이미지 처리 실패: {image_path} - {str(e)}")
+                            self.logger.error(f"이미지 처리 실패: {getattr(image_path, 'name', image_path)} - {str(e)}")
                             continue
                     else:
                         self.logger.warning(f"이미지 경로가 존재하지 않습니다: {image_path}")
@@ -102,7 +245,7 @@ class ApiUtil:
                     compressed_image, format = self._compress_image(thumbnail_image_path)
                     thumbnail_filename = os.path.basename(thumbnail_image_path)
                     files["thumbnail_image"] = (thumbnail_filename, compressed_image, f"image/{format}")
-                    self.logger.debug(f"썸네일 이미지 추가: {thumbnail_filename}")
+                    self.logger.debug("썸네일 이미지 추가: %s", thumbnail_filename)
                 except Exception as e:
                     self.logger.error(f"썸네일 이미지 처리 실패: {thumbnail_image_path} - {str(e)}")
             elif thumbnail_image_path:
@@ -122,31 +265,37 @@ class ApiUtil:
                     headers = self.headers.copy()
                     form_data = {key: (None, str(value)) for key, value in data.items()}
                     form_data.update(files)
-                    self.logger.debug(f"API 요청 데이터: {data}")
-                    self.logger.debug(f"파일 데이터: {[f'{k}: {v[0]}' for k, v in files.items()]}")
-                    self.logger.debug(f"최종 전송 데이터: {[(k, v[0] if isinstance(v, tuple) else v) for k, v in form_data.items()]}")
-
-                    response = requests.post(
-                        url,
-                        headers=headers,
-                        files=form_data,
-                        timeout=30
-                    )
-
-                    self.logger.debug(f"응답 상태 코드: {response.status_code}")
-                    self.logger.debug(f"응답 헤더: {dict(response.headers)}")
+                    # 요청 내용 덤프는 DEBUG일 때만 생성
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug("API 요청 데이터: %s", data)
+                        self.logger.debug("파일 데이터: %s", [f'{k}: {v[0]}' for k, v in files.items()])
+                        self.logger.debug("최종 전송 데이터: %s", [(k, v[0] if isinstance(v, tuple) else v) for k, v in form_data.items()])
+
+                    with MetricsUtil().span("http_request", service="board", method="POST", endpoint="board-research") as tags:
+                        response = requests.post(
+                            url,
+                            headers=headers,
+                            files=form_data,
+                            timeout=self.timeout
+                        )
+                        tags["status"] = response.status_code
+
+                    self.logger.debug("응답 상태 코드: %s", response.status_code)
+                    self.logger.debug("응답 헤더: %s", response.headers)
                 finally:
                     files.clear()
             else:
                 self.logger.info(f"게시글 생성 시작 (이미지 없음) - 제목: {title}")
-                response = requests.post(url, headers=self.headers, json=data)
+                with MetricsUtil().span("http_request", service="board", method="POST", endpoint="board-research") as tags:
+                    response = requests.post(url, headers=self.headers, json=data, timeout=self.timeout)
+                    tags["status"] = response.status_code
 
             # 응답 확인 및 한글 디코딩
             try:
                 response.encoding = 'utf-8'
                 response_data = response.json()
 
-                self.logger.debug(f"API 응답: {response_data}")
+                self.logger.debug("API 응답: %s", response_data)
 
                 if not response_data.get('success', False):
                     error_msg = f"게시글 생성 실패\n제목: {title}\n카테고리: {category}\n응답: {response.text}"
@@ -171,7 +320,7 @@ class ApiUtil:
         except requests.RequestException as e:
             error_msg = f"API 요청 중 오류 발생\n제목: {title}\n카테고리: {category}\n오류: {str(e)}"
             self.logger.error(error_msg)
-            raise ApiError(500, error_msg)
+            raise ApiError(500, error_msg) from e
 
 if __name__ == "__main__":
     # API 테스트
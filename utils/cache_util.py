@@ -0,0 +1,41 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from utils.logger_util import LoggerUtil
+
+ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
+MARKET_DB_NAME = "market_data.db"
+
+
+def cache_dir() -> Path:
+    """로컬 캐시 디렉토리 (CACHE_DIR 환경변수, 기본값은 프로젝트 루트의 cache/)"""
+    return Path(os.getenv("CACHE_DIR") or ROOT_DIR / "cache")
+
+
+def market_db_path() -> str:
+    """시세/랭킹 저장소 공용 SQLite 파일 경로 (cache/market_data.db)"""
+    return str(cache_dir() / MARKET_DB_NAME)
+
+
+def connect_market_db(db_path: str = None) -> sqlite3.Connection:
+    """market_data.db 연결 (스레드 간 공유, WAL 모드, 상위 디렉토리 자동 생성)
+
+    Args:
+        db_path (str, optional): DB 파일 경로. 기본값은 market_db_path()
+    """
+    db_path = db_path or market_db_path()
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class MarketDbStore:
+    """market_data.db를 쓰는 저장소 공통 기반 (연결 하나를 lock으로 직렬화해 스레드 간 공유)"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or market_db_path()
+        self.logger = LoggerUtil().get_logger()
+        self._lock = threading.Lock()
+        self._conn = connect_market_db(self.db_path)
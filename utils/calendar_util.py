@@ -0,0 +1,147 @@
+import os
+import threading
+from datetime import date, datetime, timedelta
+import holidays
+
+
+def _to_date(value) -> date:
+    """YYYYMMDD 문자열, datetime, date → date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+# holidays 패키지에 없거나 버전에 따라 빠질 수 있는 KRX 임시 휴장일 (선거일, 임시공휴일)
+# 새로 지정되는 휴장일은 KRX_CLOSED_DATES 환경변수로 추가
+KRX_AD_HOC_CLOSED = (
+    "20160413",  # 제20대 국회의원 선거
+    "20160506",  # 임시공휴일
+    "20170509",  # 제19대 대통령 선거
+    "20171002",  # 임시공휴일
+    "20180613",  # 제7회 전국동시지방선거
+    "20200415",  # 제21대 국회의원 선거
+    "20200817",  # 임시공휴일
+    "20220309",  # 제20대 대통령 선거
+    "20220601",  # 제8회 전국동시지방선거
+    "20231002",  # 임시공휴일
+    "20240410",  # 제22대 국회의원 선거
+    "20241001",  # 임시공휴일 (국군의 날)
+    "20250127",  # 임시공휴일
+    "20250603",  # 제21대 대통령 선거
+    "20260603",  # 제9회 전국동시지방선거
+)
+
+
+class TradingCalendar:
+    """KRX 거래일 달력
+
+    - 생성 시 지정한 연도 범위의 거래일을 미리 계산 (네트워크 호출 없음)
+    - 휴장일: 주말, 법정 공휴일(holidays.KR, 대체공휴일 포함), 근로자의 날(5/1),
+      연말 휴장일(해당 연도 마지막 평일), 알려진 임시 휴장일(KRX_AD_HOC_CLOSED),
+      KRX_CLOSED_DATES 환경변수로 추가한 휴장일(쉼표 구분 YYYYMMDD)
+    - 거래일 여부/다음·이전 거래일/N거래일 전은 날짜별로 미리 만든 위치 테이블로 O(1) 조회
+    """
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, start_year: int = None, end_year: int = None, extra_closed=None):
+        """
+        Args:
+            start_year (int, optional): 시작 연도. 기본값은 올해 - 10
+            end_year (int, optional): 종료 연도. 기본값은 올해 + 1
+            extra_closed (iterable, optional): 추가 휴장일 (YYYYMMDD). 기본값은 KRX_CLOSED_DATES 환경변수
+        """
+        this_year = date.today().year
+        self.start_year = start_year if start_year is not None else this_year - 10
+        self.end_year = end_year if end_year is not None else this_year + 1
+        if extra_closed is None:
+            extra_closed = [value for value in os.getenv("KRX_CLOSED_DATES", "").split(',') if value.strip()]
+
+        self.first_day = date(self.start_year, 1, 1)
+        self.last_day = date(self.end_year, 12, 31)
+        closed = self._closed_days(extra_closed)
+
+        self.sessions = []
+        self._positions = []  # 날짜별 (첫날부터 일수) → 해당 날짜 이후 첫 거래일의 sessions 위치
+        day = self.first_day
+        while day <= self.last_day:
+            self._positions.append(len(self.sessions))
+            if day.weekday() < 5 and day not in closed:
+                self.sessions.append(day)
+            day += timedelta(days=1)
+        self._session_set = frozenset(self.sessions)
+
+    def _closed_days(self, extra_closed):
+        years = range(self.start_year, self.end_year + 1)
+        closed = set(holidays.KR(years=years))
+        for year in years:
+            closed.add(date(year, 5, 1))  # 근로자의 날
+            # 연말 휴장일: 12/31이 주말이면 그 전 마지막 평일
+            year_end = date(year, 12, 31)
+            while year_end.weekday() >= 5:
+                year_end -= timedelta(days=1)
+            closed.add(year_end)
+        closed.update(_to_date(value) for value in KRX_AD_HOC_CLOSED)
+        closed.update(_to_date(value.strip()) for value in extra_closed)
+        return closed
+
+    @classmethod
+    def default(cls):
+        """프로세스 공용 달력 (처음 호출할 때 한 번만 계산)"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
+    def _position(self, day: date) -> int:
+        if not self.first_day <= day <= self.last_day:
+            raise ValueError(f"거래일 달력 범위({self.start_year}~{self.end_year}년)를 벗어난 날짜입니다: {day}")
+        return self._positions[(day - self.first_day).days]
+
+    def _session_at(self, index: int) -> date:
+        if not 0 <= index < len(self.sessions):
+            raise ValueError(f"거래일 달력 범위({self.start_year}~{self.end_year}년)를 벗어났습니다")
+        return self.sessions[index]
+
+    def covers(self, value) -> bool:
+        """달력 범위(start_year~end_year) 안의 날짜인지 여부 (범위 밖이면 다른 조회는 ValueError)"""
+        return self.first_day <= _to_date(value) <= self.last_day
+
+    def is_session(self, value) -> bool:
+        """거래일 여부"""
+        return _to_date(value) in self._session_set
+
+    def next_session(self, value) -> date:
+        """value 다음 거래일 (value 자신은 제외)"""
+        day = _to_date(value)
+        index = self._position(day)
+        return self._session_at(index + 1 if day in self._session_set else index)
+
+    def previous_session(self, value) -> date:
+        """value 이전 거래일 (value 자신은 제외)"""
+        return self._session_at(self._position(_to_date(value)) - 1)
+
+    def session_on_or_before(self, value) -> date:
+        """value가 거래일이면 value, 아니면 직전 거래일"""
+        day = _to_date(value)
+        return day if day in self._session_set else self.previous_session(day)
+
+    def sessions_ago(self, value, count: int) -> date:
+        """기준 거래일(value 당일 또는 직전 거래일)로부터 count거래일 전 거래일
+
+        예: sessions_ago(d, 29)는 d까지 최근 30거래일 중 첫 거래일 (지수 iloc[29]와 같은 기준)
+        """
+        day = _to_date(value)
+        index = self._position(day)
+        if day not in self._session_set:
+            index -= 1
+        return self._session_at(index - count)
+
+    def sessions_in_range(self, start, end):
+        """start~end(양 끝 포함) 사이 거래일 목록"""
+        start_day, end_day = _to_date(start), _to_date(end)
+        end_index = self._position(end_day) + (1 if end_day in self._session_set else 0)
+        return self.sessions[self._position(start_day):end_index]
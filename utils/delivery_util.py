@@ -0,0 +1,161 @@
+import os
+import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import requests
+from urllib3.exceptions import NewConnectionError
+from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
+
+
+@dataclass(frozen=True)
+class DeliverySink:
+    """전송 대상
+
+    Attributes:
+        name (str): 대상 이름 (요약/로그 표시용, 예: telegram:institution_buy_qty)
+        send (callable): 인자 없이 호출하는 전송 함수 (실패 시 예외 발생)
+        deadline (float): 재시도를 포함한 전체 제한 시간(초)
+        max_retries (int): 최대 재시도 횟수
+        retryable (callable): 예외를 받아 재시도 여부를 반환 (None이면 모든 예외 재시도)
+    """
+    name: str
+    send: object
+    deadline: float = None
+    max_retries: int = None
+    retryable: object = None
+
+
+class DeliveryError(Exception):
+    """전송 대상이 실패 응답을 준 경우
+
+    Attributes:
+        status_code (int): HTTP 상태 코드 (Telegram은 응답의 error_code)
+    """
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+def _request_not_sent(error) -> bool:
+    """요청을 보내기 전(연결 단계)에 실패한 오류인지 여부"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and not isinstance(error, requests.Timeout):
+        reason = error.args[0] if error.args else None
+        return isinstance(getattr(reason, 'reason', reason), NewConnectionError)
+    return False
+
+
+def is_retryable_error(error) -> bool:
+    """재시도해도 중복 전송되지 않는 오류인지 여부 (DeliverySink.retryable 기본 판별 함수)
+
+    - 요청을 보내기 전에 실패한 연결 오류(연결 거부, 연결 시간 초과)만 재시도
+    - 응답 대기 중 시간 초과(ReadTimeout)나 연결 끊김은 이미 처리됐을 수 있으므로 재시도하지 않음
+    - 응답을 받은 경우 429(요청 한도 초과)와 5xx만 재시도
+    """
+    cause = error
+    while cause is not None:
+        if isinstance(cause, requests.RequestException):
+            return _request_not_sent(cause)
+        cause = cause.__cause__
+
+    status_code = getattr(error, 'status_code', None)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+@dataclass
+class DeliveryResult:
+    """전송 결과"""
+    name: str
+    success: bool
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: str = None
+
+
+class DeliveryDispatcher:
+    """여러 전송 대상으로 동시에 전송 (대상별 제한 시간, 제한된 재시도, 결과 요약)
+
+    - 대상마다 별도 스레드에서 실행하므로 한 대상이 멈춰도 다른 대상 전송은 계속됨
+    - 제한 시간이 지난 대상은 실패(시간 초과)로 처리하고 기다리지 않음
+      (실행 중인 요청은 각 HTTP 클라이언트의 타임아웃으로 정리됨)
+    """
+
+    def __init__(self, deadline: float = None, max_retries: int = None, backoff: float = None):
+        self.deadline = deadline if deadline is not None else float(os.getenv("DELIVERY_DEADLINE", "60"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("DELIVERY_MAX_RETRIES", "2"))
+        self.backoff = backoff if backoff is not None else float(os.getenv("DELIVERY_RETRY_BACKOFF", "1.0"))
+        self.logger = LoggerUtil().get_logger()
+
+    def _send_with_retry(self, sink: DeliverySink, deadline_at: float):
+        max_retries = sink.max_retries if sink.max_retries is not None else self.max_retries
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                sink.send()
+                return DeliveryResult(sink.name, True, attempt, time.perf_counter() - started)
+            except Exception as e:
+                delay = self.backoff * (2 ** (attempt - 1))
+                retryable = sink.retryable is None or sink.retryable(e)
+                if not retryable or attempt > max_retries or time.perf_counter() + delay >= deadline_at:
+                    return DeliveryResult(sink.name, False, attempt, time.perf_counter() - started, str(e))
+                self.logger.warning(f"[전송 재시도] {sink.name} - {attempt}회 실패, {delay:.2f}초 후 재시도: {str(e)}")
+                time.sleep(delay)
+
+    def dispatch(self, sinks):
+        """모든 대상으로 동시에 전송
+
+        Args:
+            sinks (list): DeliverySink 목록
+
+        Returns:
+            list: DeliveryResult 목록 (sinks 순서)
+        """
+        if not sinks:
+            return []
+
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=len(sinks), thread_name_prefix="delivery")
+        futures = []
+        for sink in sinks:
+            deadline = sink.deadline if sink.deadline is not None else self.deadline
+            deadline_at = started + deadline
+            futures.append((sink, deadline_at, executor.submit(self._send_with_retry, sink, deadline_at)))
+
+        results = []
+        for sink, deadline_at, future in futures:
+            try:
+                result = future.result(timeout=max(0.0, deadline_at - time.perf_counter()))
+            except FutureTimeoutError:
+                result = DeliveryResult(sink.name, False, elapsed=time.perf_counter() - started, error="제한 시간 초과")
+            except Exception as e:
+                result = DeliveryResult(sink.name, False, elapsed=time.perf_counter() - started, error=str(e))
+            results.append(result)
+
+        # 시간 초과된 전송을 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        self._record_metrics(results)
+        self.log_summary(results, time.perf_counter() - started)
+        return results
+
+    def _record_metrics(self, results):
+        metrics = MetricsUtil()
+        for result in results:
+            metrics.observe("delivery", result.elapsed, sink=result.name, status="ok" if result.success else "fail")
+            if result.attempts > 1:
+                metrics.increment("delivery_retries", result.attempts - 1, sink=result.name)
+
+    def log_summary(self, results, elapsed: float):
+        succeeded = sum(1 for result in results if result.success)
+        details = ", ".join(
+            f"{result.name} {'성공' if result.success else '실패'}({result.attempts}회, {result.elapsed:.2f}초)"
+            for result in results
+        )
+        self.logger.info(f"[전송 요약] 성공 {succeeded}/{len(results)}개, {elapsed:.2f}초 - {details}")
+        for result in results:
+            if not result.success:
+                self.logger.error(f"[전송 실패] {result.name}: {result.error}")
@@ -0,0 +1,89 @@
+import numpy as np
+
+# 1000 단위 그룹 최대 개수 (int64 최대값 9,223,372,036,854,775,807 → 7그룹)
+_MAX_GROUPS = 7
+
+# 숫자 → 문자열 변환용 조회 테이블 (배열 인덱싱으로 원소별 포맷 호출을 대신함)
+_LEAD_TEXT = np.array([str(i) for i in range(1000)], dtype=object)        # '7', '123'
+_GROUP_TEXT = np.array([f",{i:03d}" for i in range(1000)], dtype=object)   # ',007', ',123'
+_CENTS_TEXT = np.array([f".{i:02d}" for i in range(100)], dtype=object)    # '.05', '.50' ('%.2f')
+_REPR_CENTS_TEXT = np.array([f".{i:02d}".rstrip('0') if i else ".0" for i in range(100)], dtype=object)  # '.05', '.5' (repr)
+
+# 소수 둘째 자리 값을 정수 연산으로 다룰 수 있는 최대 크기
+_MAX_EXACT = 1e13
+
+
+def format_thousands(values):
+    """정수 배열을 천 단위 구분 문자열 배열로 변환 ('{:,}'.format(int)과 동일)
+
+    Args:
+        values (array-like): 정수 값 배열
+
+    Returns:
+        numpy.ndarray: 문자열(object) 배열
+    """
+    values = np.asarray(values, dtype=np.int64)
+    magnitude = np.abs(values)
+
+    # 원소별 그룹 수 (1,234,567 → 3)
+    n_groups = np.ones(values.shape, dtype=np.int64)
+    for k in range(1, _MAX_GROUPS):
+        n_groups += magnitude >= 1000 ** k
+
+    # 가장 앞 그룹은 0 채움 없이, 나머지 그룹은 ',000' 형식으로 이어 붙임
+    lead_power = np.power(np.int64(1000), n_groups - 1)
+    result = np.where(values < 0, '-', '').astype(object) + _LEAD_TEXT[magnitude // lead_power]
+    for k in range(int(n_groups.max(initial=1)) - 2, -1, -1):
+        group = _GROUP_TEXT[(magnitude // 1000 ** k) % 1000]
+        result = np.where(k < n_groups - 1, result + group, result)
+    return result
+
+
+def _split_cents(values):
+    """소수 둘째 자리까지로 정확히 표현되는 값의 (부호, 정수부, 소수부 cents, 마스크) 반환"""
+    magnitude = np.abs(values)
+    with np.errstate(invalid='ignore'):
+        cents = np.rint(magnitude * 100)
+        exact = np.isfinite(values) & (magnitude < _MAX_EXACT) & (cents / 100 == magnitude)
+    cents = np.where(exact, cents, 0).astype(np.int64)
+    sign = np.where(np.signbit(values), '-', '').astype(object)
+    return sign, cents // 100, cents % 100, exact
+
+
+def format_float_thousands(values):
+    """실수 배열을 천 단위 구분 문자열 배열로 변환 ('{:,}'.format(float)과 동일)
+
+    소수 둘째 자리까지의 값(예: .round(2) 결과)은 정수 연산과 조회 테이블로 변환하고,
+    그 외 값(nan/inf/지수 표기 등)만 파이썬 포맷으로 처리한다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    sign, int_part, cents, exact = _split_cents(values)
+
+    result = sign + format_thousands(int_part) + _REPR_CENTS_TEXT[cents]
+    for i in np.flatnonzero(~exact):
+        result[i] = '{:,}'.format(float(values[i]))
+    return result
+
+
+def format_percent(values):
+    """실수 배열을 '%.2f%%' 형식 문자열 배열로 변환"""
+    values = np.asarray(values, dtype=np.float64)
+    sign, int_part, cents, exact = _split_cents(values)
+
+    result = sign + int_part.astype(str).astype(object) + _CENTS_TEXT[cents] + '%'
+    for i in np.flatnonzero(~exact):
+        result[i] = f"{values[i]:.2f}%"
+    return result
+
+
+def format_rate_spans(values):
+    """등락률 배열을 색상 span 문자열 배열로 변환
+
+    음수는 <span class='negative'>, 양수는 <span class='positive'>, 0은 span 없이 'x.xx%' 형식
+    """
+    values = np.asarray(values, dtype=np.float64)
+    text = format_percent(values)
+    return np.where(
+        values < 0, "<span class='negative'>" + text + "</span>",
+        np.where(values > 0, "<span class='positive'>" + text + "</span>", text)
+    )
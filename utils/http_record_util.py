@@ -0,0 +1,254 @@
+import os
+import re
+import io
+import gzip
+import json
+import base64
+import atexit
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from utils.logger_util import LoggerUtil
+from utils.cache_util import cache_dir
+
+# 기록 파일에 남기지 않는 헤더/본문 필드 (자격 증명)
+REDACTED_HEADERS = {"authorization", "appkey", "appsecret"}
+REDACTED_FIELDS = {"appkey", "appsecret"}
+REDACTED_RESPONSE_FIELDS = {"access_token"}
+REDACTED = "***"
+
+# 텔레그램 봇 토큰은 URL 경로에 포함됨
+_BOT_TOKEN_PATTERN = re.compile(r"/bot[^/]+/")
+
+# 응답 본문은 디코딩된 상태로 저장하므로 전송 관련 헤더는 제외
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+_original_send = HTTPAdapter.send
+
+
+def _redact_url(url: str) -> str:
+    return _BOT_TOKEN_PATTERN.sub(f"/bot{REDACTED}/", url)
+
+
+def _normalize_url(url: str) -> str:
+    """자격 증명 제거 + 쿼리 파라미터 정렬"""
+    parts = urlsplit(_redact_url(url))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def _redact_body(body, content_type: str):
+    """요청 본문 → (기록용 문자열, 매칭 키에 쓸 해시)
+
+    JSON 본문은 자격 증명 필드를 가리고, multipart(이미지 업로드)는 경계 문자열이 매번 달라 키에서 제외한다.
+    """
+    if body is None:
+        return None, ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if content_type.startswith("multipart/"):
+        return f"<multipart {len(body)} bytes>", ""
+
+    text = body.decode("utf-8", errors="replace")
+    if "json" in content_type:
+        try:
+            data = json.loads(text)
+            if isinstance(data, dict):
+                data = {key: (REDACTED if key.lower() in REDACTED_FIELDS else value) for key, value in data.items()}
+                text = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        except ValueError:
+            pass
+    return text, hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _redact_response_text(text: str) -> str:
+    """응답 JSON의 토큰 값 가림 (토큰 발급 응답)"""
+    if not any(field in text for field in REDACTED_RESPONSE_FIELDS):
+        return text
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return text
+    if not isinstance(data, dict):
+        return text
+    return json.dumps({key: (REDACTED if key in REDACTED_RESPONSE_FIELDS else value) for key, value in data.items()}, ensure_ascii=False)
+
+
+def _replay_token_entry():
+    """기록에 토큰 발급 응답이 없을 때 돌려주는 대체 응답 (재생 시 토큰 값은 사용되지 않음)"""
+    expires = datetime.now().replace(microsecond=0).isoformat(sep=" ")
+    return {
+        "status": 200,
+        "reason": "OK",
+        "headers": {"Content-Type": "application/json; charset=utf-8"},
+        "text": json.dumps({"access_token": REDACTED, "access_token_token_expired": expires, "token_type": "Bearer", "expires_in": 86400}),
+    }
+
+
+def request_key(request) -> str:
+    """요청 매칭 키 (메서드 + 정규화 URL + 본문 해시 + KIS tr_id)"""
+    content_type = request.headers.get("Content-Type", "")
+    _, body_hash = _redact_body(request.body, content_type)
+    return f"{request.method} {_normalize_url(request.url)} {request.headers.get('tr_id', '')} {body_hash}"
+
+
+class HttpRecorder:
+    """requests 전송 계층(HTTPAdapter.send)에서 요청/응답을 기록하거나 기록으로 응답을 대신함
+
+    requests를 쓰는 모든 호출(KIS 클라이언트, pykrx, 텔레그램, 게시판 API)에 적용된다.
+    (urllib로 보내는 TelegramUtil.send_message/send_test_message는 제외)
+
+    - record: 실제 요청을 보내고 요청/응답을 모아 종료 시 실행별 압축 파일(jsonl.gz)로 저장
+    - replay: 네트워크 대신 기록 파일의 응답을 같은 요청 순서대로 돌려줌 (기록에 없으면 ConnectionError)
+      (전송 계층만 바꾸므로 main.py는 재생 시 캐시/이미지 경로를 임시 디렉토리로 돌리고 전송 단계를 생략)
+    """
+    MODES = ("record", "replay")
+
+    def __init__(self, mode: str, archive_path: str = None):
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 HTTP 기록 모드입니다: {mode}")
+
+        self.mode = mode
+        self.logger = LoggerUtil().get_logger()
+        self._lock = threading.Lock()
+        self._entries = []
+        self._responses = {}  # replay: 키 → 응답 목록
+        self._served = {}     # replay: 키 → 다음에 돌려줄 순번
+        self.run_date = datetime.now().strftime("%Y%m%d")
+
+        if mode == "record":
+            self.archive_path = archive_path or str(self.default_dir() / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz")
+        else:
+            self.archive_path = archive_path or self._latest_archive()
+            self._load(self.archive_path)
+
+    @staticmethod
+    def default_dir() -> Path:
+        return cache_dir() / "http_records"
+
+    def _latest_archive(self):
+        archives = sorted(self.default_dir().glob("*.jsonl.gz"))
+        if not archives:
+            raise FileNotFoundError(f"재생할 HTTP 기록이 없습니다: {self.default_dir()}")
+        return str(archives[-1])
+
+    @classmethod
+    def from_env(cls):
+        """HTTP_RECORD_MODE(record/replay)가 설정되어 있으면 설치된 HttpRecorder 반환, 아니면 None"""
+        mode = os.getenv("HTTP_RECORD_MODE", "").lower()
+        if mode in ("", "off"):
+            return None
+        return cls(mode, os.getenv("HTTP_RECORD_ARCHIVE") or None).install()
+
+    # 설치/해제
+
+    def install(self):
+        recorder = self
+
+        def send(adapter, request, **kwargs):
+            if recorder.mode == "replay":
+                return recorder._replay(adapter, request)
+            response = _original_send(adapter, request, **kwargs)
+            recorder._record(request, response)
+            return response
+
+        HTTPAdapter.send = send
+        if self.mode == "record":
+            atexit.register(self.save)
+        self.logger.info(f"HTTP {self.mode} 모드 시작: {self.archive_path}")
+        return self
+
+    def uninstall(self):
+        HTTPAdapter.send = _original_send
+
+    # 기록
+
+    def _record(self, request, response):
+        content_type = request.headers.get("Content-Type", "")
+        body, _ = _redact_body(request.body, content_type)
+        content = response.content
+        try:
+            response_body = {"text": _redact_response_text(content.decode("utf-8"))}
+        except UnicodeDecodeError:
+            response_body = {"base64": base64.b64encode(content).decode("ascii")}
+
+        entry = {
+            "key": request_key(request),
+            "method": request.method,
+            "url": _redact_url(request.url),
+            "request_headers": {
+                key: (REDACTED if key.lower() in REDACTED_HEADERS else value)
+                for key, value in request.headers.items()
+            },
+            "request_body": body,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                key: value for key, value in response.headers.items()
+                if key.lower() not in _DROPPED_RESPONSE_HEADERS
+            },
+            "elapsed": response.elapsed.total_seconds(),
+            **response_body,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def save(self):
+        """기록한 요청/응답을 압축 파일로 저장 (첫 줄은 실행 정보)"""
+        with self._lock:
+            entries = list(self._entries)
+        if not entries:
+            return None
+
+        path = Path(self.archive_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"run_date": self.run_date, "recorded_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "count": len(entries)}) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+        self.logger.info(f"HTTP 기록 저장: {path} ({len(entries)}건)")
+        return str(path)
+
+    # 재생
+
+    def _load(self, archive_path):
+        with gzip.open(archive_path, "rt", encoding="utf-8") as f:
+            meta = json.loads(f.readline())
+            for line in f:
+                entry = json.loads(line)
+                self._responses.setdefault(entry["key"], []).append(entry)
+        self.run_date = meta.get("run_date", self.run_date)
+        self.logger.info(f"HTTP 기록 로드: {archive_path} ({meta.get('count', 0)}건, 기준일 {self.run_date})")
+
+    def _replay(self, adapter, request):
+        key = request_key(request)
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries and urlsplit(request.url).path.endswith("/oauth2/tokenP"):
+                entries = [_replay_token_entry()]
+            if not entries:
+                raise requests.ConnectionError(f"재생 기록에 없는 요청입니다: {key}", request=request)
+            # 같은 요청은 기록 순서대로, 기록보다 많이 호출되면 마지막 응답 재사용
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            entry = entries[min(index, len(entries) - 1)]
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response._content = entry["text"].encode("utf-8") if "text" in entry else base64.b64decode(entry["base64"])
+        response.raw = io.BytesIO(response._content)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        return response
@@ -0,0 +1,200 @@
+import io
+import os
+import re
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont
+
+# 셀 마크업에서 사용하는 <span class='...'> 구간 추출
+SPAN_PATTERN = re.compile(r"<span class=['\"]([\w-]+)['\"]>(.*?)</span>")
+BR_PATTERN = re.compile(r"<br\s*/?>")
+
+# wkhtmltoimage용 CSS와 동일한 색상/크기
+STYLE = {
+    'body_margin': 10,
+    'caption_size': 18,
+    'caption_color': '#333333',
+    'caption_margin': 15,
+    'header_size': 13,
+    'header_bg': '#333333',
+    'header_color': '#ffffff',
+    'cell_size': 12,
+    'cell_color': '#000000',
+    'cell_padding_x': 10,
+    'cell_padding_y': 8,
+    'even_row_bg': '#f9f9f9',
+    'border_color': '#e0e0e0',
+    'code_size': 10,
+    'code_color': '#666666',
+    'code_margin_top': 2,
+    'source_size': 11,
+    'source_color': '#666666',
+    'source_margin_top': 10,
+    'table_margin': 10,
+    'positive': '#d32f2f',
+    'negative': '#1976d2',
+}
+
+
+class PillowTableRenderer:
+    """wkhtmltoimage 없이 Pillow로 리포트 표 이미지를 그리는 렌더러
+
+    save_df_as_image에서 사용하는 HTML/CSS 레이아웃(캡션, 표, 출처)을 같은 크기/색상으로 재현한다.
+    한글 글꼴은 fonts/ 디렉토리 또는 REPORT_FONT_PATH, REPORT_BOLD_FONT_PATH 환경변수로 지정한다.
+    """
+
+    def __init__(self, width: int = 600, font_path: str = None, bold_font_path: str = None):
+        font_dir = Path(os.path.dirname(os.path.abspath(__file__))).parent / 'fonts'
+        self.width = width
+        self.font_path = font_path or os.getenv("REPORT_FONT_PATH") or str(font_dir / 'NotoSansKR-Medium.ttf')
+        self.bold_font_path = bold_font_path or os.getenv("REPORT_BOLD_FONT_PATH") or str(font_dir / 'NotoSansKR-Bold.ttf')
+        self._fonts = {}
+
+        for path in (self.font_path, self.bold_font_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"렌더링용 글꼴 파일이 없습니다: {path}")
+
+    def _font(self, size: int, bold: bool = False):
+        key = (size, bold)
+        if key not in self._fonts:
+            self._fonts[key] = ImageFont.truetype(self.bold_font_path if bold else self.font_path, size)
+        return self._fonts[key]
+
+    @staticmethod
+    def _line_height(font):
+        ascent, descent = font.getmetrics()
+        return ascent + descent
+
+    def _parse_cell(self, value, header: bool):
+        """셀 값을 줄 단위 run 목록으로 변환
+
+        Returns:
+            list: [(font, [(텍스트, 색상), ...], 위쪽 여백), ...]
+        """
+        style = STYLE
+        if header:
+            font = self._font(style['header_size'], bold=True)
+            return [(font, [(line, style['header_color'])], 0) for line in BR_PATTERN.split(str(value))]
+
+        font = self._font(style['cell_size'])
+        lines = []
+        for raw_line in BR_PATTERN.split(str(value)):
+            runs = []
+            block_lines = []
+            pos = 0
+            for match in SPAN_PATTERN.finditer(raw_line):
+                if match.start() > pos:
+                    runs.append((raw_line[pos:match.start()], style['cell_color']))
+                css_class, text = match.group(1), match.group(2)
+                if css_class == 'stock-code':
+                    # display:block → 별도 줄, 작은 회색 글씨
+                    block_lines.append((self._font(style['code_size']), [(text, style['code_color'])], style['code_margin_top']))
+                else:
+                    runs.append((text, style.get(css_class, style['cell_color'])))
+                pos = match.end()
+            if pos < len(raw_line):
+                runs.append((raw_line[pos:], style['cell_color']))
+
+            runs = [(text.strip() if len(runs) == 1 else text, color) for text, color in runs]
+            runs = [(text, color) for text, color in runs if text]
+            if runs:
+                lines.append((font, runs, 0))
+            lines.extend(block_lines)
+        return lines
+
+    def _measure(self, lines):
+        width = 0
+        height = 0
+        for font, runs, margin_top in lines:
+            width = max(width, sum(font.getlength(text) for text, _ in runs))
+            height += margin_top + self._line_height(font)
+        return width, height
+
+    def _draw_lines(self, draw, lines, left, top, cell_width, cell_height, content_height):
+        y = top + (cell_height - content_height) / 2
+        for font, runs, margin_top in lines:
+            y += margin_top
+            line_width = sum(font.getlength(text) for text, _ in runs)
+            x = left + (cell_width - line_width) / 2
+            for text, color in runs:
+                draw.text((x, y), text, font=font, fill=color)
+                x += font.getlength(text)
+            y += self._line_height(font)
+
+    def render(self, df, caption: str, source: str, header_labels: dict = None):
+        """DataFrame을 표 이미지로 렌더링
+
+        Args:
+            df (pandas.DataFrame): 셀 값에 <span class='...'>, <br> 마크업을 포함할 수 있는 표 데이터
+            caption (str): 상단 제목
+            source (str): 하단 출처 문구
+            header_labels (dict, optional): {컬럼명: 표시할 헤더 (<br> 허용)}
+
+        Returns:
+            PIL.Image.Image: 렌더링된 이미지
+        """
+        style = STYLE
+        header_labels = header_labels or {}
+        pad_x, pad_y = style['cell_padding_x'], style['cell_padding_y']
+
+        header = [self._parse_cell(header_labels.get(col, col), header=True) for col in df.columns]
+        body = [[self._parse_cell(value, header=False) for value in row] for row in df.itertuples(index=False)]
+
+        # 열 너비: 내용 최대 너비 기준으로 계산 후 표 너비에 맞게 비례 배분 (HTML 자동 레이아웃 근사)
+        table_width = self.width - style['body_margin'] * 2
+        sizes = [[self._measure(cell) for cell in row] for row in [header] + body]
+        content_widths = [max(row[i][0] for row in sizes) + pad_x * 2 + 1 for i in range(len(df.columns))]
+        total = sum(content_widths)
+        col_widths = [w * table_width / total for w in content_widths]
+        row_heights = [max(h for _, h in row) + pad_y * 2 + 1 for row in sizes]
+
+        caption_font = self._font(style['caption_size'], bold=True)
+        source_font = self._font(style['source_size'])
+        caption_top = max(style['body_margin'], style['caption_margin'])
+        table_top = caption_top + self._line_height(caption_font) + max(style['caption_margin'], style['table_margin'])
+        table_bottom = table_top + sum(row_heights)
+        source_top = table_bottom + max(style['table_margin'], style['source_margin_top'])
+        height = int(source_top + self._line_height(source_font) + style['body_margin'])
+
+        image = Image.new('RGB', (self.width, height), 'white')
+        draw = ImageDraw.Draw(image)
+
+        # 캡션
+        caption_width = caption_font.getlength(caption)
+        draw.text(((self.width - caption_width) / 2, caption_top), caption, font=caption_font, fill=style['caption_color'])
+
+        # 표
+        left = style['body_margin']
+        y = table_top
+        for row_index, (row, row_height) in enumerate(zip([header] + body, row_heights)):
+            if row_index == 0:
+                background = style['header_bg']
+            elif row_index % 2 == 0:
+                background = style['even_row_bg']
+            else:
+                background = 'white'
+
+            x = left
+            for cell, col_width, (_, content_height) in zip(row, col_widths, sizes[row_index]):
+                box = [round(x), round(y), round(x + col_width), round(y + row_height)]
+                draw.rectangle(box, fill=background, outline=style['border_color'])
+                self._draw_lines(draw, cell, x, y, col_width, row_height, content_height)
+                x += col_width
+            y += row_height
+
+        # 출처
+        source_width = source_font.getlength(source)
+        draw.text((self.width - style['body_margin'] - source_width, source_top), source, font=source_font, fill=style['source_color'])
+
+        return image
+
+    def render_bytes(self, df, caption: str, source: str, header_labels: dict = None) -> bytes:
+        """렌더링한 이미지를 PNG 바이트로 반환 (파일 저장 없이 바로 전송할 때 사용)"""
+        buffer = io.BytesIO()
+        self.render(df, caption, source, header_labels).save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue()
+
+    def save(self, df, file_path: str, caption: str, source: str, header_labels: dict = None):
+        """렌더링한 이미지를 PNG로 저장"""
+        image = self.render(df, caption, source, header_labels)
+        image.save(file_path, format='PNG', optimize=True)
+        return file_path
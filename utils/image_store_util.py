@@ -0,0 +1,104 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger_util import LoggerUtil
+
+
+@dataclass(frozen=True)
+class RenderedImage:
+    """메모리에 보관하는 렌더링 결과 이미지
+
+    Attributes:
+        name (str): 파일명 (예: institution_top_report_20250101.png)
+        data (bytes): 인코딩된 이미지 바이트
+        format (str): 이미지 형식 (png, jpeg)
+    """
+    name: str
+    data: bytes
+    format: str = "png"
+
+    @property
+    def mime_type(self):
+        return f"image/{self.format}"
+
+
+def dated_file_name(file_name: str, date: str, extension: str = ".png") -> str:
+    """'{file_name}_{YYYYMMDD}{extension}' 형식 파일명"""
+    return f"{file_name}_{date}{extension}"
+
+
+class ImageArchiver:
+    """리포트 이미지 보관 (img/ 디렉토리)
+
+    - 저장은 단일 백그라운드 스레드에서 처리하여 전송 경로를 막지 않음 (submit)
+    - 오래된 파일은 디렉토리 전체를 훑지 않고 날짜로 계산한 파일명만 삭제
+      (보관 기간 이후 rotation_window일 범위, 휴장일로 실행이 건너뛴 날까지 포함)
+    """
+
+    def __init__(self, img_dir: str, retention_days: int = None, rotation_window: int = None):
+        self.img_dir = img_dir
+        self.retention_days = retention_days if retention_days is not None else int(os.getenv("IMAGE_RETENTION_DAYS", "0"))
+        self.rotation_window = rotation_window if rotation_window is not None else int(os.getenv("IMAGE_ROTATION_WINDOW", "14"))
+        self.logger = LoggerUtil().get_logger()
+        self._executor = None
+        os.makedirs(img_dir, exist_ok=True)
+
+    def rotate(self, file_name: str, date: str, extension: str = ".png") -> int:
+        """보관 기간이 지난 '{file_name}_{날짜}' 파일 삭제
+
+        Args:
+            file_name (str): 날짜를 제외한 파일명
+            date (str): 기준일 (YYYYMMDD)
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        base = datetime.strptime(date, "%Y%m%d")
+        removed_count = 0
+        for days in range(self.retention_days + 1, self.retention_days + 1 + self.rotation_window):
+            old_file = dated_file_name(file_name, (base - timedelta(days=days)).strftime("%Y%m%d"), extension)
+            try:
+                os.remove(os.path.join(self.img_dir, old_file))
+                removed_count += 1
+                self.logger.debug("기존 파일 삭제: %s", old_file)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self.logger.warning(f"파일 삭제 실패: {old_file} - {str(e)}")
+        return removed_count
+
+    def write(self, image: RenderedImage) -> str:
+        """이미지를 저장하고 파일 경로 반환 (임시 파일에 쓴 뒤 교체)"""
+        file_path = os.path.join(self.img_dir, image.name)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(image.data)
+        os.replace(tmp_path, file_path)
+        return file_path
+
+    def archive(self, image: RenderedImage, file_name: str, date: str) -> str:
+        """저장 + 회전"""
+        file_path = self.write(image)
+        removed_count = self.rotate(file_name, date, os.path.splitext(image.name)[1])
+        self.logger.info(f"이미지 보관 완료: {file_path} (기존 파일 {removed_count}개 삭제)")
+        return file_path
+
+    def _run_archive(self, image: RenderedImage, file_name: str, date: str):
+        try:
+            return self.archive(image, file_name, date)
+        except Exception as e:
+            self.logger.error(f"이미지 보관 실패: {image.name} - {str(e)}")
+            return None
+
+    def submit(self, image: RenderedImage, file_name: str, date: str):
+        """백그라운드 보관 예약 (Future 반환, 실패는 로그만 남김)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-archive")
+        return self._executor.submit(self._run_archive, image, file_name, date)
+
+    def close(self):
+        """예약된 보관 작업이 끝날 때까지 대기"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,230 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from utils.cache_util import MarketDbStore
+
+# DataFrame 컬럼(get_domestic_index 결과) ↔ 저장 컬럼
+INDEX_COLUMNS = {
+    '날짜': 'date',
+    '종가': 'close',
+    '시가': 'open',
+    '고가': 'high',
+    '저가': 'low',
+    '거래량': 'volume',
+    '전일대비': 'change',
+    '등락구분': 'sign',
+    '등락률': 'rate',
+}
+
+# 장 마감 후 당일 지수가 확정되는 시각
+MARKET_CLOSE_TIME = "15:40"
+
+
+class IndexHistoryCache(MarketDbStore):
+    """업종 지수(0001 코스피, 1001 코스닥, 2001 코스피200) 일별 시세 저장소
+
+    - 일별 지수를 SQLite(cache/market_data.db)에 누적하고, 실행마다 새 거래일만 추가
+    - 조회한 기간(index_ranges)을 함께 저장해 빠진 구간 없이 이어진 이력만 등락률 계산에 사용
+      (실행이 한 페이지(약 100거래일) 이상 멈췄다가 재개되면 중간 구간이 비므로)
+    - 지수별 전체 이력을 메모리에 올려두고 N거래일 등락률을 바로 계산
+    """
+
+    def __init__(self, db_path: str = None):
+        super().__init__(db_path)
+        self._frames = {}
+        self._create_tables()
+
+    def _create_tables(self):
+        columns = ", ".join(f"{col} REAL" for col in INDEX_COLUMNS.values() if col not in ('date', 'sign'))
+        with self._lock, self._conn:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS index_bars (
+                    index_code TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    sign TEXT,
+                    {columns},
+                    PRIMARY KEY (index_code, date)
+                ) WITHOUT ROWID
+            """)
+            # 한 번의 조회로 빠짐없이 받은 기간 (start~end, 양 끝 포함, YYYYMMDD)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_ranges (
+                    index_code TEXT NOT NULL,
+                    start TEXT NOT NULL,
+                    end TEXT NOT NULL,
+                    PRIMARY KEY (index_code, start, end)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_meta (
+                    index_code TEXT PRIMARY KEY,
+                    fetched_at TEXT NOT NULL
+                )
+            """)
+
+    def needs_refresh(self, index_code: str, date: str) -> bool:
+        """기준일까지의 확정 지수가 저장되어 있지 않으면 True
+
+        Args:
+            index_code (str): 업종 코드 (0001, 1001, 2001)
+            date (str): 기준일 (YYYYMMDD 형식)
+        """
+        if self.covered_since(index_code, date) is None:
+            return True
+
+        with self._lock:
+            latest = self._conn.execute(
+                "SELECT MAX(date) FROM index_bars WHERE index_code = ?", (index_code,)
+            ).fetchone()[0]
+            meta = self._conn.execute(
+                "SELECT fetched_at FROM index_meta WHERE index_code = ?", (index_code,)
+            ).fetchone()
+
+        if latest is None or latest < date:
+            return True
+
+        # 당일 봉은 장 마감 이후에 조회한 값만 확정으로 취급
+        fetched_at = datetime.strptime(meta[0], "%Y-%m-%d %H:%M:%S") if meta else None
+        close_at = datetime.strptime(f"{latest} {MARKET_CLOSE_TIME}", "%Y%m%d %H:%M")
+        return fetched_at is None or fetched_at < close_at
+
+    def _ranges(self, index_code: str):
+        """조회한 기간을 겹치거나 맞닿은 것끼리 합친 목록 [(start, end), ...] (date, 오름차순)"""
+        rows = self._conn.execute(
+            "SELECT start, end FROM index_ranges WHERE index_code = ? ORDER BY start", (index_code,)
+        ).fetchall()
+        merged = []
+        for start, end in rows:
+            start, end = datetime.strptime(start, "%Y%m%d").date(), datetime.strptime(end, "%Y%m%d").date()
+            if merged and start <= merged[-1][1] + timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def covered_since(self, index_code: str, date: str):
+        """기준일까지 빠진 구간 없이 이어서 저장된 이력의 시작일
+
+        Returns:
+            pandas.Timestamp: 시작일 (기준일이 조회한 기간에 없으면 None)
+        """
+        day = datetime.strptime(date, "%Y%m%d").date()
+        with self._lock:
+            ranges = self._ranges(index_code)
+        for start, end in ranges:
+            if start <= day <= end:
+                return pd.Timestamp(start)
+        return None
+
+    def store(self, index_code: str, df, through: str = None):
+        """get_domestic_index 결과를 저장 (이미 있는 날짜는 갱신)
+
+        Args:
+            through (str, optional): 조회 기준일 (YYYYMMDD 형식). 주면 가장 오래된 날짜~기준일을 빠짐없이 받은 기간으로 기록
+
+        Returns:
+            int: 새로 추가된 거래일 수
+        """
+        if df.empty:
+            return 0
+
+        rows = df[[col for col in INDEX_COLUMNS if col in df.columns]].rename(columns=INDEX_COLUMNS)
+        rows = rows.assign(date=rows['date'].dt.strftime('%Y%m%d'))
+        columns = list(rows.columns)
+        records = [(index_code, *values) for values in rows.itertuples(index=False, name=None)]
+
+        with self._lock, self._conn:
+            before = self._conn.execute(
+                "SELECT COUNT(*) FROM index_bars WHERE index_code = ?", (index_code,)
+            ).fetchone()[0]
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO index_bars (index_code, {', '.join(columns)}) "
+                f"VALUES (?, {', '.join('?' for _ in columns)})",
+                records
+            )
+            if through is not None:
+                # 기존 기간은 합친 상태로 다시 저장 (행이 계속 늘어나지 않도록)
+                ranges = self._ranges(index_code)
+                self._conn.execute("DELETE FROM index_ranges WHERE index_code = ?", (index_code,))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO index_ranges (index_code, start, end) VALUES (?, ?, ?)",
+                    [(index_code, start.strftime("%Y%m%d"), end.strftime("%Y%m%d")) for start, end in ranges]
+                    + [(index_code, min(rows['date'].min(), through), through)]
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO index_meta (index_code, fetched_at) VALUES (?, ?)",
+                (index_code, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            after = self._conn.execute(
+                "SELECT COUNT(*) FROM index_bars WHERE index_code = ?", (index_code,)
+            ).fetchone()[0]
+            self._frames.pop(index_code, None)
+
+        return after - before
+
+    def history(self, index_code: str):
+        """저장된 전체 지수 이력 (get_domestic_index와 같은 컬럼, 날짜 내림차순, 메모리 캐시)"""
+        with self._lock:
+            if index_code not in self._frames:
+                columns = list(INDEX_COLUMNS.values())
+                df = pd.read_sql_query(
+                    f"SELECT {', '.join(columns)} FROM index_bars WHERE index_code = ? ORDER BY date DESC",
+                    self._conn, params=(index_code,)
+                )
+                df = df.rename(columns={v: k for k, v in INDEX_COLUMNS.items()})
+                df['날짜'] = pd.to_datetime(df['날짜'], format='%Y%m%d')
+                df['지수명'] = index_code
+                self._frames[index_code] = df
+            return self._frames[index_code]
+
+    def contiguous_history(self, index_code: str, date: str = None):
+        """기준일부터 과거로 빠진 구간 없이 이어진 이력 (날짜 내림차순)
+
+        Args:
+            date (str, optional): 기준일 (YYYYMMDD 형식). 기본값은 마지막 저장일
+        """
+        df = self.history(index_code)
+        if date is None:
+            if df.empty:
+                return df
+            date = df['날짜'].iloc[0].strftime('%Y%m%d')
+        since = self.covered_since(index_code, date)
+        if since is None:
+            return df.iloc[0:0]
+        return df[(df['날짜'] <= pd.Timestamp(date)) & (df['날짜'] >= since)]
+
+    def change_rate(self, index_code: str, sessions: int, date: str = None):
+        """기준일 종가와 sessions번째 거래일(기준일 포함) 종가 대비 등락률(%)
+
+        예: sessions=30이면 최근 30거래일 중 첫 거래일 종가 대비 (기존 iloc[29] 계산과 동일)
+
+        Returns:
+            tuple: (등락률, 비교 기준일 Timestamp)
+        """
+        df = self.contiguous_history(index_code, date)
+        if len(df) < sessions:
+            raise ValueError(f"지수 이력이 부족하거나 빠진 구간이 있습니다 - {index_code}: 연속 {len(df)}/{sessions}거래일")
+
+        latest, base = df.iloc[0], df.iloc[sessions - 1]
+        return round((latest['종가'] - base['종가']) / base['종가'] * 100, 2), base['날짜']
+
+    def change_rates(self, index_code: str, windows, date: str = None):
+        """여러 기간의 등락률을 한 번에 계산 (change_rate와 같은 기준)
+
+        Args:
+            windows (iterable): 거래일 수 목록 (예: 5, 20, 60, 120)
+
+        Returns:
+            dict: {거래일 수: (등락률, 비교 기준일 Timestamp)}
+        """
+        windows = list(windows)
+        df = self.contiguous_history(index_code, date)
+        if len(df) < max(windows):
+            raise ValueError(f"지수 이력이 부족하거나 빠진 구간이 있습니다 - {index_code}: 연속 {len(df)}/{max(windows)}거래일")
+
+        positions = np.asarray(windows) - 1
+        closes = df['종가'].to_numpy(dtype=float)
+        base = closes[positions]
+        rates = np.round((closes[0] - base) / base * 100, 2)
+        base_dates = df['날짜'].iloc[positions]
+        return {window: (float(rate), base_day) for window, rate, base_day in zip(windows, rates, base_dates)}
@@ -0,0 +1,111 @@
+import os
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
+
+
+class KisClient:
+    """한국투자증권(KIS) Open API 공용 HTTP 클라이언트
+
+    - keep-alive 커넥션 풀을 가진 단일 세션으로 TCP/TLS 핸드셰이크를 재사용
+    - 인증 헤더는 토큰이 바뀔 때만 다시 생성
+    - 타임아웃 적용, 5xx/네트워크 오류/초당 거래건수 초과(EGW00201) 시 지수 백오프로 재시도
+    """
+
+    # 재시도 대상 응답 코드 (초당 거래건수 초과)
+    RATE_LIMIT_CODES = {"EGW00201"}
+
+    def __init__(self, url_base: str, app_key: str, app_secret: str, token_provider=None, rate_limiter=None):
+        self.url_base = url_base.rstrip("/") if url_base else url_base
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.token_provider = token_provider
+        self.rate_limiter = rate_limiter
+        self.timeout = float(os.getenv("KIS_TIMEOUT", "10"))
+        self.max_retries = int(os.getenv("KIS_MAX_RETRIES", "3"))
+        self.backoff = float(os.getenv("KIS_RETRY_BACKOFF", "0.5"))
+        self.logger = LoggerUtil().get_logger()
+        self.metrics = MetricsUtil()
+
+        pool_size = int(os.getenv("KIS_POOL_SIZE", "10"))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._token = None
+        self._auth_headers = None
+
+    def _headers(self, tr_id: str = None, auth: bool = True):
+        """요청 헤더 생성 (인증 헤더는 토큰이 바뀔 때만 재생성)"""
+        if not auth:
+            return {"content-type": "application/json"}
+
+        token = self.token_provider()
+        if not token:
+            raise Exception("토큰 발급 실패")
+
+        if token != self._token:
+            self._auth_headers = {
+                "Content-Type": "application/json; charset=utf-8",
+                "authorization": f"Bearer {token}",
+                "appKey": self.app_key,
+                "appSecret": self.app_secret,
+            }
+            self._token = token
+
+        headers = dict(self._auth_headers)
+        if tr_id:
+            headers["tr_id"] = tr_id
+        return headers
+
+    def _is_rate_limited(self, response):
+        try:
+            return response.json().get("msg_cd") in self.RATE_LIMIT_CODES
+        except ValueError:
+            return False
+
+    def request(self, method: str, path: str, tr_id: str = None, params: dict = None, json_body: dict = None, auth: bool = True):
+        """KIS API 호출 (재시도 포함)
+
+        Returns:
+            requests.Response: 최종 응답 (재시도 횟수를 모두 소진한 경우 마지막 응답)
+        """
+        url = f"{self.url_base}/{path}"
+        headers = self._headers(tr_id, auth)
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                with self.metrics.span("rate_limiter_wait", service="kis"):
+                    self.rate_limiter.acquire()
+
+            try:
+                with self.metrics.span("http_request", service="kis", method=method, endpoint=path, tr_id=tr_id) as tags:
+                    response = self.session.request(method, url, headers=headers, params=params, json=json_body, timeout=self.timeout)
+                    tags["status"] = response.status_code
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                reason, kind = f"네트워크 오류({type(e).__name__})", "network"
+            else:
+                rate_limited = self._is_rate_limited(response)
+                if rate_limited:
+                    self.metrics.increment("rate_limit_hits", service="kis", endpoint=path, tr_id=tr_id)
+                if response.status_code < 500 and not rate_limited:
+                    return response
+                if attempt >= self.max_retries:
+                    return response
+                reason, kind = ("호출 제한 초과", "rate_limit") if rate_limited else (f"서버 오류({response.status_code})", "server_error")
+
+            self.metrics.increment("http_retries", service="kis", endpoint=path, tr_id=tr_id, reason=kind)
+            delay = self.backoff * (2 ** attempt)
+            self.logger.warning(f"KIS API 재시도 {attempt + 1}/{self.max_retries} - {path} ({tr_id}): {reason}, {delay:.2f}초 후 재시도")
+            time.sleep(delay)
+
+    def get(self, path: str, tr_id: str, params: dict = None):
+        return self.request("GET", path, tr_id=tr_id, params=params)
+
+    def post(self, path: str, json_body: dict = None, tr_id: str = None, auth: bool = True):
+        return self.request("POST", path, tr_id=tr_id, json_body=json_body, auth=auth)
@@ -1,9 +1,52 @@
 import logging
+import logging.handlers
+import queue
+import atexit
+import time
 from pathlib import Path
 from datetime import datetime
 import os
 
+
+class DailyFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """자정마다 logs/YYYY-MM-DD_log.log 파일로 전환하는 파일 핸들러
+
+    backup_count가 0보다 크면 전환할 때 가장 최근 backup_count개 날짜 파일만 남긴다.
+    """
+
+    def __init__(self, log_dir, backup_count: int = 0):
+        self.log_dir = Path(log_dir)
+        super().__init__(self._path_for(datetime.now()), when='midnight', backupCount=backup_count, encoding='utf-8')
+
+    def _path_for(self, when: datetime) -> str:
+        return str(self.log_dir / f"{when.strftime('%Y-%m-%d')}_log.log")
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        self.baseFilename = os.path.abspath(self._path_for(datetime.now()))
+        if self.backupCount > 0:
+            log_files = sorted(self.log_dir.glob("????-??-??_log.log"))
+            for old_file in log_files[:-self.backupCount]:
+                try:
+                    old_file.unlink()
+                except OSError:
+                    pass
+
+        if not self.delay:
+            self.stream = self._open()
+        self.rolloverAt = self.computeRollover(int(time.time()))
+
+
 class LoggerUtil:
+    """공용 로거 (싱글톤)
+
+    - 호출 스레드는 QueueHandler로 레코드를 큐에 넣기만 하고, 파일/콘솔 출력은 QueueListener 스레드에서 처리
+    - 로그 파일은 날짜별(logs/YYYY-MM-DD_log.log)로 자정에 전환, LOG_BACKUP_DAYS일치 보관 (0이면 삭제 안 함)
+    - 로그 레벨은 LOG_LEVEL 환경변수 (기본값 INFO)
+    """
     _instance = None
     _initialized = False
 
@@ -17,42 +60,46 @@ class LoggerUtil:
             # 루트 디렉토리 경로 찾기 (상위 디렉토리)
             current_dir = Path(os.path.dirname(os.path.abspath(__file__)))
             root_dir = current_dir.parent
-            
+
             # 로그 디렉토리를 루트 경로의 logs 폴더로 설정
             log_dir = root_dir / 'logs'
 
             # 디렉토리가 없으면 생성
             log_dir.mkdir(parents=True, exist_ok=True)
 
-            # 로그 파일 설정
-            log_file = log_dir / f"{datetime.now().strftime('%Y-%m-%d')}_log.log"
+            level = getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO)
 
             # 로거 생성
             self.logger = logging.getLogger('MQLogger')
-            self.logger.setLevel(logging.INFO)
+            self.logger.setLevel(level)
 
             # 이미 핸들러가 있다면 제거
             if self.logger.handlers:
                 self.logger.handlers.clear()
 
-            # 파일 핸들러
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
+            # 파일 핸들러 (날짜별 파일)
+            file_handler = DailyFileHandler(log_dir, backup_count=int(os.getenv('LOG_BACKUP_DAYS', '0')))
+            file_handler.setLevel(level)
 
             # 콘솔 핸들러
             console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
+            console_handler.setLevel(level)
 
             # 포맷터 설정
             formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
             file_handler.setFormatter(formatter)
             console_handler.setFormatter(formatter)
 
-            # 핸들러 추가
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
-            
+            # 큐 핸들러 추가 (실제 출력은 리스너 스레드에서)
+            log_queue = queue.SimpleQueue()
+            self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            self.listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+            self.listener.start()
+
+            # 종료 시 남은 로그 출력
+            atexit.register(self.listener.stop)
+
             LoggerUtil._initialized = True
 
     def get_logger(self):
-        return self.logger 
\ No newline at end of file
+        return self.logger
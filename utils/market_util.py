@@ -0,0 +1,132 @@
+import os
+import json
+import glob
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from utils.logger_util import LoggerUtil
+from utils.cache_util import cache_dir as default_cache_dir
+from utils.metrics_util import MetricsUtil
+
+NOT_FOUND = "Not Found"
+
+
+class TickerMarketIndex:
+    """종목코드 → 시장(KOSPI/KOSDAQ) 조회 인덱스
+
+    pykrx 종목 목록(KRX 스크래핑)은 느리므로 거래일별 스냅샷을 cache/tickers_YYYYMMDD.json에 저장하고,
+    같은 날 다시 실행하면 파일에서 바로 로드한다. 조회는 dict 기반 O(1).
+    """
+
+    MARKETS = ("KOSPI", "KOSDAQ")
+
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __init__(self, market_tickers: dict, date: str = None):
+        """
+        Args:
+            market_tickers (dict): {시장명: [종목코드, ...]}
+            date (str, optional): 스냅샷 기준일 (YYYYMMDD 형식)
+        """
+        self.date = date
+        self.market_tickers = {market: frozenset(tickers) for market, tickers in market_tickers.items()}
+        self.ticker_market = {
+            ticker: market
+            for market in reversed(self.MARKETS) if market in self.market_tickers
+            for ticker in self.market_tickers[market]
+        }
+
+    def get_market(self, ticker: str) -> str:
+        """종목코드가 속한 시장명 반환 (없으면 'Not Found')"""
+        return self.ticker_market.get(ticker, NOT_FOUND)
+
+    def tickers(self, market: str):
+        """시장별 종목코드 집합 반환"""
+        return self.market_tickers.get(market, frozenset())
+
+    def __contains__(self, ticker):
+        return ticker in self.ticker_market
+
+    def __len__(self):
+        return len(self.ticker_market)
+
+    @classmethod
+    def _snapshot_path(cls, cache_dir: str, date: str):
+        return os.path.join(cache_dir, f"tickers_{date}.json")
+
+    @classmethod
+    def _prune_snapshots(cls, cache_dir: str, date: str, logger):
+        """기준일보다 보관 기간(TICKER_SNAPSHOT_RETENTION_DAYS일) 넘게 오래된 스냅샷 삭제 (조회 실패 대비로 기준일 스냅샷은 유지)"""
+        retention_days = int(os.getenv("TICKER_SNAPSHOT_RETENTION_DAYS", "7"))
+        cutoff = (datetime.strptime(date, '%Y%m%d') - timedelta(days=retention_days)).strftime('%Y%m%d')
+        removed = 0
+        for path in glob.glob(cls._snapshot_path(cache_dir, '*')):
+            snapshot_date = os.path.basename(path)[len("tickers_"):-len(".json")]
+            if snapshot_date.isdigit() and snapshot_date < cutoff:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"오래된 종목 목록 스냅샷 삭제 실패: {path} ({str(e)})")
+        if removed:
+            logger.info(f"오래된 종목 목록 스냅샷 {removed}개 삭제 ({cutoff} 이전)")
+
+    @classmethod
+    def _fetch(cls, date: str):
+        """pykrx로 시장별 종목 목록 조회"""
+        import pykrx.stock as stock
+        return {market: list(stock.get_market_ticker_list(date=date, market=market)) for market in cls.MARKETS}
+
+    @classmethod
+    def load(cls, date: str = None, cache_dir: str = None):
+        """기준일의 종목 인덱스를 반환 (프로세스 메모리 → 스냅샷 파일 → pykrx 순)
+
+        Args:
+            date (str, optional): 기준일 (YYYYMMDD 형식). 기본값은 오늘
+            cache_dir (str, optional): 스냅샷 저장 디렉토리. 기본값은 cache/
+        """
+        if date is None:
+            date = datetime.now().strftime('%Y%m%d')
+        if cache_dir is None:
+            cache_dir = str(default_cache_dir())
+
+        with cls._lock:
+            if date in cls._instances:
+                return cls._instances[date]
+
+            logger = LoggerUtil().get_logger()
+            snapshot_path = cls._snapshot_path(cache_dir, date)
+
+            if os.path.exists(snapshot_path):
+                with open(snapshot_path, 'r', encoding='utf-8') as f:
+                    market_tickers = json.load(f)['markets']
+                logger.info(f"종목 목록 스냅샷 로드: {snapshot_path}")
+            else:
+                try:
+                    logger.info(f"전체 종목 정보 가져오기 시작 - 기준일: {date}")
+                    with MetricsUtil().span("pykrx_fetch", call="get_market_ticker_list"):
+                        market_tickers = cls._fetch(date)
+                    if not any(market_tickers.values()):
+                        raise ValueError("종목 목록이 비어 있습니다.")
+
+                    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+                    tmp_path = f"{snapshot_path}.tmp"
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump({'date': date, 'markets': market_tickers}, f)
+                    os.replace(tmp_path, snapshot_path)
+                    logger.info(f"종목 목록 스냅샷 저장: {snapshot_path}")
+                    cls._prune_snapshots(cache_dir, date, logger)
+                except Exception as e:
+                    # 조회 실패 시 가장 최근 스냅샷으로 대체
+                    snapshots = sorted(glob.glob(cls._snapshot_path(cache_dir, '*')))
+                    if not snapshots:
+                        raise
+                    with open(snapshots[-1], 'r', encoding='utf-8') as f:
+                        market_tickers = json.load(f)['markets']
+                    logger.warning(f"종목 목록 조회 실패({str(e)}) - 최근 스냅샷 사용: {snapshots[-1]}")
+
+            index = cls(market_tickers, date)
+            cls._instances[date] = index
+            logger.info("종목 인덱스 준비 완료 - " + ", ".join(f"{m}: {len(index.tickers(m))}개" for m in cls.MARKETS))
+            return index
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+
+# 지연 시간 히스토그램 구간 상한(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 실행별로 남기는 개별 구간 기록 최대 개수
+MAX_EVENTS = 5000
+
+
+class Histogram:
+    """지연 시간 히스토그램 (구간별 누적 개수, 합계, 최소/최대)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                return
+        self.bucket_counts[-1] += 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else None,
+            "min": round(self.min, 6) if self.min is not None else None,
+            "max": round(self.max, 6) if self.max is not None else None,
+            "buckets": {**{str(bound): n for bound, n in zip(self.buckets, self.bucket_counts)}, "+Inf": self.bucket_counts[-1]},
+        }
+
+
+def _escape_label(value):
+    """Prometheus 라벨 값 이스케이프 (\\, ", 줄바꿈)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _tag_key(tags: dict):
+    return tuple(sorted((key, str(value)) for key, value in tags.items() if value is not None))
+
+
+class MetricsUtil:
+    """실행 단위 지표 수집기 (싱글톤)
+
+    - span(): 파이프라인 단계/외부 HTTP 호출 등의 소요 시간을 태그(endpoint, tr_id, status 등)별 히스토그램에 기록
+    - increment(): 재시도, 호출 제한 초과 등의 횟수 기록
+    - write(): logs/YYYY-MM-DD_HHMMSS_metrics.json 저장 (METRICS_PROMETHEUS_FILE 설정 시 Prometheus textfile도 저장)
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MetricsUtil, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if MetricsUtil._initialized:
+            return
+
+        root_dir = Path(os.path.dirname(os.path.abspath(__file__))).parent
+        self.log_dir = root_dir / 'logs'
+        self.enabled = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+        self.prometheus_file = os.getenv("METRICS_PROMETHEUS_FILE")
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._events = []
+
+        MetricsUtil._initialized = True
+
+    def observe(self, name: str, seconds: float, **tags):
+        """소요 시간 기록"""
+        if not self.enabled:
+            return
+        key = (name, _tag_key(tags))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+            if len(self._events) < MAX_EVENTS:
+                self._events.append({
+                    "name": name,
+                    "tags": dict(key[1]),
+                    "start": round(time.perf_counter() - self._started - seconds, 6),
+                    "seconds": round(seconds, 6),
+                })
+
+    def increment(self, name: str, value: int = 1, **tags):
+        """횟수 기록"""
+        if not self.enabled:
+            return
+        key = (name, _tag_key(tags))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def span(self, name: str, **tags):
+        """구간 소요 시간 기록 (with 블록 안에서 반환된 dict에 status 등 태그 추가 가능, 예외 시 status=error)"""
+        started = time.perf_counter()
+        try:
+            yield tags
+        except BaseException as e:
+            tags.setdefault("status", "error")
+            tags.setdefault("error", type(e).__name__)
+            raise
+        finally:
+            tags.setdefault("status", "ok")
+            self.observe(name, time.perf_counter() - started, **tags)
+
+    def snapshot(self):
+        """현재까지의 지표를 dict로 반환"""
+        with self._lock:
+            return {
+                "run_started": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "run_seconds": round(time.perf_counter() - self._started, 3),
+                "histograms": [
+                    {"name": name, "tags": dict(tags), **histogram.to_dict()}
+                    for (name, tags), histogram in sorted(self._histograms.items())
+                ],
+                "counters": [
+                    {"name": name, "tags": dict(tags), "value": value}
+                    for (name, tags), value in sorted(self._counters.items())
+                ],
+                "events": list(self._events),
+            }
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식 (node_exporter textfile collector용)"""
+        def labels(tags, extra=()):
+            items = list(tags) + list(extra)
+            if not items:
+                return ""
+            return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in items) + "}"
+
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self._histograms}):
+                metric = f"mq_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for (hist_name, tags), histogram in sorted(self._histograms.items()):
+                    if hist_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f"{metric}_bucket{labels(tags, [('le', bound)])} {cumulative}")
+                    lines.append(f"{metric}_sum{labels(tags)} {histogram.sum:.6f}")
+                    lines.append(f"{metric}_count{labels(tags)} {histogram.count}")
+            for name in sorted({name for name, _ in self._counters}):
+                metric = f"mq_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (counter_name, tags), value in sorted(self._counters.items()):
+                    if counter_name == name:
+                        lines.append(f"{metric}{labels(tags)} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _write_atomic(path: Path, text: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def write(self, path: str = None):
+        """실행 지표 파일 저장
+
+        Returns:
+            str: JSON 파일 경로 (비활성화 시 None)
+        """
+        if not self.enabled:
+            return None
+
+        json_path = Path(path) if path else self.log_dir / f"{self.started_at.strftime('%Y-%m-%d_%H%M%S')}_metrics.json"
+        self._write_atomic(json_path, json.dumps(self.snapshot(), ensure_ascii=False, indent=2))
+        if self.prometheus_file:
+            self._write_atomic(Path(self.prometheus_file), self.to_prometheus())
+        return str(json_path)
@@ -0,0 +1,120 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.logger_util import LoggerUtil
+from utils.metrics_util import MetricsUtil
+
+
+class Stage:
+    """파이프라인 단계
+
+    Attributes:
+        name (str): 단계 이름
+        func (callable): inputs 이름을 키워드 인자로 받아 outputs에 해당하는 값을 반환하는 함수
+        inputs (tuple): 필요한 값 이름
+        outputs (tuple): 만들어내는 값 이름 (2개 이상이면 func는 같은 길이의 튜플을 반환)
+    """
+
+    def __init__(self, name: str, func, inputs=(), outputs=()):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+
+    def run(self, context: dict):
+        result = self.func(**{name: context[name] for name in self.inputs})
+        if not self.outputs:
+            return {}
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        return dict(zip(self.outputs, result))
+
+
+class Pipeline:
+    """단계 간 입력/출력 의존성으로 실행 순서를 정하는 DAG 실행기
+
+    입력이 모두 준비된 단계는 스레드 풀에서 동시에 실행하고, 단계별 소요 시간을 기록한다.
+    한 단계라도 실패하면 새 단계를 시작하지 않고 실행 중인 단계가 끝나길 기다린 뒤 예외를 다시 발생시킨다.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.stages = []
+        self.timings = {}
+        self.logger = LoggerUtil().get_logger()
+
+    def add(self, name: str, func, inputs=(), outputs=()):
+        """단계 추가 (체이닝 가능)"""
+        self.stages.append(Stage(name, func, inputs, outputs))
+        return self
+
+    def _validate(self, initial: dict):
+        available = set(initial)
+        producers = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in producers or output in initial:
+                    raise ValueError(f"값 '{output}'을(를) 만드는 단계가 중복되었습니다: {stage.name}")
+                producers[output] = stage.name
+        available |= set(producers)
+
+        for stage in self.stages:
+            missing = [name for name in stage.inputs if name not in available]
+            if missing:
+                raise ValueError(f"단계 '{stage.name}'의 입력을 만드는 단계가 없습니다: {', '.join(missing)}")
+
+    def _run_stage(self, stage: Stage, context: dict):
+        started = time.perf_counter()
+        try:
+            with MetricsUtil().span("pipeline_stage", stage=stage.name):
+                return stage.run(context)
+        finally:
+            self.timings[stage.name] = time.perf_counter() - started
+
+    def run(self, initial: dict = None):
+        """파이프라인 실행
+
+        Args:
+            initial (dict, optional): 시작 시 주어지는 값
+
+        Returns:
+            dict: 모든 단계의 출력이 담긴 컨텍스트
+        """
+        context = dict(initial or {})
+        self._validate(context)
+        pending = list(self.stages)
+        running = {}
+        error = None
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if error is None:
+                    ready = [stage for stage in pending if all(name in context for name in stage.inputs)]
+                    for stage in ready:
+                        pending.remove(stage)
+                        self.logger.info(f"[단계 시작] {stage.name}")
+                        running[executor.submit(self._run_stage, stage, dict(context))] = stage
+
+                if not running:
+                    if error is None and pending:
+                        raise ValueError(f"순환 의존성으로 실행할 수 없는 단계: {', '.join(stage.name for stage in pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        context.update(future.result())
+                        self.logger.info(f"[단계 완료] {stage.name} - {self.timings[stage.name]:.2f}초")
+                    except Exception as e:
+                        self.logger.error(f"[단계 실패] {stage.name} - {self.timings.get(stage.name, 0):.2f}초: {str(e)}")
+                        if error is None:
+                            error = e
+
+        total = time.perf_counter() - started
+        summary = ", ".join(f"{name} {elapsed:.2f}초" for name, elapsed in self.timings.items())
+        self.logger.info(f"파이프라인 소요 시간 - 전체 {total:.2f}초 ({summary})")
+
+        if error is not None:
+            raise error
+        return context
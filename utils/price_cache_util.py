@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta
+from utils.cache_util import MarketDbStore
+
+# 캐시에 저장하는 KIS 일봉 응답 필드 (inquire-daily-itemchartprice output2)
+BAR_FIELDS = [
+    'stck_bsop_date', 'stck_oprc', 'stck_hgpr', 'stck_lwpr', 'stck_clpr',
+    'acml_vol', 'acml_tr_pbmn', 'flng_cls_code', 'prtt_rate', 'mod_yn', 'prdy_vrss'
+]
+
+
+def _to_date(value: str):
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+def _to_str(value) -> str:
+    return value.strftime("%Y%m%d")
+
+
+class PriceCacheUtil(MarketDbStore):
+    """종목별 일봉 데이터를 (종목코드, 일자) 단위로 보관하는 SQLite 캐시
+
+    - daily_bars: KIS 응답 원본 필드를 그대로 저장 (재조회 없이 동일한 DataFrame 생성 가능)
+    - covered_ranges: 이미 조회가 끝난 기간 (휴장일처럼 데이터가 없는 날도 다시 조회하지 않도록 기록)
+    """
+
+    def __init__(self, db_path: str = None):
+        super().__init__(db_path)
+        self._create_tables()
+
+    def _create_tables(self):
+        columns = ", ".join(f"{field} TEXT" for field in BAR_FIELDS if field != 'stck_bsop_date')
+        with self._lock, self._conn:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS daily_bars (
+                    ticker TEXT NOT NULL,
+                    stck_bsop_date TEXT NOT NULL,
+                    {columns},
+                    PRIMARY KEY (ticker, stck_bsop_date)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS covered_ranges (
+                    ticker TEXT NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL,
+                    PRIMARY KEY (ticker, start_date)
+                ) WITHOUT ROWID
+            """)
+
+    def _load_ranges(self, ticker: str):
+        rows = self._conn.execute(
+            "SELECT start_date, end_date FROM covered_ranges WHERE ticker = ? ORDER BY start_date",
+            (ticker,)
+        ).fetchall()
+        return [(_to_date(s), _to_date(e)) for s, e in rows]
+
+    def missing_ranges(self, ticker: str, start_date: str, end_date: str):
+        """요청 기간 중 아직 조회되지 않은 구간 목록을 반환
+
+        Returns:
+            list: [(시작일, 종료일), ...] (YYYYMMDD 형식)
+        """
+        start, end = _to_date(start_date), _to_date(end_date)
+        with self._lock:
+            covered = self._load_ranges(ticker)
+
+        missing = []
+        cursor = start
+        for s, e in covered:
+            if e < cursor:
+                continue
+            if s > end:
+                break
+            if s > cursor:
+                missing.append((_to_str(cursor), _to_str(s - timedelta(days=1))))
+            cursor = max(cursor, e + timedelta(days=1))
+            if cursor > end:
+                break
+        if cursor <= end:
+            missing.append((_to_str(cursor), _to_str(end)))
+        return missing
+
+    def mark_covered(self, ticker: str, start_date: str, end_date: str):
+        """조회가 끝난 기간을 기록 (인접/중첩 구간은 하나로 병합)"""
+        start, end = _to_date(start_date), _to_date(end_date)
+        if start > end:
+            return
+
+        with self._lock, self._conn:
+            merged_start, merged_end = start, end
+            for s, e in self._load_ranges(ticker):
+                # 겹치거나 바로 이어지는 구간 병합
+                if s <= merged_end + timedelta(days=1) and e >= merged_start - timedelta(days=1):
+                    merged_start = min(merged_start, s)
+                    merged_end = max(merged_end, e)
+                    self._conn.execute(
+                        "DELETE FROM covered_ranges WHERE ticker = ? AND start_date = ?",
+                        (ticker, _to_str(s))
+                    )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO covered_ranges (ticker, start_date, end_date) VALUES (?, ?, ?)",
+                (ticker, _to_str(merged_start), _to_str(merged_end))
+            )
+
+    def store_bars(self, ticker: str, bars: list) -> bool:
+        """일봉 데이터를 저장
+
+        저장된 봉과 수정주가 여부(mod_yn)가 달라졌거나, 새로 들어온 봉에 수정주가 이벤트(mod_yn=Y)가
+        있으면 그 날짜(기준일) 이전의 기존 캐시(봉/조회구간)만 무효화한 뒤 저장한다.
+        분할/병합 등은 기준일 이전 가격만 소급 조정하므로 기준일 이후 봉은 그대로 사용한다.
+
+        Returns:
+            bool: 기존 캐시가 무효화되었으면 True
+        """
+        bars = [bar for bar in bars if bar.get('stck_bsop_date')]
+        if not bars:
+            return False
+
+        adjusted_date = None
+        with self._lock, self._conn:
+            dates = [bar['stck_bsop_date'] for bar in bars]
+            placeholders = ", ".join("?" for _ in dates)
+            stored = dict(self._conn.execute(
+                f"SELECT stck_bsop_date, mod_yn FROM daily_bars WHERE ticker = ? AND stck_bsop_date IN ({placeholders})",
+                (ticker, *dates)
+            ).fetchall())
+
+            for bar in bars:
+                date = bar['stck_bsop_date']
+                mod_yn = bar.get('mod_yn', '')
+                if (date in stored and stored[date] != mod_yn) or (date not in stored and mod_yn == 'Y'):
+                    adjusted_date = max(adjusted_date or date, date)
+
+            if adjusted_date:
+                self._invalidate_before(ticker, adjusted_date)
+
+            field_list = ", ".join(BAR_FIELDS)
+            value_list = ", ".join("?" for _ in BAR_FIELDS)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO daily_bars (ticker, {field_list}) VALUES (?, {value_list})",
+                [(ticker, *[bar.get(field, '') for field in BAR_FIELDS]) for bar in bars]
+            )
+
+        if adjusted_date:
+            self.logger.info(f"수정주가 변경 감지 - 종목코드: {ticker}, {adjusted_date} 이전 캐시 무효화")
+        return adjusted_date is not None
+
+    def _invalidate_before(self, ticker: str, date: str):
+        """기준일 이전의 봉을 삭제하고 조회구간을 기준일부터로 줄임 (lock/트랜잭션 안에서 호출)"""
+        self._conn.execute("DELETE FROM daily_bars WHERE ticker = ? AND stck_bsop_date < ?", (ticker, date))
+        for start, end in self._load_ranges(ticker):
+            if _to_str(start) >= date:
+                continue
+            self._conn.execute(
+                "DELETE FROM covered_ranges WHERE ticker = ? AND start_date = ?",
+                (ticker, _to_str(start))
+            )
+            if _to_str(end) >= date:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO covered_ranges (ticker, start_date, end_date) VALUES (?, ?, ?)",
+                    (ticker, date, _to_str(end))
+                )
+
+    def load_bars(self, ticker: str, start_date: str, end_date: str):
+        """기간 내 일봉 데이터를 KIS 응답과 같은 dict 리스트로 반환 (최신일 우선)"""
+        field_list = ", ".join(BAR_FIELDS)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {field_list} FROM daily_bars "
+                "WHERE ticker = ? AND stck_bsop_date BETWEEN ? AND ? ORDER BY stck_bsop_date DESC",
+                (ticker, start_date, end_date)
+            ).fetchall()
+        return [dict(zip(BAR_FIELDS, row)) for row in rows]
+
+    def get_close(self, ticker: str, date: str):
+        """특정 일자의 종가를 반환 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stck_clpr FROM daily_bars WHERE ticker = ? AND stck_bsop_date = ?",
+                (ticker, date)
+            ).fetchone()
+        if not row or row[0] in (None, ''):
+            return None
+        return float(row[0])
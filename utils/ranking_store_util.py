@@ -0,0 +1,155 @@
+import pandas as pd
+from utils.cache_util import MarketDbStore
+from utils.calendar_util import TradingCalendar
+
+# 저장하는 랭킹 응답 필드 (foreign-institution-total output)
+RANKING_TEXT_FIELDS = ['mksc_shrn_iscd', 'hts_kor_isnm', 'prdy_vrss_sign']
+RANKING_NUMERIC_FIELDS = [
+    'stck_prpr', 'prdy_vrss', 'prdy_ctrt', 'acml_vol', 'ntby_qty',
+    'frgn_ntby_qty', 'orgn_ntby_qty', 'ivtr_ntby_qty', 'bank_ntby_qty', 'insu_ntby_qty',
+    'mrbn_ntby_qty', 'fund_ntby_qty', 'etc_orgt_ntby_vol', 'etc_corp_ntby_vol',
+    'frgn_ntby_tr_pbmn', 'orgn_ntby_tr_pbmn', 'ivtr_ntby_tr_pbmn', 'bank_ntby_tr_pbmn', 'insu_ntby_tr_pbmn',
+    'mrbn_ntby_tr_pbmn', 'fund_ntby_tr_pbmn', 'etc_orgt_ntby_tr_pbmn', 'etc_corp_ntby_tr_pbmn',
+]
+RANKING_FIELDS = RANKING_TEXT_FIELDS + RANKING_NUMERIC_FIELDS
+
+
+class RankingSnapshotStore(MarketDbStore):
+    """일별 랭킹 조회 결과(get_institution_total_report) 저장소
+
+    - (날짜, 랭킹 키, 순위) 단위로 숫자 필드를 타입이 지정된 컬럼으로 저장 (cache/market_data.db)
+    - 날짜/종목코드 인덱스로 기간·종목 조회
+    - 같은 날짜를 다시 저장하면 해당 날짜의 랭킹을 통째로 교체 (재실행해도 중복 없음)
+    """
+
+    def __init__(self, db_path: str = None, calendar: TradingCalendar = None):
+        super().__init__(db_path)
+        self.calendar = calendar or TradingCalendar.default()
+        self._create_tables()
+
+    def _create_tables(self):
+        text_columns = ", ".join(f"{field} TEXT" for field in RANKING_TEXT_FIELDS if field != 'mksc_shrn_iscd')
+        numeric_columns = ", ".join(f"{field} REAL" for field in RANKING_NUMERIC_FIELDS)
+        with self._lock, self._conn:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS ranking_snapshots (
+                    date TEXT NOT NULL,
+                    ranking TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    mksc_shrn_iscd TEXT NOT NULL,
+                    {text_columns},
+                    {numeric_columns},
+                    PRIMARY KEY (date, ranking, rank)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ranking_snapshots_ticker ON ranking_snapshots (mksc_shrn_iscd, date)"
+            )
+
+    def append(self, date: str, ranking: str, frame) -> int:
+        """하루치 랭킹 저장 (같은 날짜/랭킹이 이미 있으면 교체)
+
+        Args:
+            date (str): 랭킹 기준일 (YYYYMMDD 형식)
+            ranking (str): 랭킹 키 (예: institution_buy_qty)
+            frame (pandas.DataFrame): load_ranking_frame 결과 (순위 순서)
+
+        Returns:
+            int: 저장한 종목 수
+        """
+        rows = frame.reindex(columns=RANKING_FIELDS).astype(object)
+        rows = rows.where(rows.notna(), None)
+        records = [(date, ranking, rank, *values) for rank, values in enumerate(rows.itertuples(index=False, name=None), start=1)]
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ranking_snapshots WHERE date = ? AND ranking = ?", (date, ranking))
+            self._conn.executemany(
+                f"INSERT INTO ranking_snapshots (date, ranking, rank, {', '.join(RANKING_FIELDS)}) "
+                f"VALUES (?, ?, ?, {', '.join('?' for _ in RANKING_FIELDS)})",
+                records
+            )
+        self.logger.debug("랭킹 스냅샷 저장 - %s %s: %d개 종목", date, ranking, len(records))
+        return len(records)
+
+    def load(self, start_date: str = None, end_date: str = None, tickers=None, ranking: str = None, top_n: int = None):
+        """저장된 랭킹 조회
+
+        Args:
+            start_date (str, optional): 조회 시작일 (YYYYMMDD 형식)
+            end_date (str, optional): 조회 종료일 (YYYYMMDD 형식)
+            tickers (iterable, optional): 종목코드 목록. 기본값은 전체
+            ranking (str, optional): 랭킹 키. 기본값은 전체
+            top_n (int, optional): 순위 상위 N개만
+
+        Returns:
+            pandas.DataFrame: date(datetime), ranking, rank + 랭킹 응답 필드 (날짜, 랭킹, 순위 순)
+        """
+        conditions, params = [], []
+        if start_date:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date <= ?")
+            params.append(end_date)
+        if ranking:
+            conditions.append("ranking = ?")
+            params.append(ranking)
+        if top_n:
+            conditions.append("rank <= ?")
+            params.append(top_n)
+        if tickers is not None:
+            tickers = list(dict.fromkeys(tickers))
+            if not tickers:
+                return pd.DataFrame(columns=['date', 'ranking', 'rank', *RANKING_FIELDS])
+            conditions.append(f"mksc_shrn_iscd IN ({', '.join('?' for _ in tickers)})")
+            params.extend(tickers)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT date, ranking, rank, {', '.join(RANKING_FIELDS)} FROM ranking_snapshots {where} "
+                "ORDER BY date, ranking, rank",
+                self._conn, params=params
+            )
+        df['date'] = pd.to_datetime(df['date'], format='%Y%m%d')
+        return df
+
+    def dates(self, ranking: str = None):
+        """랭킹이 저장된 날짜 목록 (오름차순, YYYYMMDD)"""
+        with self._lock:
+            if ranking:
+                rows = self._conn.execute(
+                    "SELECT DISTINCT date FROM ranking_snapshots WHERE ranking = ? ORDER BY date", (ranking,)
+                ).fetchall()
+            else:
+                rows = self._conn.execute("SELECT DISTINCT date FROM ranking_snapshots ORDER BY date").fetchall()
+        return [row[0] for row in rows]
+
+    def streak(self, ticker: str, ranking: str, top_n: int = 10, date: str = None) -> int:
+        """기준 거래일부터 거래일 달력을 거슬러 올라가며 연속해서 상위 N위 안에 든 거래일 수
+
+        저장된 랭킹이 없는 거래일(실행하지 않은 날)은 확인할 수 없으므로 연속이 끊긴 것으로 본다.
+
+        Args:
+            ticker (str): 종목코드
+            ranking (str): 랭킹 키
+            top_n (int, optional): 순위 기준. 기본값은 10
+            date (str, optional): 기준일 (YYYYMMDD 형식, 휴장일이면 직전 거래일). 기본값은 마지막 저장일
+        """
+        if date is None:
+            dates = self.dates(ranking)
+            if not dates:
+                return 0
+            date = dates[-1]
+        with self._lock:
+            ranked = {row[0] for row in self._conn.execute(
+                "SELECT date FROM ranking_snapshots WHERE mksc_shrn_iscd = ? AND ranking = ? AND rank <= ?",
+                (ticker, ranking, top_n)
+            )}
+
+        count = 0
+        session = self.calendar.session_on_or_before(date)
+        while session.strftime("%Y%m%d") in ranked:
+            count += 1
+            session = self.calendar.previous_session(session)
+        return count
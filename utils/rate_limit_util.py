@@ -0,0 +1,29 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """초당 호출 횟수를 제한하는 스레드 안전 리미터
+
+    호출 간 최소 간격(1 / max_calls_per_sec)을 예약 방식으로 보장하므로
+    여러 스레드가 동시에 acquire()를 호출해도 전체 호출 속도가 제한을 넘지 않는다.
+    """
+
+    def __init__(self, max_calls_per_sec: float):
+        self.interval = 1.0 / max_calls_per_sec if max_calls_per_sec and max_calls_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self):
+        """다음 호출 슬롯까지 대기"""
+        if self.interval <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)
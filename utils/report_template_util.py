@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from string import Template
+
+# 리포트 스타일 (모듈 로드 시 한 번만 생성)
+REPORT_CSS = """
+                body {
+                    font-family: 'Noto Sans KR', sans-serif;
+                    margin: 10px;
+                    padding: 0;
+                    max-width: 600px;
+                }
+                table {
+                    border-collapse: collapse;
+                    width: 100%;
+                    margin: 10px auto;
+                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+                }
+                th, td {
+                    border: 1px solid #e0e0e0;
+                    padding: 8px 10px;
+                    text-align: center;
+                }
+                th {
+                    background-color: #333333;
+                    color: white;
+                    font-weight: 700;
+                    font-size: 13px;
+                    white-space: nowrap;
+                }
+                td {
+                    font-size: 12px;
+                    font-weight: 500;
+                }
+                td.stock-name {
+                    text-align: center;
+                }
+                .stock-code {
+                    font-size: 10px;
+                    color: #666;
+                    display: block;
+                    margin-top: 2px;
+                }
+                tr:nth-child(even) td {
+                    background-color: #f9f9f9;
+                }
+                tr:hover td {
+                    background-color: #f5f5f5;
+                }
+                .caption {
+                    text-align: center;
+                    font-size: 18px;
+                    font-weight: 700;
+                    margin: 15px 0;
+                    color: #333333;
+                }
+                .source {
+                    text-align: right;
+                    font-size: 11px;
+                    color: #666666;
+                    margin-top: 10px;
+                    font-weight: 400;
+                }
+                .positive {
+                    color: #d32f2f;
+                }
+                .negative {
+                    color: #1976d2;
+                }
+"""
+
+_DOCUMENT_HEAD = Template("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap" rel="stylesheet">
+            <style>$css</style>
+        </head>
+        <body>
+            <div class="caption">""").substitute(css=REPORT_CSS)
+
+_DOCUMENT_TAIL = """
+        </body>
+        </html>
+        """
+
+
+@dataclass(frozen=True)
+class ReportColumn:
+    """리포트 표 컬럼 메타데이터
+
+    Attributes:
+        name (str): DataFrame 컬럼명 (label이 없으면 헤더 첫 줄)
+        sub_label (str): 헤더 둘째 줄 보조 문구 (예: '(억원)')
+        css_class (str): th/td에 붙일 CSS 클래스
+        label (str): 헤더 첫 줄 문구 (같은 제목의 컬럼이 여러 개일 때 사용)
+    """
+    name: str
+    sub_label: str = ""
+    css_class: str = ""
+    label: str = ""
+
+    @property
+    def header(self):
+        label = self.label or self.name
+        return f"{label}<br>{self.sub_label}" if self.sub_label else label
+
+
+class ReportTemplate:
+    """리포트 HTML 템플릿
+
+    문서 골격/CSS와 헤더 행은 생성 시 한 번만 만들고, render()에서는 행 문자열만 이어 붙인다.
+    셀 값은 이미 포맷된 HTML 조각(<span class='...'> 등)으로 간주하여 이스케이프하지 않는다.
+    """
+
+    def __init__(self, columns, source: str):
+        """
+        Args:
+            columns (list): ReportColumn 목록 (표 컬럼 순서)
+            source (str): 하단 출처 문구
+        """
+        self.columns = list(columns)
+        self.source = source
+        self._cell_open = [f'<td class="{col.css_class}">' if col.css_class else '<td>' for col in self.columns]
+        header_cells = "".join(
+            f'<th class="{col.css_class}">{col.header}</th>' if col.css_class else f'<th>{col.header}</th>'
+            for col in self.columns
+        )
+        self._table_head = f'<table class="dataframe styled-table"><thead><tr>{header_cells}</tr></thead><tbody>'
+        self._document_tail = f'<div class="source">{source}</div>{_DOCUMENT_TAIL}'
+
+    def header_labels(self):
+        """{컬럼명: 헤더 표시 문자열} (Pillow 렌더러용)"""
+        return {col.name: col.header for col in self.columns}
+
+    def render_rows(self, rows):
+        """행 값(튜플) 목록을 <tr> 문자열로 변환"""
+        cell_open = self._cell_open
+        return "".join(
+            "<tr>" + "".join(f"{opening}{value}</td>" for opening, value in zip(cell_open, row)) + "</tr>"
+            for row in rows
+        )
+
+    def render(self, caption: str, df):
+        """DataFrame(컬럼 순서는 columns와 동일)을 완성된 HTML 문서로 변환"""
+        return "".join((
+            _DOCUMENT_HEAD, caption, "</div>",
+            self._table_head,
+            self.render_rows(df[[col.name for col in self.columns]].itertuples(index=False, name=None)),
+            "</tbody></table>",
+            self._document_tail,
+        ))
@@ -0,0 +1,192 @@
+import heapq
+import pandas as pd
+from utils.cache_util import MarketDbStore
+from utils.calendar_util import TradingCalendar
+
+# 랭킹 데이터 → 집계 컬럼 (기관 순매수 수량/금액(백만원))
+NETBUY_FIELDS = {
+    'mksc_shrn_iscd': 'ticker',
+    'hts_kor_isnm': 'name',
+    'stck_prpr': 'price',
+    'orgn_ntby_qty': 'qty',
+    'orgn_ntby_tr_pbmn': 'amount',
+}
+
+
+class RollingNetBuyAggregator(MarketDbStore):
+    """기관 순매수 N거래일 누적 집계 (cache/market_data.db)
+
+    - netbuy_daily: 집계에 반영한 일별 종목 순매수 (가장 긴 기간만큼만 보관)
+    - netbuy_rolling: 기간별 종목 누적 합계, netbuy_rolling_dates: 기간별 반영된 날짜
+    - 실행마다 새 날짜를 더하고 기간을 벗어난 날짜만 빼서 갱신 (전체 재계산 없음)
+    - 기간은 저장된 날짜 수가 아니라 거래일 달력 기준 (실행을 건너뛴 날이 있으면 N거래일 중 있는 날짜만 반영)
+    - 같은 날짜를 다시 반영하면 이전 값을 빼고 새 값으로 교체, 과거 날짜가 들어오면 보관분으로 다시 계산
+
+    일별 데이터는 그날 조회한 랭킹에 포함된 종목만 있으므로, 랭킹 밖 종목의 순매수는 0으로 취급된다.
+    """
+
+    def __init__(self, windows=(5, 20), db_path: str = None, calendar: TradingCalendar = None):
+        super().__init__(db_path)
+        self.windows = tuple(sorted(set(windows)))
+        self.calendar = calendar or TradingCalendar.default()
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS netbuy_daily (
+                    date TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    name TEXT,
+                    price INTEGER,
+                    qty INTEGER NOT NULL,
+                    amount INTEGER NOT NULL,
+                    PRIMARY KEY (date, ticker)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS netbuy_rolling (
+                    window_days INTEGER NOT NULL,
+                    ticker TEXT NOT NULL,
+                    name TEXT,
+                    price INTEGER,
+                    qty INTEGER NOT NULL,
+                    amount INTEGER NOT NULL,
+                    days INTEGER NOT NULL,
+                    PRIMARY KEY (window_days, ticker)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS netbuy_rolling_dates (
+                    window_days INTEGER NOT NULL,
+                    date TEXT NOT NULL,
+                    PRIMARY KEY (window_days, date)
+                ) WITHOUT ROWID
+            """)
+
+    @staticmethod
+    def _daily_rows(frame):
+        """랭킹 DataFrame → [(ticker, name, price, qty, amount), ...] (종목당 한 행)"""
+        rows = frame.reindex(columns=list(NETBUY_FIELDS)).rename(columns=NETBUY_FIELDS)
+        rows = rows.dropna(subset=['ticker']).drop_duplicates('ticker')
+        numeric = ['price', 'qty', 'amount']
+        rows[numeric] = rows[numeric].apply(pd.to_numeric, errors='coerce').fillna(0).astype(int)
+        return [tuple(values) for values in rows[['ticker', 'name', 'price', 'qty', 'amount']].itertuples(index=False, name=None)]
+
+    def _add(self, window, date):
+        """date의 일별 순매수를 window 누적에 더함"""
+        self._conn.execute("""
+            INSERT INTO netbuy_rolling (window_days, ticker, name, price, qty, amount, days)
+            SELECT ?, ticker, name, price, qty, amount, 1 FROM netbuy_daily WHERE date = ?
+            ON CONFLICT (window_days, ticker) DO UPDATE SET
+                name = excluded.name, price = excluded.price,
+                qty = qty + excluded.qty, amount = amount + excluded.amount, days = days + 1
+        """, (window, date))
+        self._conn.execute("INSERT OR IGNORE INTO netbuy_rolling_dates (window_days, date) VALUES (?, ?)", (window, date))
+
+    def _subtract(self, window, date):
+        """date의 일별 순매수를 window 누적에서 뺌"""
+        self._conn.execute("""
+            UPDATE netbuy_rolling SET
+                qty = qty - (SELECT d.qty FROM netbuy_daily d WHERE d.date = ? AND d.ticker = netbuy_rolling.ticker),
+                amount = amount - (SELECT d.amount FROM netbuy_daily d WHERE d.date = ? AND d.ticker = netbuy_rolling.ticker),
+                days = days - 1
+            WHERE window_days = ? AND ticker IN (SELECT ticker FROM netbuy_daily WHERE date = ?)
+        """, (date, date, window, date))
+        self._conn.execute("DELETE FROM netbuy_rolling_dates WHERE window_days = ? AND date = ?", (window, date))
+
+    def _window_dates(self, window):
+        return [row[0] for row in self._conn.execute(
+            "SELECT date FROM netbuy_rolling_dates WHERE window_days = ? ORDER BY date", (window,)
+        )]
+
+    def _window_start(self, window, date):
+        """date(마지막 반영일)까지 window거래일 기간의 첫 거래일 (YYYYMMDD)"""
+        return self.calendar.sessions_ago(date, window - 1).strftime("%Y%m%d")
+
+    def _rebuild(self):
+        """보관 중인 일별 데이터로 모든 기간 누적을 다시 계산"""
+        dates = [row[0] for row in self._conn.execute("SELECT DISTINCT date FROM netbuy_daily ORDER BY date")]
+        self._conn.execute("DELETE FROM netbuy_rolling")
+        self._conn.execute("DELETE FROM netbuy_rolling_dates")
+        if not dates:
+            return
+        for window in self.windows:
+            start = self._window_start(window, dates[-1])
+            for date in dates:
+                if date >= start:
+                    self._add(window, date)
+
+    def update(self, date: str, frame) -> int:
+        """하루치 랭킹을 누적 집계에 반영
+
+        Args:
+            date (str): 기준일 (YYYYMMDD 형식)
+            frame (pandas.DataFrame): 그날의 랭킹 데이터 (여러 랭킹을 합친 경우 종목당 첫 행 사용)
+
+        Returns:
+            int: 반영한 종목 수
+        """
+        rows = self._daily_rows(frame)
+        with self._lock, self._conn:
+            latest = self._conn.execute("SELECT MAX(date) FROM netbuy_daily").fetchone()[0]
+
+            # 같은 날짜 재실행: 이전에 더한 값을 먼저 뺌
+            for window in self.windows:
+                if date in self._window_dates(window):
+                    self._subtract(window, date)
+            self._conn.execute("DELETE FROM netbuy_daily WHERE date = ?", (date,))
+            self._conn.executemany(
+                "INSERT INTO netbuy_daily (date, ticker, name, price, qty, amount) VALUES (?, ?, ?, ?, ?, ?)",
+                [(date, *row) for row in rows]
+            )
+
+            if latest is not None and date < latest:
+                # 과거 날짜가 중간에 들어오면 기간 경계가 바뀌므로 보관분으로 다시 계산
+                self._rebuild()
+            else:
+                for window in self.windows:
+                    self._add(window, date)
+                    # 거래일 기준 기간을 벗어난 날짜만 뺌 (실행을 건너뛴 날도 기간에 포함)
+                    start = self._window_start(window, date)
+                    for old_date in self._window_dates(window):
+                        if old_date >= start:
+                            break
+                        self._subtract(window, old_date)
+
+            self._conn.execute("DELETE FROM netbuy_rolling WHERE days <= 0")
+            last = max(date, latest) if latest else date
+            self._conn.execute("DELETE FROM netbuy_daily WHERE date < ?", (self._window_start(self.windows[-1], last),))
+
+        self.logger.debug("기관 순매수 누적 갱신 - %s: %d개 종목", date, len(rows))
+        return len(rows)
+
+    def dates(self, window: int):
+        """window 누적에 반영된 날짜 목록 (오름차순, YYYYMMDD)"""
+        with self._lock:
+            return self._window_dates(window)
+
+    def top(self, window: int, k: int = 10, by: str = 'qty', side: str = 'buy'):
+        """window 누적 순매수(buy) 또는 순매도(sell) 상위 k개 (전체 정렬 없이 선택)
+
+        Args:
+            window (int): 누적 기간 (거래일)
+            k (int, optional): 종목 수. 기본값은 10
+            by (str, optional): qty(수량) 또는 amount(금액). 기본값은 qty
+            side (str, optional): buy(순매수 상위) 또는 sell(순매도 상위). 기본값은 buy
+
+        Returns:
+            pandas.DataFrame: ticker, name, price, qty, amount, days (순위 순)
+        """
+        if by not in ('qty', 'amount'):
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: {by}")
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticker, name, price, qty, amount, days FROM netbuy_rolling WHERE window_days = ?", (window,)
+            ).fetchall()
+
+        index = 3 if by == 'qty' else 4
+        select = heapq.nlargest if side == 'buy' else heapq.nsmallest
+        selected = select(k, rows, key=lambda row: row[index])
+        return pd.DataFrame(selected, columns=['ticker', 'name', 'price', 'qty', 'amount', 'days'])
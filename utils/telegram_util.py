@@ -3,26 +3,38 @@ from urllib.request import urlopen
 import urllib.parse
 import requests
 from dotenv import load_dotenv
+from utils.metrics_util import MetricsUtil
 import json
 
 load_dotenv()
 
+def _photo_file(photo):
+    """이미지 경로(str) 또는 메모리 이미지(name/data 속성)를 requests 업로드 값으로 변환"""
+    if isinstance(photo, str):
+        return open(photo, 'rb')
+    return (photo.name, photo.data)
+
 class TelegramUtil:
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
         self.chat_test_id = os.getenv('TELEGRAM_CHAT_TEST_ID')
+        # API 주소 (로컬 스텁 서버로 바꿔 오프라인 테스트 가능)와 요청 타임아웃(초)
+        self.api_url = os.getenv('TELEGRAM_API_URL', 'https://api.telegram.org').rstrip('/')
+        self.timeout = float(os.getenv('TELEGRAM_TIMEOUT', '30'))
 
     def send_message(self, message):
         """일반 메시지 전송"""
         message = urllib.parse.quote_plus(message)
-        urlopen(f"https://api.telegram.org/bot{self.bot_token}/sendMessage?chat_id={self.chat_id}&parse_mode=html&text={message}")
+        with MetricsUtil().span("http_request", service="telegram", endpoint="sendMessage") as tags:
+            tags["status"] = urlopen(f"{self.api_url}/bot{self.bot_token}/sendMessage?chat_id={self.chat_id}&parse_mode=html&text={message}", timeout=self.timeout).status
 
     def send_photo(self, photo_path, caption=""):
-        """이미지 전송"""
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendPhoto"
+        """이미지 전송 (파일 경로 또는 RenderedImage)"""
+        url = f"{self.api_url}/bot{self.bot_token}/sendPhoto"
         
-        with open(photo_path, 'rb') as photo:
+        photo = _photo_file(photo_path)
+        try:
             payload = {
                 "chat_id": self.chat_id,
                 "caption": caption,
@@ -31,18 +43,37 @@ class TelegramUtil:
             files = {
                 "photo": photo
             }
-            response = requests.post(url, data=payload, files=files)
+            with MetricsUtil().span("http_request", service="telegram", endpoint="sendPhoto") as tags:
+                response = requests.post(url, data=payload, files=files, timeout=self.timeout)
+                tags["status"] = response.status_code
+        finally:
+            if hasattr(photo, 'close'):
+                photo.close()
         
         return response.json()
 
     def send_test_message(self, message):
         """테스트용 채팅방으로 메시지 전송"""
         message = urllib.parse.quote_plus(message)
-        urlopen(f"https://api.telegram.org/bot{self.bot_token}/sendMessage?chat_id={self.chat_test_id}&parse_mode=html&text={message}") 
+        with MetricsUtil().span("http_request", service="telegram", endpoint="sendMessage") as tags:
+            tags["status"] = urlopen(f"{self.api_url}/bot{self.bot_token}/sendMessage?chat_id={self.chat_test_id}&parse_mode=html&text={message}", timeout=self.timeout).status
     
+    def post_message(self, chat_id, message, session=None):
+        """메시지 전송 (POST 본문 사용, session을 주면 커넥션 재사용)"""
+        url = f"{self.api_url}/bot{self.bot_token}/sendMessage"
+        payload = {
+            "chat_id": chat_id,
+            "text": message,
+            "parse_mode": "html"
+        }
+        with MetricsUtil().span("http_request", service="telegram", endpoint="sendMessage") as tags:
+            response = (session or requests).post(url, data=payload, timeout=self.timeout)
+            tags["status"] = response.status_code
+        return response.json()
+
     def send_multiple_photo(self, photo_paths, caption=""):
-        """여러 장의 이미지 한 번에 전송"""
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMediaGroup"
+        """여러 장의 이미지 한 번에 전송 (파일 경로 또는 RenderedImage 목록)"""
+        url = f"{self.api_url}/bot{self.bot_token}/sendMediaGroup"
         
         media = []
         files = {}
@@ -59,7 +90,7 @@ class TelegramUtil:
                 'parse_mode': 'html'
             })
             
-            files[f'photo{index}'] = open(photo_path, 'rb')
+            files[f'photo{index}'] = _photo_file(photo_path)
         
         try:
             payload = {
@@ -67,14 +98,18 @@ class TelegramUtil:
                 'media': json.dumps(media)
             }
             
-            response = requests.post(url, data=payload, files=files)
+            with MetricsUtil().span("http_request", service="telegram", endpoint="sendMediaGroup") as tags:
+                response = requests.post(url, data=payload, files=files, timeout=self.timeout)
+                tags["status"] = response.status_code
             for file in files.values():
-                file.close()
+                if hasattr(file, 'close'):
+                    file.close()
             
             return response.json()
             
         except Exception as e:
             # 에러 발생시에도 파일들을 확실히 닫아줌
             for file in files.values():
-                file.close()
+                if hasattr(file, 'close'):
+                    file.close()
             raise e 
\ No newline at end of file
@@ -0,0 +1,135 @@
+import os
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from utils.logger_util import LoggerUtil
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+TOKEN_EXPIRED_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@contextmanager
+def file_lock(lock_path: str):
+    """프로세스 간 배타적 파일 잠금 (같은 호스트의 다른 작업과 토큰 발급 직렬화)"""
+    with open(lock_path, 'a+') as lock_file:
+        if os.name == 'nt':
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class TokenManager:
+    """KIS 접근 토큰 관리
+
+    - 토큰과 만료일시를 메모리에 보관하여 호출마다 파일을 다시 읽지 않음
+    - 만료 refresh_margin 초 전에 미리 재발급
+    - token.json은 파일 잠금 하에서 확인/발급/저장하므로 동시에 실행된 작업도 발급 요청은 한 번만 수행
+    - 저장은 임시 파일에 쓴 뒤 os.replace로 교체하여 원자적으로 처리
+    """
+
+    def __init__(self, token_file: str, issue_token, refresh_margin: int = None):
+        """
+        Args:
+            token_file (str): 토큰 저장 파일 경로
+            issue_token (callable): 새 토큰을 발급받아 API 응답(dict)을 반환하는 함수
+            refresh_margin (int, optional): 만료 몇 초 전에 재발급할지. 기본값은 KIS_TOKEN_REFRESH_MARGIN 환경변수(600초)
+        """
+        self.token_file = token_file
+        self.lock_file = f"{token_file}.lock"
+        self.issue_token = issue_token
+        if refresh_margin is None:
+            refresh_margin = int(os.getenv("KIS_TOKEN_REFRESH_MARGIN", "600"))
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self.logger = LoggerUtil().get_logger()
+
+        self._lock = threading.Lock()
+        self._token = None
+        self._refresh_at = None
+
+    def _is_fresh(self, refresh_at):
+        return refresh_at is not None and datetime.now() < refresh_at
+
+    def load_token(self):
+        """토큰 파일에서 저장된 토큰 정보를 로드 (갱신 시점이 지났으면 None)"""
+        if not os.path.exists(self.token_file):
+            self.logger.debug("토큰 파일이 존재하지 않습니다.")
+            return None, None
+
+        try:
+            with open(self.token_file, 'r') as f:
+                data = json.load(f)
+            expires_at = datetime.strptime(data['access_token_token_expired'], TOKEN_EXPIRED_FORMAT)
+        except (ValueError, KeyError) as e:
+            self.logger.warning(f"토큰 파일을 읽을 수 없습니다: {str(e)}")
+            return None, None
+
+        refresh_at = expires_at - self.refresh_margin
+        if not self._is_fresh(refresh_at):
+            self.logger.debug("토큰이 만료되었거나 만료가 임박했습니다.")
+            return None, None
+
+        self.logger.debug("유효한 토큰을 로드했습니다.")
+        return data['access_token'], refresh_at
+
+    def save_token(self, token_info):
+        """토큰 정보를 파일에 원자적으로 저장
+        token_info: API 응답의 토큰 정보 (access_token, expires_in, access_token_token_expired 포함)
+        """
+        data = {
+            'access_token': token_info['access_token'],
+            'expires_in': token_info['expires_in'],  # 유효기간(초)
+            'access_token_token_expired': token_info['access_token_token_expired']  # 만료일시
+        }
+
+        token_dir = os.path.dirname(os.path.abspath(self.token_file))
+        fd, tmp_path = tempfile.mkstemp(dir=token_dir, prefix='.token.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.token_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.logger.debug("토큰 정보를 저장했습니다. 만료일시: %s", token_info['access_token_token_expired'])
+
+    def get_token(self):
+        """유효한 토큰 반환 (메모리 → 파일 → 신규 발급 순)"""
+        if self._is_fresh(self._refresh_at):
+            return self._token
+
+        with self._lock:
+            # 다른 스레드가 먼저 갱신했는지 다시 확인
+            if self._is_fresh(self._refresh_at):
+                return self._token
+
+            with file_lock(self.lock_file):
+                # 잠금을 기다리는 동안 다른 프로세스가 발급했을 수 있으므로 파일을 다시 확인
+                token, refresh_at = self.load_token()
+                if token is None:
+                    token_info = self.issue_token()
+                    self.save_token(token_info)
+                    token = token_info['access_token']
+                    expires_at = datetime.strptime(token_info['access_token_token_expired'], TOKEN_EXPIRED_FORMAT)
+                    refresh_at = expires_at - self.refresh_margin
+
+            self._token, self._refresh_at = token, refresh_at
+            return token